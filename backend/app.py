@@ -1,13 +1,40 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response, stream_with_context
 from flask_cors import CORS
 from flask_pymongo import PyMongo
 from services.resume_service import ResumeService
 from services.email_service import EmailService
 from services.scoring_service import ScoringService
+from services.metrics_service import metrics
+from services.profiling_service import ProfilingService
+from services.fingerprint_service import FingerprintService
+from services.blob_store import BlobStore
+from services.search_service import SearchService
+from services.leaderboard_service import LeaderboardService, RANKED_SCORES
+from services.job_profile_service import JobProfileService
+from services.ats_upgrade_service import AtsUpgradeService, ATS_FINAL, ATS_PROVISIONAL
+from services.recalculation_service import RecalculationService
+from services.admission_service import AdmissionService
+from services.json_provider import FastJSONProvider, dumps_bytes
+from services.compression import ResponseCompressor
+from services.response_cache import VersionCounters, response_cache, make_etag, etag_matches
+from services.webhook_deliveries import WebhookDeliveryService, DONE as DELIVERY_DONE
+from services.event_log import log_event, payload_summary
+from services.analysis_detail_service import AnalysisDetailService
+from services.candidate_state import (CandidateStateService, TransitionRejected, INTERVIEW_ANALYZING,
+                                      INTERVIEW_COMPLETED, INTERVIEW_STARTED)
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import time
+import hashlib
 import os
 from datetime import datetime
 from dotenv import load_dotenv
 import traceback
+import click
+import functools
+import csv
+import io
+import json
 from bson import ObjectId
 import requests
 
@@ -15,6 +42,8 @@ import requests
 load_dotenv()
 
 app = Flask(__name__)
+# Encodes ObjectId/datetime during serialization, so documents can be returned as loaded
+app.json = FastJSONProvider(app)
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key')
 app.config['MONGO_URI'] = os.getenv('MONGODB_URI')
 app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'uploads')
@@ -22,12 +51,31 @@ app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 16777216)
 
 # Initialize extensions
 CORS(app)
-mongo = PyMongo(app)
+# Sized for many concurrent greenlets per worker under the gevent profile (see gunicorn.conf.py)
+mongo = PyMongo(app, maxPoolSize=int(os.getenv('MONGO_MAX_POOL_SIZE', 100)))
 
 # Initialize services
 resume_service = ResumeService()
 email_service = EmailService()
 scoring_service = ScoringService()
+profiling_service = ProfilingService()
+fingerprint_service = FingerprintService()
+blob_store = BlobStore(mongo.db.blobs)
+search_service = SearchService(mongo.db.candidate_search)
+# Change counters behind the ETags and response cache of the list endpoints
+versions = VersionCounters(mongo.db.collection_versions)
+leaderboard = LeaderboardService(mongo.db.leaderboard_buckets, mongo.db.candidates)
+job_profile_service = JobProfileService(resume_service)
+ats_upgrade_service = AtsUpgradeService(resume_service, mongo.db.candidates, blob_store, search_service,
+                                        versions=versions, leaderboard=leaderboard)
+recalculation_service = RecalculationService(mongo.db.candidates, mongo.db.jobs, blob_store, search_service,
+                                             resume_service, scoring_service, job_profile_service, versions,
+                                             leaderboard)
+admission_service = AdmissionService(mongo.db.admission_buckets)
+response_compressor = ResponseCompressor()
+candidate_state = CandidateStateService(mongo.db.candidates, versions)
+webhook_deliveries = WebhookDeliveryService(mongo.db.webhook_deliveries)
+analysis_detail_service = AnalysisDetailService(mongo.db.transcript_analyses, scoring_service)
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -36,6 +84,146 @@ ATS_THRESHOLD = 70
 FINAL_SCORE_THRESHOLD = 0
 N8N_WEBHOOK_URL = os.getenv('N8N_WEBHOOK_URL')
 
+# Fields produced by parsing a resume; reused as-is when the same PDF is uploaded again
+PARSED_RESUME_FIELDS = ['name', 'email', 'phone', 'skills', 'experience', 'education',
+                        'resume_text', 'resume_sections', 'pdf_extraction', 'text_sha256', 'simhash', 'simhash_bands']
+
+def ensure_indexes():
+    """Create the indexes the API relies on; safe to call repeatedly"""
+    try:
+        mongo.db.candidates.create_index(
+            [('job_id', 1), ('resume_sha256', 1)],
+            unique=True,
+            partialFilterExpression={'resume_sha256': {'$exists': True}},
+            name='job_resume_sha256_unique'
+        )
+        mongo.db.candidates.create_index('resume_sha256')
+        mongo.db.candidates.create_index([('job_id', 1), ('text_sha256', 1)])
+        mongo.db.candidates.create_index([('job_id', 1), ('simhash_bands', 1)])
+        search_service.ensure_indexes()
+        leaderboard.ensure_indexes()
+        recalculation_service.ensure_indexes()
+        admission_service.ensure_indexes()
+        candidate_state.ensure_indexes()
+        webhook_deliveries.ensure_indexes()
+        analysis_detail_service.ensure_indexes()
+    except Exception as e:
+        print(f"Failed to ensure MongoDB indexes: {e}")
+
+ensure_indexes()
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.metrics_token = metrics.begin_request()
+    metrics.add_gauge('http_requests_in_flight', 1)
+
+@app.after_request
+def record_request_metrics(response):
+    token = g.pop('metrics_token', None)
+    timings = metrics.end_request(token) if token is not None else []
+    started = g.pop('request_started', None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('http_request_duration_seconds', elapsed, {'endpoint': endpoint, 'method': request.method})
+        metrics.inc('http_requests_total', labels={'endpoint': endpoint, 'method': request.method, 'status': response.status_code})
+        timings.append(('total', elapsed))
+        response.headers['Server-Timing'] = metrics.server_timing_header(timings)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    metrics.add_gauge('http_requests_in_flight', -1)
+    if 'metrics_token' in g:
+        metrics.end_request(g.pop('metrics_token'))
+
+@app.after_request
+def compress_response(response):
+    # Registered after the metrics hook so it runs first and is included in the request timing
+    with metrics.timer('route.compress'):
+        return response_compressor.apply(response, request.accept_encodings)
+
+def _request_input_hash():
+    """SHA-256 over the uploaded files and raw body, used to correlate profiles with inputs"""
+    digest = hashlib.sha256()
+    for storage in request.files.values():
+        stream = storage.stream
+        try:
+            stream.seek(0)
+            for chunk in iter(lambda: stream.read(65536), b''):
+                digest.update(chunk)
+        except (AttributeError, OSError, ValueError):
+            pass
+    digest.update(request.get_data(cache=True) or b'')
+    return digest.hexdigest()
+
+@app.before_request
+def start_request_profile():
+    trigger = profiling_service.should_profile(request.headers)
+    if trigger:
+        profiler = profiling_service.start()
+        if profiler is None:
+            # Another request of this worker is being profiled
+            return
+        g.profile_trigger = trigger
+        g.profile_started = time.perf_counter()
+        g.profiler = profiler
+
+@app.after_request
+def store_request_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profile = profiling_service.finish(profiler)
+    profile.update({
+        'endpoint': request.url_rule.rule if request.url_rule else 'unmatched',
+        'method': request.method,
+        'path': request.path,
+        'status_code': response.status_code,
+        'trigger': g.pop('profile_trigger', 'sample'),
+        'duration_ms': round((time.perf_counter() - g.pop('profile_started')) * 1000, 3),
+        'input_hash': _request_input_hash()
+    })
+    try:
+        result = mongo.db.request_profiles.insert_one(profile)
+        response.headers['X-Profile-Id'] = str(result.inserted_id)
+    except Exception as e:
+        print(f"Failed to store request profile: {e}")
+    return response
+
+@app.teardown_request
+def stop_request_profile(exc):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiling_service.stop(profiler)
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def list_request_profiles():
+    if not profiling_service.is_admin(request.headers):
+        return jsonify({'error': 'Admin token required', 'status': 'error'}), 403
+    query = {}
+    if request.args.get('input_hash'):
+        query['input_hash'] = request.args['input_hash']
+    if request.args.get('endpoint'):
+        query['endpoint'] = request.args['endpoint']
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+    profiles = list(mongo.db.request_profiles.find(query, {'stats_text': 0, 'hot_frames': 0}).sort('_id', -1).limit(limit))
+    return jsonify({'profiles': profiles, 'status': 'success'})
+
+@app.route('/api/admin/profiles/<profile_id>', methods=['GET'])
+def get_request_profile(profile_id):
+    if not profiling_service.is_admin(request.headers):
+        return jsonify({'error': 'Admin token required', 'status': 'error'}), 403
+    profile = mongo.db.request_profiles.find_one({'_id': ObjectId(profile_id)})
+    if not profile:
+        return jsonify({'error': 'Profile not found'}), 404
+    return jsonify({'profile': profile, 'status': 'success'})
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({
@@ -49,7 +237,146 @@ def health_check():
         }
     })
 
+def _find_duplicate_candidate(job_id, resume_sha256, text_fingerprint=None):
+    """Look up an existing candidate for this job with the same resume.
+
+    Returns ``(candidate, match)`` where match describes how it was found,
+    or ``(None, None)``.
+    """
+    candidates = mongo.db.candidates
+    if text_fingerprint is None:
+        candidate = candidates.find_one({'job_id': job_id, 'resume_sha256': resume_sha256})
+        return (candidate, {'match': 'bytes'}) if candidate else (None, None)
+
+    candidate = candidates.find_one({'job_id': job_id, 'text_sha256': text_fingerprint['text_sha256']})
+    if candidate:
+        return candidate, {'match': 'text'}
+
+    if fingerprint_service.near_enabled:
+        fingerprint = int(text_fingerprint['simhash'], 16)
+        nearby = candidates.find(
+            {'job_id': job_id, 'simhash_bands': {'$in': text_fingerprint['simhash_bands']}},
+            {'simhash': 1}
+        ).limit(50)
+        for match in nearby:
+            distance = fingerprint_service.hamming(fingerprint, int(match['simhash'], 16))
+            if distance <= fingerprint_service.max_distance:
+                return candidates.find_one({'_id': match['_id']}), {'match': 'near', 'distance': distance}
+    return None, None
+
+def _duplicate_response(candidate, match):
+    metrics.inc('cache_hits_total', labels={'cache': f"resume_{match['match']}"})
+    blob_store.hydrate(candidate)
+    return jsonify({'data': candidate, 'status': 'success', 'duplicate': match,
+                    'message': 'Resume already processed, returning existing analysis'})
+
+def admission_controlled(cost_class):
+    """Apply the per-client quota and concurrency gate of ``cost_class`` to a route"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            client = admission_service.client_key(request.headers, request.remote_addr)
+            admission = admission_service.admit(cost_class, client)
+            if not admission.allowed:
+                response = jsonify({'error': admission.reason, 'status': 'error'})
+                response.status_code = admission.status
+                response.headers['Retry-After'] = str(admission.retry_after)
+                return response
+            try:
+                return view(*args, **kwargs)
+            finally:
+                admission.release()
+        return wrapper
+    return decorator
+
+def json_object_body(view):
+    """Answer 400 before any other work unless the request body is a JSON object"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not isinstance(request.get_json(silent=True), dict):
+            return jsonify({'status': 'error', 'error': 'Request body must be a JSON object'}), 400
+        return view(*args, **kwargs)
+    return wrapper
+
+def idempotent_webhook(source):
+    """Run each delivery of a webhook once; retries get the stored response back"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not webhook_deliveries.enabled:
+                return view(*args, **kwargs)
+            key = webhook_deliveries.delivery_key(source, request.headers, request.get_json(silent=True))
+            existing = webhook_deliveries.claim(key)
+            if existing is not None:
+                log_event('webhook_duplicate', source=source, delivery=key, state=existing['state'])
+                if existing['state'] == DELIVERY_DONE:
+                    stored = existing['response']
+                    response = app.response_class(stored['body'], status=stored['status'], mimetype=stored['mimetype'])
+                    response.headers['Idempotent-Replayed'] = 'true'
+                    return response
+                response = jsonify({'status': 'error', 'error': 'Delivery is already being processed'})
+                response.status_code = 409
+                response.headers['Retry-After'] = '5'
+                return response
+            g.webhook_delivery = key
+            try:
+                response = app.make_response(view(*args, **kwargs))
+            except Exception:
+                webhook_deliveries.release(key)
+                raise
+            # Only successful results are replayed; the provider's retry reprocesses failures
+            if 200 <= response.status_code < 300:
+                webhook_deliveries.complete(key, response.status_code, response.get_data(), response.mimetype)
+            else:
+                webhook_deliveries.release(key)
+            return response
+        return wrapper
+    return decorator
+
+def versioned(name):
+    """Serve a GET route by the version counter ``name`` (or a function of the route arguments returning it).
+
+    A request whose If-None-Match carries the current version gets 304
+    after a single counter read; otherwise the rendered body is served from
+    the in-process response cache, or rendered and cached under the version.
+    Compressed bodies are cached per encoding too, so a hit is not compressed
+    again (the after-request compression skips already encoded responses).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = name(**kwargs) if callable(name) else name
+            token = versions.current(key)
+            etag = make_etag(key, token)
+            matched = etag_matches(request.headers.get('If-None-Match'), etag)
+            if matched:
+                response = app.response_class(status=304)
+                response.headers['ETag'] = matched
+            else:
+                cached = response_cache.get(key, token)
+                if cached:
+                    response = app.response_class(cached[0], mimetype=cached[1])
+                else:
+                    response = app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    response_cache.put(key, token, response.get_data(), response.mimetype)
+                response.set_etag(etag)
+                encoding = response_compressor.choose(response, request.accept_encodings)
+                if encoding:
+                    encoded = response_cache.get(key, token, encoding)
+                    if encoded is None:
+                        encoded = (response_compressor.compress(response.get_data(), encoding), response.mimetype)
+                        response_cache.put(key, token, encoded[0], encoded[1], encoding)
+                    response_compressor.encode(response, encoding, encoded[0])
+            # Let clients keep the body but always revalidate it
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
 @app.route('/api/parse-resume', methods=['POST'])
+@admission_controlled('llm')
 def parse_resume():
     try:
         file = request.files.get('file') or request.files.get('resume')
@@ -58,36 +385,102 @@ def parse_resume():
         if file.filename == '':
             return jsonify({'error': 'No file selected', 'status': 'error'}), 400
         filename = file.filename
-        temp_path = os.path.join(app.config['UPLOAD_FOLDER'], f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}")
-        file.save(temp_path)
-        resume_data = resume_service.parse_resume(temp_path)
-        os.remove(temp_path)
-        if 'error' in resume_data:
-            return jsonify({'error': resume_data['error'], 'status': 'error'}), 400
+        job_id = request.form.get('job_id') or (request.get_json(silent=True) or {}).get('job_id')
+        file_bytes = file.read()
+        resume_sha256 = fingerprint_service.raw_sha256(file_bytes)
+
+        # A byte-identical upload for the same job reuses the stored parse and ATS analysis
+        if fingerprint_service.enabled:
+            with metrics.timer('route.dedup_lookup'):
+                existing, match = _find_duplicate_candidate(job_id, resume_sha256)
+            if existing:
+                return _duplicate_response(existing, match)
+
+        # The same PDF uploaded for another job only needs re-scoring, not re-parsing
+        previous = None
+        if fingerprint_service.enabled:
+            previous = mongo.db.candidates.find_one(
+                {'resume_sha256': resume_sha256}, {field: 1 for field in PARSED_RESUME_FIELDS + ['blob_refs']}
+            )
+        if previous:
+            blob_store.hydrate(previous, PARSED_RESUME_FIELDS)
+            metrics.inc('cache_hits_total', labels={'cache': 'resume_parse'})
+            parsed = {field: previous.get(field) for field in PARSED_RESUME_FIELDS if field in previous}
+        else:
+            temp_path = os.path.join(app.config['UPLOAD_FOLDER'], f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}")
+            with metrics.timer('route.file_save'):
+                with open(temp_path, 'wb') as f:
+                    f.write(file_bytes)
+            with metrics.timer('route.parse_resume'):
+                resume_data = resume_service.parse_resume(temp_path)
+            os.remove(temp_path)
+            if 'error' in resume_data:
+                return jsonify({'error': resume_data['error'], 'status': 'error'}), 400
+            parsed = {
+                'name': resume_data.get('name', 'Unknown'),
+                'email': resume_data.get('email', ''),
+                'phone': resume_data.get('phone', ''),
+                'skills': resume_data.get('skills', []),
+                'experience': resume_data.get('experience', []),
+                'education': resume_data.get('education', []),
+                'resume_text': resume_data.get('text', ''),
+                'resume_sections': resume_data.get('sections', {}),
+                # Pages/characters read and which cap, if any, cut the PDF short
+                'pdf_extraction': resume_data.get('pdf_extraction', {})
+            }
+            parsed.update(fingerprint_service.fingerprint_text(parsed['resume_text']))
+
+        # Lightly edited or re-exported resumes match on normalized text (or SimHash in near mode)
+        if fingerprint_service.enabled:
+            with metrics.timer('route.dedup_lookup'):
+                existing, match = _find_duplicate_candidate(job_id, resume_sha256, parsed)
+            if existing:
+                return _duplicate_response(existing, match)
+
         # Store candidate in DB
-        job_id = request.form.get('job_id') or request.json.get('job_id')
-        job = mongo.db.jobs.find_one({'_id': ObjectId(job_id)}) if job_id else None
-        required_skills = []
-        if job and 'required_skills' in job:
-            required_skills = job['required_skills']
-        # Flatten required_skills to just skill names for ATS scoring
-        skill_names = [s['skill'] for s in required_skills]
-        ats_analysis = resume_service.calculate_ats_score(resume_data.get('text', ''), skill_names)
-        candidate = {
-            'name': resume_data.get('name', 'Unknown'),
-            'email': resume_data.get('email', ''),
-            'phone': resume_data.get('phone', ''),
-            'skills': resume_data.get('skills', []),
-            'experience': resume_data.get('experience', []),
-            'education': resume_data.get('education', []),
-            'resume_text': resume_data.get('text', ''),
+        with metrics.timer('route.mongo_find_job'):
+            job = mongo.db.jobs.find_one({'_id': ObjectId(job_id)}) if job_id else None
+        # Skill names, weights and the static prompt prefix are precomputed per job
+        score_context = job_profile_service.score_context(job)
+        profile = job_profile_service.get_profile(job) if job else None
+        upgrade = ats_upgrade_service.enabled and bool(score_context['job_skills'])
+        with metrics.timer('route.ats_score'):
+            if upgrade:
+                # Answer with a local score now; Gemini replaces it in the background
+                ats_analysis = resume_service.provisional_ats_score(
+                    parsed.get('resume_text', ''), score_context['job_skills'], profile and profile['weight_vector'])
+            else:
+                ats_analysis = resume_service.calculate_ats_score(parsed.get('resume_text', ''), **score_context)
+        candidate = dict(parsed)
+        candidate.update({
             'status': 'resume_uploaded',
             'created_at': datetime.now().isoformat(),
             'job_id': job_id,
             'ats_score': ats_analysis.get('overall_score', 0),
-            'ats_analysis': ats_analysis
-        }
-        result = mongo.db.candidates.insert_one(candidate)
+            'ats_analysis': ats_analysis,
+            'ats_status': ATS_PROVISIONAL if upgrade else ATS_FINAL,
+            'ats_version': 1,
+            # Recorded so a later job or scorer change can find this score as stale
+            'score_inputs': {'ats': job_profile_service.score_inputs(profile)} if profile else {}
+        })
+        # Only set with dedup on: the unique (job_id, resume_sha256) index would
+        # otherwise still reject re-uploads when DEDUP_MODE=off
+        if fingerprint_service.enabled:
+            candidate['resume_sha256'] = resume_sha256
+        try:
+            with metrics.timer('route.mongo_insert'):
+                result = mongo.db.candidates.insert_one(blob_store.split(candidate))
+        except DuplicateKeyError:
+            # A concurrent upload of the same file won the race
+            existing, match = _find_duplicate_candidate(job_id, resume_sha256)
+            if existing:
+                return _duplicate_response(existing, match)
+            raise
+        search_service.index_candidate(result.inserted_id, candidate)
+        leaderboard.record(result.inserted_id, candidate)
+        versions.bump('candidates')
+        if upgrade:
+            ats_upgrade_service.submit(result.inserted_id, 1, parsed.get('resume_text', ''), score_context)
         candidate['_id'] = str(result.inserted_id)
         return jsonify({'data': candidate, 'status': 'success', 'message': 'Resume parsed and candidate stored'})
     except Exception as e:
@@ -96,6 +489,7 @@ def parse_resume():
         return jsonify({'error': f'Internal server error: {str(e)}', 'status': 'error'}), 500
 
 @app.route('/api/calculate-ats-score', methods=['POST'])
+@admission_controlled('llm')
 def calculate_ats_score():
     try:
         data = request.get_json()
@@ -103,29 +497,83 @@ def calculate_ats_score():
         resume_text = data.get('resume_text', '')
         job_skills = data.get('job_skills', [])
         job_description = data.get('job_description', '')
+        if not resume_text and candidate_id:
+            # Slim candidate listings don't carry the resume text; load it from blob storage
+            stored = mongo.db.candidates.find_one({'_id': ObjectId(candidate_id)}, {'blob_refs': 1, 'resume_text': 1})
+            resume_text = (blob_store.hydrate(stored, ['resume_text']) or {}).get('resume_text', '')
         if not resume_text:
             return jsonify({'error': 'Resume text is required', 'status': 'error'}), 400
         if not job_skills:
             return jsonify({'error': 'Job skills are required', 'status': 'error'}), 400
-        ats_analysis = resume_service.calculate_ats_score(resume_text, job_skills, job_description)
+        prompt_prefix = None
+        profile = None
+        if data.get('job_id'):
+            job = mongo.db.jobs.find_one({'_id': ObjectId(data['job_id'])})
+            if job:
+                prompt_prefix = job_profile_service.score_context(job)['prompt_prefix']
+                profile = job_profile_service.get_profile(job)
+        # Only stored candidates can be upgraded later; ad-hoc scoring stays synchronous
+        upgrade = ats_upgrade_service.enabled and bool(candidate_id)
+        with metrics.timer('route.ats_score'):
+            if upgrade:
+                ats_analysis = resume_service.provisional_ats_score(resume_text, job_skills, profile and profile['weight_vector'])
+            else:
+                ats_analysis = resume_service.calculate_ats_score(resume_text, job_skills, job_description, prompt_prefix)
         # Update candidate in DB
+        stored = None
         if candidate_id:
-            mongo.db.candidates.update_one({'_id': candidate_id}, {'$set': {
+            updates = {
                 'ats_score': ats_analysis.get('overall_score', 0),
                 'ats_analysis': ats_analysis,
+                'ats_status': ATS_PROVISIONAL if upgrade else ATS_FINAL,
                 'status': 'ats_scored',
                 'ats_scored_at': datetime.now().isoformat()
-            }})
-        return jsonify({'data': ats_analysis, 'status': 'success', 'message': 'ATS score calculated successfully'})
+            }
+            unset = blob_store.unset_fields(updates)
+            if profile:
+                updates['score_inputs.ats'] = job_profile_service.score_inputs(profile)
+            else:
+                # Scored against ad-hoc skills; let the recalculation treat it as stale
+                unset['score_inputs.ats'] = ''
+            with metrics.timer('route.mongo_update'):
+                stored = mongo.db.candidates.find_one_and_update({'_id': ObjectId(candidate_id)}, {
+                    '$set': blob_store.set_fields(updates),
+                    '$unset': unset,
+                    '$inc': {'ats_version': 1}
+                }, projection={'ats_version': 1}, return_document=ReturnDocument.AFTER)
+            search_service.update_fields(ObjectId(candidate_id), updates)
+            leaderboard.record(ObjectId(candidate_id), updates)
+            versions.bump('candidates')
+            if upgrade and stored:
+                ats_upgrade_service.submit(stored['_id'], stored['ats_version'], resume_text, {
+                    'job_skills': job_skills, 'job_description': job_description, 'prompt_prefix': prompt_prefix
+                })
+        response = {'data': ats_analysis, 'status': 'success', 'message': 'ATS score calculated successfully'}
+        if upgrade and stored:
+            response.update({'ats_status': ATS_PROVISIONAL, 'ats_version': stored['ats_version']})
+        return jsonify(response)
     except Exception as e:
         print(f"Error calculating ATS score: {str(e)}")
         print(traceback.format_exc())
         return jsonify({'error': f'Internal server error: {str(e)}', 'status': 'error'}), 500
 
+def _transition_rejected_response(rejection):
+    if not rejection.found:
+        return jsonify({'status': 'error', 'error': 'Candidate not found'}), 404
+    if rejection.current == INTERVIEW_COMPLETED:
+        return jsonify({'status': 'error', 'error': 'Interview already completed for this candidate.'}), 400
+    if rejection.current == INTERVIEW_ANALYZING:
+        return jsonify({'status': 'error', 'error': 'Interview analysis already in progress for this candidate.'}), 409
+    return jsonify({'status': 'error', 'error': f"Candidate status '{rejection.current}' does not allow this step."}), 409
+
 @app.route('/api/analyze-transcript', methods=['POST'])
+@json_object_body
+@idempotent_webhook('analyze-transcript')
+@admission_controlled('nlp')
 def analyze_transcript():
     data = request.get_json()
-    print('Received analyze-transcript payload:', data)  # Debug log
+    log_event('webhook_received', source='analyze-transcript', delivery=g.get('webhook_delivery'),
+              bytes=request.content_length, fields=payload_summary(data))
     # Extract answers from Omnidimension webhook
     leadership = data.get('leadership_response')
     communication = data.get('communication_response')
@@ -137,17 +585,21 @@ def analyze_transcript():
     candidate_email = data.get('email') or data.get('user_email')
     candidate_name = data.get('name') or data.get('candidate_name')
 
-    # Fetch candidate from DB (using email if available)
-    candidate = None
+    # Identify the candidate by email if available; name is a fallback (not recommended)
     if candidate_email:
-        candidate = mongo.db.candidates.find_one({'email': candidate_email})
+        query = {'email': candidate_email}
+    elif candidate_name:
+        query = {'name': candidate_name}
     else:
-        # Try to find by name if email is missing (not recommended, but fallback)
-        if candidate_name:
-            candidate = mongo.db.candidates.find_one({'name': candidate_name})
-    if not candidate:
         return jsonify({'status': 'error', 'error': 'Candidate not found'}), 404
 
+    # Reserve the candidate before the expensive analysis, so concurrent
+    # deliveries of the same interview cannot both run it
+    try:
+        candidate, reservation = candidate_state.reserve(query, projection={'email': 1, 'name': 1, 'status': 1})
+    except TransitionRejected as e:
+        return _transition_rejected_response(e)
+
     # Ensure email and name are set from DB if missing
     if not candidate_email:
         candidate_email = candidate.get('email')
@@ -157,12 +609,9 @@ def analyze_transcript():
     # Check for required fields
     if not candidate_email or not candidate_name:
         print("[n8n webhook] Missing candidate_email or candidate_name, skipping webhook trigger.")
+        candidate_state.release(candidate['_id'], reservation, candidate.get('status'))
         return jsonify({'status': 'error', 'error': 'Missing candidate_email or candidate_name'}), 400
 
-    # Block multiple interviews (only if already completed)
-    if candidate.get('status') == 'interview_completed':
-        return jsonify({'status': 'error', 'error': 'Interview already completed for this candidate.'}), 400
-
     # Build answers dict for ML model
     answers = {
         'leadership': leadership,
@@ -175,20 +624,30 @@ def analyze_transcript():
     }
 
     # Run ML scoring (replace with your actual model function)
-    score = scoring_service.analyze_transcript(full_conversation or summary or "")
-
-    # Update candidate record in DB if email is provided
-    mongo.db.candidates.update_one(
-        {'email': candidate_email},
-        {'$set': {
-            'interview_transcript': full_conversation,
-            'behavior_score': score.get('overall_score', 0),
-            'interview_analysis': score,
-            'status': 'interview_completed',
-            'interview_completed_at': datetime.now().isoformat(),
-            'behavioral_answers': answers
-        }}
-    )
+    try:
+        with metrics.timer('route.analyze_transcript'):
+            score = scoring_service.analyze_transcript(full_conversation or summary or "")
+    except Exception:
+        candidate_state.release(candidate['_id'], reservation, candidate.get('status'))
+        raise
+
+    # Store the result; only the holder of the reservation may complete it
+    updates = {
+        'interview_transcript': full_conversation,
+        'behavior_score': score.get('overall_score', 0),
+        'interview_analysis': score,
+        'interview_completed_at': datetime.now().isoformat(),
+        'behavioral_answers': answers,
+        'score_inputs.behavior': scoring_service.score_inputs()
+    }
+    with metrics.timer('route.mongo_update'):
+        stored = candidate_state.complete(candidate['_id'], reservation, INTERVIEW_COMPLETED,
+                                          blob_store.set_fields(updates), blob_store.unset_fields(updates))
+    if not stored:
+        return jsonify({'status': 'error', 'error': 'Interview analysis was taken over by another request.'}), 409
+    updates['status'] = INTERVIEW_COMPLETED
+    search_service.update_fields(candidate['_id'], updates)
+    leaderboard.record(candidate['_id'], updates)
 
     # Optionally trigger n8n if score is high and required fields are present
     if score.get('overall_score', 0) >= FINAL_SCORE_THRESHOLD and N8N_WEBHOOK_URL and candidate_email and candidate_name:
@@ -202,24 +661,176 @@ def analyze_transcript():
             'interview_date': data.get('interview_date'),
             'interview_time': data.get('interview_time')
         }
-        print(f"Triggering n8n webhook: {N8N_WEBHOOK_URL}\nPayload: {payload}")
+        log_event('n8n_trigger', candidate_id=candidate['_id'], fields=payload_summary(payload))
         try:
-            requests.post(N8N_WEBHOOK_URL, json=payload, timeout=10)
+            with metrics.timer('route.n8n_post'):
+                requests.post(N8N_WEBHOOK_URL, json=payload, timeout=10)
         except Exception as e:
-            print(f"Failed to trigger n8n: {e}")
+            log_event('n8n_trigger_failed', candidate_id=candidate['_id'], error=str(e))
 
     return jsonify({'status': 'success', 'score': score})
 
 @app.route('/api/candidates', methods=['GET'])
+@versioned('candidates')
 def get_candidates():
     try:
-        candidates = list(mongo.db.candidates.find())
-        for candidate in candidates:
-            candidate['_id'] = str(candidate['_id'])
+        # Listings only carry the slim document; heavy fields come from the detail view
+        with metrics.timer('route.mongo_find'):
+            candidates = list(mongo.db.candidates.find({}, blob_store.slim_projection()))
         return jsonify({'success': True, 'candidates': candidates})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _float_arg(name):
+    value = request.args.get(name)
+    return float(value) if value not in (None, '') else None
+
+@app.route('/api/candidates/search', methods=['GET'])
+def search_candidates():
+    """Boolean skill filters, full-text query, score ranges and facet counts"""
+    started = time.perf_counter()
+    try:
+        ats_range = (_float_arg('min_ats_score'), _float_arg('max_ats_score'))
+        behavior_range = (_float_arg('min_behavior_score'), _float_arg('max_behavior_score'))
+        limit = min(int(request.args.get('limit', 20)), 100)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({'error': 'Score ranges, limit and offset must be numbers', 'status': 'error'}), 400
+    with metrics.timer('route.search'):
+        result = search_service.search(
+            text=request.args.get('q', '').strip(),
+            skills=request.args.get('skills', ''),
+            job_id=request.args.get('job_id'),
+            status=request.args.get('status'),
+            ats_range=ats_range,
+            behavior_range=behavior_range,
+            limit=limit,
+            offset=offset,
+            facets=request.args.get('facets', 'false').lower() == 'true'
+        )
+    return jsonify({
+        'success': True,
+        'candidates': result['results'],
+        'total': result['total'],
+        'facets': result['facets'],
+        'took_ms': round((time.perf_counter() - started) * 1000, 2)
+    })
+
+EXPORT_FIELDS = ['_id', 'name', 'email', 'phone', 'job_id', 'status', 'ats_score', 'behavior_score',
+                 'skills', 'created_at', 'ats_scored_at', 'interview_completed_at']
+
+def _export_rows(cursor, export_format):
+    """Yield one encoded NDJSON line or CSV row per candidate"""
+    if export_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        yield buffer.getvalue()
+    for candidate in cursor:
+        if export_format == 'csv':
+            buffer.seek(0)
+            buffer.truncate()
+            skills = candidate.get('skills') or []
+            writer.writerow([
+                ';'.join(skills) if field == 'skills' else candidate.get(field, '')
+                for field in EXPORT_FIELDS
+            ])
+            yield buffer.getvalue()
+        else:
+            yield dumps_bytes(candidate) + b'\n'
+
+@app.route('/api/candidates/export', methods=['GET'])
+def export_candidates():
+    """Stream candidates and scores as CSV or NDJSON in constant memory"""
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({'error': 'format must be csv or ndjson', 'status': 'error'}), 400
+    query = {}
+    if request.args.get('job_id'):
+        query['job_id'] = request.args['job_id']
+    if request.args.get('status'):
+        query['status'] = request.args['status']
+    try:
+        for param, field in (('min_ats_score', 'ats_score'), ('min_behavior_score', 'behavior_score')):
+            if request.args.get(param):
+                query[field] = {'$gte': float(request.args[param])}
+    except ValueError:
+        return jsonify({'error': 'Score thresholds must be numbers', 'status': 'error'}), 400
+
+    # Unsorted scan; job_id and min_ats_score use the (job_id, ats_score, _id)
+    # index created by LeaderboardService.ensure_indexes
+    cursor = mongo.db.candidates.find(query, {field: 1 for field in EXPORT_FIELDS}).batch_size(500)
+    filename = f"candidates_{request.args.get('job_id', 'all')}.{export_format}"
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    return Response(
+        stream_with_context(_export_rows(cursor, export_format)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@app.route('/api/candidates/<candidate_id>', methods=['GET'])
+def get_candidate(candidate_id):
+    candidate = mongo.db.candidates.find_one({'_id': ObjectId(candidate_id)})
+    if not candidate:
+        return jsonify({'error': 'Candidate not found'}), 404
+    with metrics.timer('route.blob_fetch'):
+        blob_store.hydrate(candidate)
+    return jsonify({'success': True, 'candidate': candidate})
+
+@app.route('/api/candidates/<candidate_id>/ats', methods=['GET'])
+def get_candidate_ats(candidate_id):
+    """Poll target for background ATS upgrades.
+
+    Pass ``?version=<n>`` with the last seen ``ats_version`` to skip the
+    analysis payload while nothing has changed.
+    """
+    candidate = mongo.db.candidates.find_one(
+        {'_id': ObjectId(candidate_id)},
+        {'ats_score': 1, 'ats_status': 1, 'ats_version': 1, 'ats_scored_at': 1, 'ats_analysis': 1, 'blob_refs.ats_analysis': 1}
+    )
+    if not candidate:
+        return jsonify({'error': 'Candidate not found'}), 404
+    result = {
+        'candidate_id': candidate_id,
+        'ats_score': candidate.get('ats_score'),
+        'ats_status': candidate.get('ats_status', ATS_FINAL),
+        'ats_version': candidate.get('ats_version', 0),
+        'ats_scored_at': candidate.get('ats_scored_at')
+    }
+    known = request.args.get('version', type=int)
+    result['changed'] = known is None or known != result['ats_version']
+    if result['changed']:
+        blob_store.hydrate(candidate, ['ats_analysis'])
+        result['ats_analysis'] = candidate.get('ats_analysis')
+    return jsonify({'success': True, 'ats': result})
+
+def _ranked_score_arg():
+    by = request.args.get('by', 'ats_score')
+    return by if by in RANKED_SCORES else None
+
+@app.route('/api/jobs/<job_id>/leaderboard', methods=['GET'])
+def job_leaderboard(job_id):
+    """Top candidates of a job by ``ats_score`` (default) or ``behavior_score``"""
+    by = _ranked_score_arg()
+    if not by:
+        return jsonify({'error': f"'by' must be one of {', '.join(RANKED_SCORES)}"}), 400
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    skip = max(0, request.args.get('offset', 0, type=int))
+    with metrics.timer('route.mongo_find'):
+        entries = leaderboard.top(job_id, by, limit, skip)
+    return jsonify({'success': True, 'job_id': job_id, 'by': by, 'leaderboard': entries})
+
+@app.route('/api/candidates/<candidate_id>/rank', methods=['GET'])
+def candidate_rank(candidate_id):
+    """Rank of a candidate among the candidates of its job"""
+    by = _ranked_score_arg()
+    if not by:
+        return jsonify({'error': f"'by' must be one of {', '.join(RANKED_SCORES)}"}), 400
+    rank = leaderboard.rank(ObjectId(candidate_id), by)
+    if rank is None:
+        return jsonify({'error': 'Candidate not found'}), 404
+    return jsonify({'success': True, 'rank': rank})
+
 @app.route('/api/dashboard/stats', methods=['GET'])
 def dashboard_stats():
     try:
@@ -245,27 +856,77 @@ def create_job():
         'title': data['title'],
         'description': data['description'],
         'required_skills': data['required_skills'],
+        'version': 1,
         'created_at': datetime.now().isoformat()
     }
+    # Precompute the candidate-independent scoring inputs once per job version
+    job['profile'] = job_profile_service.build_profile(job)
     result = mongo.db.jobs.insert_one(job)
+    versions.bump('jobs')
     job['_id'] = str(result.inserted_id)
+    job.pop('profile')
+    return jsonify({'job': job, 'status': 'success'})
+
+@app.route('/api/jobs/<job_id>', methods=['PUT'])
+def update_job(job_id):
+    data = request.json or {}
+    changes = {field: data[field] for field in ('title', 'description', 'required_skills') if field in data}
+    if not changes:
+        return jsonify({'error': 'Nothing to update', 'status': 'error'}), 400
+    changes['updated_at'] = datetime.now().isoformat()
+    job = mongo.db.jobs.find_one_and_update(
+        {'_id': ObjectId(job_id)},
+        {'$set': changes, '$inc': {'version': 1}},
+        projection={'profile': 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    # Only store the profile if no newer update landed in the meantime
+    profile = job_profile_service.build_profile(job)
+    mongo.db.jobs.update_one({'_id': job['_id'], 'version': job['version']}, {'$set': {'profile': profile}})
+    job_profile_service.invalidate(job_id)
+    versions.bump('jobs', f'job:{job_id}')
     return jsonify({'job': job, 'status': 'success'})
 
 @app.route('/api/jobs', methods=['GET'])
+@versioned('jobs')
 def list_jobs():
-    jobs = list(mongo.db.jobs.find())
-    for job in jobs:
-        job['_id'] = str(job['_id'])
+    jobs = list(mongo.db.jobs.find({}, {'profile': 0}))
     return jsonify({'jobs': jobs, 'status': 'success'})
 
 @app.route('/api/jobs/<job_id>', methods=['GET'])
+@versioned(lambda job_id: f'job:{job_id}')
 def get_job(job_id):
-    job = mongo.db.jobs.find_one({'_id': ObjectId(job_id)})
+    job = mongo.db.jobs.find_one({'_id': ObjectId(job_id)}, {'profile': 0})
     if not job:
         return jsonify({'error': 'Job not found'}), 404
-    job['_id'] = str(job['_id'])
     return jsonify({'job': job, 'status': 'success'})
 
+@app.route('/api/candidates/<candidate_id>/interview-analysis', methods=['GET'])
+@admission_controlled('nlp')
+def get_interview_analysis(candidate_id):
+    """Full explanation tree of a candidate's interview analysis.
+
+    Candidates store only the score summary; the details are computed on
+    the first request and cached by transcript hash.
+    """
+    candidate = mongo.db.candidates.find_one(
+        {'_id': ObjectId(candidate_id)},
+        {'interview_transcript': 1, 'behavioral_answers': 1,
+         'blob_refs.interview_transcript': 1, 'blob_refs.behavioral_answers': 1}
+    )
+    if not candidate:
+        return jsonify({'error': 'Candidate not found', 'status': 'error'}), 404
+    blob_store.hydrate(candidate, ['interview_transcript', 'behavioral_answers'])
+    # The webhook scores the summary report when no full conversation was sent
+    transcript = candidate.get('interview_transcript') or (candidate.get('behavioral_answers') or {}).get('summary')
+    if not transcript:
+        return jsonify({'error': 'No interview transcript for this candidate', 'status': 'error'}), 404
+    with metrics.timer('route.analysis_details'):
+        details, cached = analysis_detail_service.get(transcript)
+    return jsonify({'data': details, 'cached': cached, 'status': 'success'})
+
 @app.route('/api/resume/upload', methods=['POST'])
 def resume_upload():
     return parse_resume()
@@ -277,17 +938,14 @@ def start_interview():
     if not candidate_email:
         return jsonify({'status': 'error', 'error': 'Missing candidate email'}), 400
 
-    candidate = mongo.db.candidates.find_one({'email': candidate_email})
-    if not candidate:
-        return jsonify({'status': 'error', 'error': 'Candidate not found'}), 404
-
-    if candidate.get('status') == 'interview_completed':
-        return jsonify({'status': 'error', 'error': 'Interview already completed for this candidate.'}), 400
-
-    mongo.db.candidates.update_one(
-        {'email': candidate_email},
-        {'$set': {'status': 'interview_started', 'interview_started_at': datetime.now().isoformat()}}
-    )
+    try:
+        candidate = candidate_state.transition(
+            {'email': candidate_email}, INTERVIEW_STARTED,
+            {'interview_started_at': datetime.now().isoformat()}, projection={'_id': 1}
+        )
+    except TransitionRejected as e:
+        return _transition_rejected_response(e)
+    search_service.update_fields(candidate['_id'], {'status': INTERVIEW_STARTED})
     return jsonify({'status': 'success'})
 
 @app.route('/api/schedule-meeting', methods=['POST'])
@@ -299,7 +957,8 @@ def schedule_meeting():
     if not n8n_url:
         return jsonify({"status": "error", "detail": "N8N_MEETING_WEBHOOK_URL not set in environment"}), 500
     try:
-        n8n_response = requests.post(n8n_url, json=data)
+        with metrics.timer('route.n8n_post'):
+            n8n_response = requests.post(n8n_url, json=data, timeout=10)
         if n8n_response.status_code == 200:
             return jsonify({"status": "success"})
         else:
@@ -309,5 +968,53 @@ def schedule_meeting():
         print(f"[DEBUG] Exception: {e}")
         return jsonify({"status": "error", "detail": str(e)}), 500
 
+@app.cli.command('migrate-candidate-blobs')
+def migrate_candidate_blobs():
+    """Move heavy fields of existing candidates into blob storage"""
+    legacy = {'$or': [{field: {'$exists': True}} for field in blob_store.fields]}
+    projection = {field: 1 for field in blob_store.fields}
+    migrated = 0
+    for candidate in mongo.db.candidates.find(legacy, projection).batch_size(100):
+        heavy = {field: candidate[field] for field in blob_store.fields if field in candidate}
+        mongo.db.candidates.update_one({'_id': candidate['_id']}, {
+            '$set': blob_store.set_fields(heavy),
+            '$unset': blob_store.unset_fields(heavy)
+        })
+        migrated += 1
+    if migrated:
+        versions.bump('candidates')
+    print(f"Moved heavy fields of {migrated} candidates to blob storage")
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index():
+    """Rebuild the candidate_search collection from the candidates collection"""
+    indexed = 0
+    for candidate in mongo.db.candidates.find().batch_size(100):
+        search_service.index_candidate(candidate['_id'], blob_store.hydrate(candidate))
+        indexed += 1
+    print(f"Indexed {indexed} candidates")
+
+@app.cli.command('rebuild-leaderboard')
+@click.option('--check', is_flag=True, help='Only report stale candidates and bucket counts')
+def rebuild_leaderboard(check):
+    """Recompute (or check) the per-job leaderboard bucket counts from the candidates collection"""
+    stats = leaderboard.rebuild(check_only=check)
+    print(', '.join(f'{name}: {count}' for name, count in stats.items()))
+
+@app.cli.command('recalculate-scores')
+@click.option('--job-id', help='Only recalculate candidates of this job')
+@click.option('--kind', 'kinds', multiple=True, type=click.Choice(['ats', 'behavior']),
+              help='Score kinds to recalculate (default: all)')
+@click.option('--batch-size', default=100, show_default=True)
+@click.option('--workers', default=4, show_default=True, help='Candidates scored in parallel')
+@click.option('--dry-run', is_flag=True, help='Only report how many scores are stale')
+def recalculate_scores(job_id, kinds, batch_size, workers, dry_run):
+    """Re-score candidates whose scores predate a job, taxonomy, scorer or weight change"""
+    if dry_run:
+        print(json.dumps(recalculation_service.plan(job_id), indent=2))
+        return
+    stats = recalculation_service.recalculate(job_id, kinds or ('ats', 'behavior'), batch_size, workers)
+    print(', '.join(f'{outcome}: {count}' for outcome, count in sorted(stats.items())) or 'All scores are current')
+
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
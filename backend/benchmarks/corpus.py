@@ -0,0 +1,96 @@
+import random
+from typing import List
+
+import fitz  # PyMuPDF
+
+# Vocabulary used to build synthetic resumes and transcripts. The words are
+# chosen so that every extractor and scoring rule has something to match.
+SKILL_WORDS = [
+    'python', 'django', 'flask', 'javascript', 'react', 'node', 'java', 'spring',
+    'aws', 'ec2', 'lambda', 'docker', 'kubernetes', 'git', 'github', 'sql',
+    'postgresql', 'mysql', 'tensorflow', 'pytorch', 'machine learning'
+]
+FILLER_WORDS = [
+    'delivered', 'platform', 'services', 'customers', 'improved', 'latency',
+    'designed', 'pipeline', 'reporting', 'migration', 'systems', 'quality',
+    'features', 'product', 'release', 'monitoring', 'scalable', 'backend'
+]
+BEHAVIOR_WORDS = [
+    'led', 'managed', 'presented', 'explained', 'solved', 'resolved', 'analyzed',
+    'collaborated', 'team', 'adapted', 'learned', 'achieved', 'increased',
+    'maybe', 'problem', 'because', 'specifically', 'for example', 'therefore'
+]
+UNIVERSITIES = ['State University', 'Tech Institute', 'City College', 'National School']
+DEGREES = ['Bachelor of Science', 'Master of Science', 'PhD', 'B.S.', 'M.S.']
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 54
+
+
+def _sentence(rng: random.Random, vocab: List[str], words: int) -> str:
+    return ' '.join(rng.choice(vocab) for _ in range(words)).capitalize() + '.'
+
+
+def resume_lines(pages: int, seed: int = 0, email: str = 'jordan.smith@example.com') -> List[List[str]]:
+    """Build the lines for a synthetic resume, grouped per page"""
+    rng = random.Random(seed)
+    vocab = SKILL_WORDS + FILLER_WORDS
+    result = []
+    for page_no in range(pages):
+        lines = []
+        if page_no == 0:
+            lines += [
+                'Name: Jordan Avery Smith',
+                f'Email: {email}',
+                'Phone: (555) 123-4567',
+                '',
+                'SKILLS',
+                'Skills: ' + ', '.join(rng.sample(SKILL_WORDS, 8)),
+                '',
+                'EDUCATION',
+                f'{rng.choice(DEGREES)} in Computer Science, {rng.choice(UNIVERSITIES)}',
+                f'2012 - 2016 {rng.choice(UNIVERSITIES)}',
+                '',
+            ]
+        lines.append('EXPERIENCE')
+        for _ in range(6):
+            start = rng.randint(2005, 2020)
+            end = start + rng.randint(1, 4)
+            lines.append(f'{start} - {end} Senior Engineer at Company {rng.randint(1, 999)}')
+            for _ in range(4):
+                lines.append(_sentence(rng, vocab, rng.randint(8, 14)))
+        result.append(lines)
+    return result
+
+
+def build_resume_pdf(pages: int, seed: int = 0, email: str = 'jordan.smith@example.com') -> bytes:
+    """Render a synthetic resume with exactly ``pages`` pages and return the PDF bytes"""
+    doc = fitz.open()
+    for page_lines in resume_lines(pages, seed, email):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        rect = fitz.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN)
+        page.insert_textbox(rect, '\n'.join(page_lines), fontsize=9, fontname='helv')
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def build_transcript(words: int, seed: int = 0) -> str:
+    """Build an interviewer/candidate transcript with roughly ``words`` candidate words"""
+    rng = random.Random(seed)
+    vocab = BEHAVIOR_WORDS + FILLER_WORDS
+    turns = []
+    produced = 0
+    while produced < words:
+        turns.append('Interviewer: Tell me about a time you handled a difficult situation?')
+        answer = []
+        for _ in range(rng.randint(3, 6)):
+            length = rng.randint(10, 20)
+            answer.append(_sentence(rng, vocab, length))
+            produced += length
+        if rng.random() < 0.3:
+            answer.append(f'We grew revenue by {rng.randint(5, 60)}% with a {rng.randint(3, 12)} people team.')
+            produced += 10
+        turns.append('Candidate: ' + ' '.join(answer))
+    return '\n'.join(turns)
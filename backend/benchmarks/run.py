@@ -0,0 +1,302 @@
+"""
+Offline benchmark harness for the resume and transcript hot paths and for
+response serialization.
+
+Usage (from the backend directory):
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --suites resume --pages 1,5,20 --iterations 10
+    python -m benchmarks.run --suites serialization --candidates 10000
+
+The Gemini model is replaced by a stub so runs are reproducible and need no
+network access. Results are written as JSON so two commits can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import fitz  # PyMuPDF
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import build_resume_pdf, build_transcript  # noqa: E402
+from benchmarks.stubs import STUB_ATS_RESPONSE  # noqa: E402
+from services.resume_service import ResumeService  # noqa: E402
+
+DEFAULT_JOB_SKILLS = ['python', 'aws', 'docker', 'sql', 'go']
+
+
+class _StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubGeminiModel:
+    """Stand-in for ``genai.GenerativeModel`` returning a canned ATS response"""
+
+    def __init__(self, latency_ms: float = 0.0, response_text: str = STUB_ATS_RESPONSE):
+        self.latency_ms = latency_ms
+        self.response_text = response_text
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        return _StubResponse(self.response_text)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 1) -> Dict:
+    """Time ``fn`` and record its peak traced memory in a separate run"""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    # tracemalloc slows allocation-heavy code down, so memory is sampled
+    # in its own run instead of skewing the latency numbers.
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    total = sum(samples)
+    return {
+        'iterations': iterations,
+        'p50_ms': round(_percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(_percentile(samples, 95) * 1000, 3),
+        'mean_ms': round(statistics.mean(samples) * 1000, 3),
+        'min_ms': round(min(samples) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3),
+        'throughput_per_s': round(iterations / total, 3) if total else None,
+        'peak_memory_kb': round(peak / 1024, 1)
+    }
+
+
+def _extract_pdf_text(path: str) -> str:
+    doc = fitz.open(path)
+    text = ''.join(page.get_text() for page in doc)
+    doc.close()
+    return text
+
+
+def _segment_pdf(service: ResumeService, path: str) -> dict:
+    doc = fitz.open(path)
+    layout = service.segmenter.segment(doc)
+    doc.close()
+    return layout
+
+
+def run_resume_suite(page_counts: List[int], iterations: int, llm_latency_ms: float) -> List[Dict]:
+    service = ResumeService(model=StubGeminiModel(latency_ms=llm_latency_ms))
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for pages in page_counts:
+            path = os.path.join(workdir, f'resume_{pages}.pdf')
+            with open(path, 'wb') as f:
+                f.write(build_resume_pdf(pages, seed=pages))
+
+            layout = _segment_pdf(service, path)
+            sections = layout['sections']
+            raw_text = layout['text']
+            clean_text = service._clean_text(raw_text)
+            stages = {
+                'parse_resume': lambda: service.parse_resume(path),
+                'pdf_extract': lambda: _extract_pdf_text(path),
+                'pdf_segment': lambda: _segment_pdf(service, path),
+                'pdf_extract_capped': lambda: service.pdf_extractor.extract(path),
+                'extract_from_sections': lambda: service.extract_from_sections(sections, raw_text),
+                'clean_text': lambda: service._clean_text(raw_text),
+                'extract_skills': lambda: service._extract_skills_enhanced(sections.get('skills') or raw_text),
+                'extract_experience': lambda: service._extract_experience_enhanced(sections.get('experience') or raw_text),
+                'extract_education': lambda: service._extract_education_enhanced(sections.get('education') or raw_text),
+                'calculate_ats_score': lambda: service.calculate_ats_score(clean_text, DEFAULT_JOB_SKILLS)
+            }
+            for stage, fn in stages.items():
+                stats = measure(fn, iterations)
+                p50 = stats['p50_ms'] / 1000.0
+                stats.update({
+                    'suite': 'resume',
+                    'stage': stage,
+                    'size': pages,
+                    'unit': 'pages',
+                    'text_chars': len(clean_text),
+                    'units_per_s': round(pages / p50, 3) if p50 else None
+                })
+                results.append(stats)
+    return results
+
+
+def run_transcript_suite(word_counts: List[int], iterations: int) -> List[Dict]:
+    from services.scoring_service import ScoringService
+
+    service = ScoringService()
+    results = []
+    for words in word_counts:
+        transcript = build_transcript(words, seed=words)
+        stats = measure(lambda: service.analyze_transcript(transcript), iterations)
+        p50 = stats['p50_ms'] / 1000.0
+        stats.update({
+            'suite': 'transcript',
+            'stage': 'analyze_transcript',
+            'size': words,
+            'unit': 'words',
+            'text_chars': len(transcript),
+            'units_per_s': round(words / p50, 3) if p50 else None
+        })
+        results.append(stats)
+    return results
+
+
+def build_candidate_listing(count: int, seed: int = 0) -> List[Dict]:
+    """Slim candidate documents as ``GET /api/candidates`` loads them from MongoDB"""
+    from bson import ObjectId
+
+    rng = random.Random(seed)
+    job_ids = [str(ObjectId()) for _ in range(20)]
+    candidates = []
+    for i in range(count):
+        candidates.append({
+            '_id': ObjectId(),
+            'name': f'Candidate {i}',
+            'email': f'candidate{i}@example.com',
+            'phone': '(555) 123-4567',
+            'job_id': rng.choice(job_ids),
+            'skills': rng.sample(DEFAULT_JOB_SKILLS + ['java', 'react', 'kubernetes', 'git', 'flask'], 6),
+            'status': rng.choice(['resume_uploaded', 'ats_scored', 'interview_completed']),
+            'ats_score': round(rng.uniform(0, 100), 2),
+            'behavior_score': round(rng.uniform(0, 100), 2),
+            'ats_status': 'final',
+            'created_at': datetime(2024, 1, 1, 12, 0, i % 60),
+            'blob_refs': {field: f'{rng.getrandbits(256):064x}' for field in ('resume_text', 'ats_analysis')}
+        })
+    return candidates
+
+
+def run_serialization_suite(counts: List[int], iterations: int) -> List[Dict]:
+    """Listing serialization: the previous per-document loop + json vs the fast provider, plus compression"""
+    import gzip
+
+    from services.compression import ResponseCompressor, brotli
+    from services.json_provider import dumps_bytes
+
+    compressor = ResponseCompressor()
+    results = []
+    for count in counts:
+        candidates = build_candidate_listing(count, seed=count)
+        payload = dumps_bytes({'success': True, 'candidates': candidates})
+
+        def baseline():
+            docs = [dict(candidate, _id=str(candidate['_id'])) for candidate in candidates]
+            return json.dumps({'success': True, 'candidates': docs}, default=str).encode('utf-8')
+
+        stages = {
+            'serialize_baseline': (baseline, None),
+            'serialize_fast': (lambda: dumps_bytes({'success': True, 'candidates': candidates}), None),
+            'compress_gzip': (lambda: gzip.compress(payload, compresslevel=compressor.gzip_level), 'gzip')
+        }
+        if brotli is not None:
+            stages['compress_brotli'] = (lambda: compressor.compress(payload, 'br'), 'br')
+        for stage, (fn, encoding) in stages.items():
+            stats = measure(fn, iterations)
+            output = fn()
+            stats.update({
+                'suite': 'serialization',
+                'stage': stage,
+                'size': count,
+                'unit': 'candidates',
+                'payload_bytes': len(payload),
+                'wire_bytes': len(output),
+                'encoding': encoding or 'identity'
+            })
+            results.append(stats)
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return 'unknown'
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main(argv=None) -> Dict:
+    parser = argparse.ArgumentParser(description='Benchmark resume parsing and transcript scoring')
+    parser.add_argument('--suites', default='resume,transcript',
+                        help='Comma separated suites to run (resume, transcript, serialization)')
+    parser.add_argument('--pages', type=_int_list, default=[1, 5, 10, 20],
+                        help='Comma separated synthetic resume page counts')
+    parser.add_argument('--words', type=_int_list, default=[1000, 5000, 20000, 50000],
+                        help='Comma separated synthetic transcript word counts')
+    parser.add_argument('--candidates', type=_int_list, default=[1000, 10000],
+                        help='Comma separated candidate counts for the serialization suite')
+    parser.add_argument('--iterations', type=int, default=5, help='Timed iterations per stage')
+    parser.add_argument('--llm-latency-ms', type=float, default=0.0,
+                        help='Artificial latency added to each stubbed Gemini call')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    suites = {s.strip() for s in args.suites.split(',') if s.strip()}
+    results = []
+    if 'resume' in suites:
+        results += run_resume_suite(args.pages, args.iterations, args.llm_latency_ms)
+    if 'transcript' in suites:
+        results += run_transcript_suite(args.words, args.iterations)
+    if 'serialization' in suites:
+        results += run_serialization_suite(args.candidates, args.iterations)
+
+    report = {
+        'meta': {
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pymupdf': fitz.VersionBind,
+            'generated_at': datetime.now().isoformat(),
+            'iterations': args.iterations,
+            'llm_latency_ms': args.llm_latency_ms
+        },
+        'results': results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+"""
+Canned external responses shared by the benchmark and load test harnesses.
+
+Kept free of the app's dependencies so the replay layer can import it
+without pulling in PyMuPDF or the services.
+"""
+import json
+
+# A schema-valid Gemini ATS response
+STUB_ATS_RESPONSE = json.dumps({
+    'overall_score': 78,
+    'skill_matches': [
+        {'skill': 'python', 'match_score': 90, 'evidence': 'stub', 'match_level': 'excellent'},
+        {'skill': 'aws', 'match_score': 60, 'evidence': 'stub', 'match_level': 'fair'}
+    ],
+    'missing_skills': ['go'],
+    'recommendations': ['stub recommendation'],
+    'strengths': ['stub strength'],
+    'experience_relevance': 70,
+    'education_fit': 80,
+    'overall_assessment': 'stub assessment'
+})
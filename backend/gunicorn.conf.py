@@ -0,0 +1,36 @@
+"""
+Gunicorn settings for the API.
+
+Most request time is spent waiting on Gemini, n8n and MongoDB, so the
+default profile runs gevent workers: each worker process serves up to
+``GUNICORN_WORKER_CONNECTIONS`` requests concurrently as greenlets, with
+sockets in requests and pymongo cooperatively patched. The Gemini client is
+switched to its REST transport (see ``GEMINI_TRANSPORT``) because gRPC does
+not yield to gevent.
+
+CPU-bound work does not yield either. Under gevent, resume PDF extraction
+skips its process pool (``PDF_EXTRACTION_WORKERS``), whose helper threads
+and waits would block the hub, and runs on gevent's native thread pool
+instead; spaCy transcript scoring still holds the worker while it runs, so
+keep ``ADMISSION_NLP_CONCURRENCY`` low.
+
+Set ``GUNICORN_WORKER_CLASS=sync`` (or ``gthread``) to fall back to the
+previous blocking workers.
+"""
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.getenv('GUNICORN_WORKERS', 2))
+# Concurrent requests per gevent worker
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+# Threads per worker when worker_class is gthread
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# The app must be imported after gevent has patched the standard library in
+# each worker, so it is never preloaded in the master for gevent workers
+preload_app = worker_class not in ('gevent', 'eventlet') and \
+    os.getenv('GUNICORN_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,230 @@
+"""
+Closed-loop load generator for the resume, ATS and transcript endpoints.
+
+Usage (from the backend directory, with ``python -m loadtest.serve`` running):
+    python -m loadtest.generate --concurrency 1,4,16,32 --duration 30 --output load.json
+    python -m loadtest.generate --mix parse=2,ats=1,transcript=1 --pages 2
+
+Each concurrency level runs ``--duration`` seconds with that many workers,
+each sending its next request as soon as the previous one returns. Resume
+PDFs and transcripts are generated before timing starts so the generator's
+own CPU use does not skew the results. The report lists throughput and
+p50/p95/p99 latency per endpoint and level.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, List
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import build_resume_pdf, build_transcript  # noqa: E402
+
+JOB = {
+    'title': 'Load Test Backend Engineer',
+    'description': 'Build Python services on AWS with Docker, SQL databases and CI pipelines.',
+    'required_skills': [
+        {'skill': 'python', 'weight': 5}, {'skill': 'aws', 'weight': 4},
+        {'skill': 'docker', 'weight': 3}, {'skill': 'sql', 'weight': 3}, {'skill': 'go', 'weight': 1}
+    ]
+}
+ENDPOINTS = ('parse', 'ats', 'transcript')
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(max(latencies) * 1000, 2) if latencies else 0.0
+    }
+
+
+class LoadRun:
+    """Shared state for one run: the job, the input pools and the candidates created so far"""
+
+    def __init__(self, base_url: str, resume_pool: int, pages: int, transcript_words: int, timeout: float):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.run_id = datetime.now().strftime('%Y%m%d%H%M%S')
+        print(f'Generating {resume_pool} resumes and transcripts...', file=sys.stderr)
+        self.resumes = deque(
+            (f'loadtest+{self.run_id}.{seed}@example.com',
+             build_resume_pdf(pages, seed, f'loadtest+{self.run_id}.{seed}@example.com'))
+            for seed in range(resume_pool)
+        )
+        self.transcripts = [build_transcript(transcript_words, seed) for seed in range(20)]
+        self.scored = []  # candidate ids available for rescoring
+        self.interviewable = deque()  # (candidate_id, email) not yet interviewed
+        self.lock = threading.Lock()
+        self.job_id = None
+
+    def setup(self):
+        response = requests.post(f'{self.base_url}/api/jobs', json=JOB, timeout=self.timeout)
+        response.raise_for_status()
+        self.job_id = response.json()['job']['_id']
+
+    def _next_resume(self):
+        with self.lock:
+            if not self.resumes:
+                return None
+            return self.resumes.popleft()
+
+    def parse(self, session: requests.Session) -> requests.Response:
+        item = self._next_resume()
+        if item is None:
+            raise RuntimeError('resume pool exhausted; raise --resume-pool')
+        email, pdf = item
+        response = session.post(f'{self.base_url}/api/parse-resume', data={'job_id': self.job_id},
+                                 files={'file': ('resume.pdf', pdf, 'application/pdf')}, timeout=self.timeout)
+        if response.ok:
+            candidate_id = response.json()['data']['_id']
+            with self.lock:
+                self.scored.append(candidate_id)
+                self.interviewable.append((candidate_id, email))
+        return response
+
+    def ats(self, session: requests.Session) -> requests.Response:
+        with self.lock:
+            candidate_id = random.choice(self.scored) if self.scored else None
+        if candidate_id is None:
+            return self.parse(session)
+        payload = {
+            'candidate_id': candidate_id,
+            'job_id': self.job_id,
+            'job_skills': [skill['skill'] for skill in JOB['required_skills']],
+            'job_description': JOB['description']
+        }
+        return session.post(f'{self.base_url}/api/calculate-ats-score', json=payload, timeout=self.timeout)
+
+    def transcript(self, session: requests.Session) -> requests.Response:
+        with self.lock:
+            candidate = self.interviewable.popleft() if self.interviewable else None
+        if candidate is None:
+            return self.parse(session)
+        payload = {
+            'email': candidate[1],
+            'name': 'Jordan Avery Smith',
+            'full_conversation': random.choice(self.transcripts),
+            'summary_report': 'Load test interview'
+        }
+        return session.post(f'{self.base_url}/api/analyze-transcript', json=payload, timeout=self.timeout)
+
+
+def run_level(run: LoadRun, concurrency: int, duration: float, mix: Dict[str, int]) -> Dict:
+    choices = [name for name, weight in mix.items() for _ in range(weight)]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            endpoint = random.choice(choices)
+            started = time.perf_counter()
+            try:
+                ok = getattr(run, endpoint)(session).ok
+            except Exception as e:
+                print(f'{endpoint} request failed: {e}', file=sys.stderr)
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies[endpoint].append(elapsed)
+                if not ok:
+                    errors[endpoint] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    every = [value for values in latencies.values() for value in values]
+    result = {'concurrency': concurrency, 'duration_s': round(elapsed, 2)}
+    result.update(summarize(every, sum(errors.values()), elapsed))
+    result['endpoints'] = {name: summarize(latencies[name], errors[name], elapsed) for name in latencies}
+    return result
+
+
+def _mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint '{name}', expected one of {', '.join(ENDPOINTS)}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def main(argv=None) -> Dict:
+    parser = argparse.ArgumentParser(description='Drive the API at increasing concurrency and report tail latency')
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', type=lambda v: [int(x) for x in v.split(',') if x],
+                        default=[1, 4, 16, 32], help='Comma-separated worker counts, run in order')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds per concurrency level')
+    parser.add_argument('--mix', type=_mix, default=_mix('parse=1,ats=1,transcript=1'),
+                        help='Endpoint weights, e.g. parse=2,ats=1,transcript=1')
+    parser.add_argument('--pages', type=int, default=2, help='Pages per generated resume')
+    parser.add_argument('--transcript-words', type=int, default=2000)
+    parser.add_argument('--resume-pool', type=int, default=2000, help='Unique resumes generated up front')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args(argv)
+
+    run = LoadRun(args.base_url, args.resume_pool, args.pages, args.transcript_words, args.timeout)
+    run.setup()
+
+    levels = []
+    for concurrency in args.concurrency:
+        print(f'Running {concurrency} workers for {args.duration:.0f}s...', file=sys.stderr)
+        level = run_level(run, concurrency, args.duration, args.mix)
+        levels.append(level)
+        print(f"  {level['throughput_rps']} req/s, p50 {level['p50_ms']} ms, p95 {level['p95_ms']} ms, "
+              f"p99 {level['p99_ms']} ms, {level['errors']} errors", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'base_url': args.base_url,
+            'started_at': run.run_id,
+            'mix': args.mix,
+            'pages': args.pages,
+            'transcript_words': args.transcript_words,
+            'job_id': run.job_id
+        },
+        'levels': levels
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+    return report
+
+
+if __name__ == '__main__':
+    main()
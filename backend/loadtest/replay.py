@@ -0,0 +1,183 @@
+"""
+Record/replay layer for the external calls made while serving requests.
+
+Two call sites reach the network: ``ResumeService.model.generate_content``
+(Gemini) and ``requests.post`` (the n8n webhooks in ``app.py`` and
+``EmailService``). In ``record`` mode the real call is made and its response
+is saved under ``REPLAY_DIR``; in ``replay`` mode the saved response is
+returned instead, after an injected delay that stands in for the network.
+
+Entries are keyed by a SHA-256 of the request (prompt and generation config,
+or URL and JSON body). A replayed request without a recording gets the first
+recording of the same kind, or a canned response when nothing was recorded,
+so synthetic load with unique inputs still exercises the full code path.
+
+Both call sites are patched only inside :func:`replaying`, which puts the
+real model and ``requests.post`` back on exit.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import requests
+
+from benchmarks.stubs import STUB_ATS_RESPONSE
+
+MODES = ('off', 'record', 'replay')
+
+# Returned for a replayed webhook call that was never recorded
+DEFAULT_WEBHOOK_RESPONSE = {'status_code': 200, 'text': '{"status": "ok"}'}
+
+
+class ReplayStore:
+    """JSON files under ``<directory>/<kind>/<key>.json``"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._fallbacks: Dict[str, Optional[Dict]] = {}
+
+    @staticmethod
+    def key(payload) -> str:
+        raw = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.directory, kind, f'{key}.json')
+
+    def save(self, kind: str, key: str, entry: Dict):
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, indent=2)
+
+    def load(self, kind: str, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(kind, key), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self.fallback(kind)
+
+    def fallback(self, kind: str) -> Optional[Dict]:
+        """First recording of a kind, used for requests that were never recorded"""
+        with self._lock:
+            if kind not in self._fallbacks:
+                folder = os.path.join(self.directory, kind)
+                names = sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+                entry = None
+                if names:
+                    with open(os.path.join(folder, names[0]), encoding='utf-8') as f:
+                        entry = json.load(f)
+                self._fallbacks[kind] = entry
+            return self._fallbacks[kind]
+
+
+class Latency:
+    """Injected delay: ``mean_ms`` plus uniform jitter of up to ``jitter_ms``"""
+
+    def __init__(self, mean_ms: float = 0.0, jitter_ms: float = 0.0):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+
+    def sleep(self):
+        delay = self.mean_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+
+class _TextResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class ReplayModel:
+    """Wraps a Gemini model (or stands in for one) behind ``generate_content``"""
+
+    def __init__(self, store: ReplayStore, mode: str, model=None, latency: Optional[Latency] = None):
+        if mode == 'record' and model is None:
+            raise ValueError('record mode needs the real Gemini model')
+        self.store = store
+        self.mode = mode
+        self.model = model
+        self.latency = latency or Latency()
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        key = self.store.key({'prompt': prompt, 'generation_config': generation_config})
+        if self.mode == 'record':
+            response = self.model.generate_content(prompt, generation_config=generation_config, **kwargs)
+            self.store.save('gemini', key, {'prompt_sha256': key, 'text': response.text})
+            return response
+        self.latency.sleep()
+        entry = self.store.load('gemini', key)
+        return _TextResponse(entry['text'] if entry else STUB_ATS_RESPONSE)
+
+
+class ReplayResponse:
+    """The parts of ``requests.Response`` the app reads"""
+
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+        self.ok = status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class ReplayPost:
+    """Drop-in replacement for ``requests.post``"""
+
+    def __init__(self, store: ReplayStore, mode: str, post, latency: Optional[Latency] = None):
+        self.store = store
+        self.mode = mode
+        self.post = post
+        self.latency = latency or Latency()
+
+    def __call__(self, url, data=None, json=None, **kwargs):
+        key = self.store.key({'url': url, 'json': json, 'data': data})
+        if self.mode == 'record':
+            response = self.post(url, data=data, json=json, **kwargs)
+            self.store.save('webhook', key, {'url': url, 'status_code': response.status_code, 'text': response.text})
+            return response
+        self.latency.sleep()
+        entry = self.store.load('webhook', key) or DEFAULT_WEBHOOK_RESPONSE
+        return ReplayResponse(entry['status_code'], entry['text'])
+
+
+@contextmanager
+def replaying(resume_service, mode: Optional[str] = None, directory: Optional[str] = None,
+              llm_latency: Optional[Latency] = None,
+              webhook_latency: Optional[Latency] = None) -> Iterator[Optional[ReplayStore]]:
+    """Route the app's Gemini and webhook calls through the replay layer until exit.
+
+    Settings default to ``REPLAY_MODE``, ``REPLAY_DIR``, ``REPLAY_LLM_LATENCY_MS``,
+    ``REPLAY_LLM_JITTER_MS``, ``REPLAY_WEBHOOK_LATENCY_MS`` and
+    ``REPLAY_WEBHOOK_JITTER_MS``. Yields the store, or None when mode is ``off``.
+    """
+    mode = (mode or os.getenv('REPLAY_MODE', 'off')).lower()
+    if mode not in MODES:
+        raise ValueError(f'REPLAY_MODE must be one of {", ".join(MODES)}')
+    if mode == 'off':
+        yield None
+        return
+    store = ReplayStore(directory or os.getenv('REPLAY_DIR', 'loadtest/recordings'))
+    llm_latency = llm_latency or Latency(float(os.getenv('REPLAY_LLM_LATENCY_MS', 0)),
+                                         float(os.getenv('REPLAY_LLM_JITTER_MS', 0)))
+    webhook_latency = webhook_latency or Latency(float(os.getenv('REPLAY_WEBHOOK_LATENCY_MS', 0)),
+                                                 float(os.getenv('REPLAY_WEBHOOK_JITTER_MS', 0)))
+    real_model = getattr(resume_service, 'model', None)
+    real_post = requests.post
+    resume_service.model = ReplayModel(store, mode, real_model, llm_latency)
+    # app.py and EmailService both call requests.post through the module
+    requests.post = ReplayPost(store, mode, real_post, webhook_latency)
+    try:
+        yield store
+    finally:
+        requests.post = real_post
+        resume_service.model = real_model
@@ -0,0 +1,89 @@
+"""
+Run the API with its external dependencies replaced for load testing.
+
+Usage (from the backend directory):
+    python -m loadtest.serve --mode replay --mongo mongomock --llm-latency-ms 1500
+    REPLAY_MODE=replay MONGODB_URI=mongodb://localhost:27017/codecrew_load \\
+        gunicorn --workers 4 --threads 8 'loadtest.serve:create_app()'
+
+``--mongo mongomock`` keeps the database in process memory, so use it with a
+single worker; point ``MONGODB_URI`` at a local mongod for multi-worker runs.
+Record real Gemini/n8n traffic once with ``--mode record`` (needs the real
+API key and webhook URLs), then replay it as often as needed offline.
+"""
+import argparse
+import atexit
+import os
+import sys
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest.replay import MODES, replaying  # noqa: E402
+
+DEFAULT_MONGO_URI = 'mongodb://localhost:27017/codecrew_loadtest'
+
+
+def _use_mongomock():
+    import flask_pymongo
+    import mongomock
+    flask_pymongo.MongoClient = mongomock.MongoClient
+
+
+def create_app():
+    """Import the Flask app with Mongo, Gemini and webhooks configured from the environment.
+
+    ``LOADTEST_MONGO=mongomock`` swaps the Mongo client for mongomock; the
+    ``REPLAY_*`` variables are described in :func:`loadtest.replay.replaying`,
+    which stays active until the process exits.
+    """
+    if os.getenv('LOADTEST_MONGO', '').lower() == 'mongomock':
+        _use_mongomock()
+        os.environ.setdefault('MONGODB_URI', DEFAULT_MONGO_URI)
+
+    if os.getenv('REPLAY_MODE', 'off').lower() == 'replay':
+        # Replay never reaches Gemini; skip the key check and the model listing call
+        os.environ.setdefault('GOOGLE_GEMINI_API_KEY', 'replay')
+        import services.resume_service as resume_module
+        resume_module.print_available_gemini_models = lambda: None
+        os.environ.setdefault('N8N_WEBHOOK_URL', 'http://n8n.replay/webhook/interview')
+        os.environ.setdefault('N8N_EMAIL_WEBHOOK_URL', 'http://n8n.replay/webhook/email')
+
+    from app import app, resume_service
+    replay = ExitStack()
+    replay.enter_context(replaying(resume_service))
+    atexit.register(replay.close)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the API against recorded Gemini/n8n traffic')
+    parser.add_argument('--mode', choices=MODES, default='replay')
+    parser.add_argument('--replay-dir', default='loadtest/recordings')
+    parser.add_argument('--mongo', default='mongomock', help="'mongomock' or a MongoDB URI")
+    parser.add_argument('--llm-latency-ms', type=float, default=0.0, help='Injected Gemini latency in replay mode')
+    parser.add_argument('--llm-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--webhook-latency-ms', type=float, default=0.0, help='Injected n8n latency in replay mode')
+    parser.add_argument('--webhook-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    os.environ.update({
+        'REPLAY_MODE': args.mode,
+        'REPLAY_DIR': args.replay_dir,
+        'REPLAY_LLM_LATENCY_MS': str(args.llm_latency_ms),
+        'REPLAY_LLM_JITTER_MS': str(args.llm_jitter_ms),
+        'REPLAY_WEBHOOK_LATENCY_MS': str(args.webhook_latency_ms),
+        'REPLAY_WEBHOOK_JITTER_MS': str(args.webhook_jitter_ms)
+    })
+    if args.mongo == 'mongomock':
+        os.environ['LOADTEST_MONGO'] = 'mongomock'
+    else:
+        os.environ['MONGODB_URI'] = args.mongo
+
+    create_app().run(host=args.host, port=args.port, threaded=True, use_reloader=False)
+
+
+if __name__ == '__main__':
+    main()
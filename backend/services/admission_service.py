@@ -0,0 +1,192 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from services.metrics_service import metrics
+
+# Cost classes of the expensive endpoints and their default limits:
+# (burst size, sustained requests per minute, concurrent requests per process)
+DEFAULT_LIMITS = {
+    'llm': (10, 30, 32),
+    'nlp': (20, 60, 8)
+}
+
+# Retry-After (and idle bucket lifetime) when a cost class has no refill
+# (``*_PER_MINUTE=0``): the bucket only holds its burst
+NO_REFILL_SECONDS = 3600
+
+
+class CostClass:
+    """Token-bucket and concurrency limits for one group of endpoints"""
+
+    def __init__(self, name: str, burst: float, per_minute: float, concurrency: int):
+        self.name = name
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.concurrency = concurrency
+        self.gate = threading.BoundedSemaphore(concurrency)
+
+
+class MemoryBucketStore:
+    """Token buckets held in process memory; each worker enforces its own limits"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> (tokens, last update, time at which the bucket is full again)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, burst: float, rate: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """Take ``cost`` tokens; returns ``(allowed, seconds until enough tokens)``"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (burst, now, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            if key not in self._buckets and len(self._buckets) >= self.max_keys:
+                # Buckets that have refilled carry no state worth keeping
+                self._buckets = {k: v for k, v in self._buckets.items() if v[2] > now}
+            full_at = now + (burst - tokens) / rate if rate else math.inf
+            self._buckets[key] = (tokens, now, full_at)
+        if allowed:
+            return True, 0.0
+        return False, (cost - tokens) / rate if rate else NO_REFILL_SECONDS
+
+
+class MongoBucketStore:
+    """Token buckets shared by all workers, updated atomically in MongoDB.
+
+    Each take is one ``find_one_and_update`` with an update pipeline that
+    refills, checks and debits the bucket on the server. Idle buckets expire
+    through a TTL index.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def ensure_indexes(self):
+        self.collection.create_index('expires_at', expireAfterSeconds=0)
+
+    def take(self, key: str, burst: float, rate: float, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.time()
+        refilled = {'$min': [burst, {'$add': [
+            {'$ifNull': ['$tokens', burst]},
+            {'$multiply': [{'$subtract': [now, {'$ifNull': ['$updated', now]}]}, rate]}
+        ]}]}
+        pipeline = [
+            {'$set': {'tokens': refilled, 'updated': now}},
+            {'$set': {'allowed': {'$gte': ['$tokens', cost]}}},
+            {'$set': {
+                'tokens': {'$cond': ['$allowed', {'$subtract': ['$tokens', cost]}, '$tokens']},
+                'expires_at': datetime.utcnow() + timedelta(seconds=burst / rate if rate else NO_REFILL_SECONDS)
+            }}
+        ]
+        bucket = self.collection.find_one_and_update(
+            {'_id': key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        if bucket['allowed']:
+            return True, 0.0
+        return False, (cost - bucket['tokens']) / rate if rate else NO_REFILL_SECONDS
+
+
+class Admission:
+    """Outcome of an admission check; release it when the request finishes"""
+
+    def __init__(self, allowed: bool, status: int = 200, retry_after: int = 0, reason: str = '',
+                 gate: Optional[threading.BoundedSemaphore] = None, cost_class: str = ''):
+        self.allowed = allowed
+        self.status = status
+        self.retry_after = retry_after
+        self.reason = reason
+        self.cost_class = cost_class
+        self._gate = gate
+
+    def release(self):
+        if self._gate is not None:
+            self._gate.release()
+            self._gate = None
+            metrics.add_gauge('admission_in_flight', -1, {'cost_class': self.cost_class})
+
+
+class AdmissionService:
+    """Admission control for the LLM- and NLP-backed endpoints.
+
+    A request is first charged against a token bucket for its client (API
+    key, else IP address) and cost class; an empty bucket is rejected with
+    429. It then has to get one of the cost class's concurrency slots in
+    this process, waiting at most ``ADMISSION_QUEUE_TIMEOUT_MS``; otherwise
+    it is rejected with 503. Both rejections carry a Retry-After value.
+
+    Limits come from ``ADMISSION_<CLASS>_BURST``, ``ADMISSION_<CLASS>_PER_MINUTE``
+    and ``ADMISSION_<CLASS>_CONCURRENCY``. With ``ADMISSION_STORE=mongo`` the
+    buckets are shared by all workers; concurrency slots are always per process.
+    """
+
+    API_KEY_HEADER = 'X-API-Key'
+
+    def __init__(self, collection=None):
+        self.enabled = os.getenv('ADMISSION_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.queue_timeout = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_MS', 0)) / 1000.0
+        self.trust_proxy = os.getenv('ADMISSION_TRUST_PROXY', 'false').lower() in ('1', 'true', 'yes')
+        self.classes = {}
+        for name, (burst, per_minute, concurrency) in DEFAULT_LIMITS.items():
+            prefix = f'ADMISSION_{name.upper()}_'
+            self.classes[name] = CostClass(
+                name,
+                float(os.getenv(prefix + 'BURST', burst)),
+                float(os.getenv(prefix + 'PER_MINUTE', per_minute)),
+                int(os.getenv(prefix + 'CONCURRENCY', concurrency))
+            )
+        self.memory_store = MemoryBucketStore()
+        self.shared_store = None
+        if collection is not None and os.getenv('ADMISSION_STORE', 'memory').lower() == 'mongo':
+            self.shared_store = MongoBucketStore(collection)
+
+    def ensure_indexes(self):
+        if self.shared_store:
+            self.shared_store.ensure_indexes()
+
+    def client_key(self, headers, remote_addr: Optional[str]) -> str:
+        api_key = headers.get(self.API_KEY_HEADER)
+        if api_key:
+            return 'key:' + hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:32]
+        if self.trust_proxy and headers.get('X-Forwarded-For'):
+            return 'ip:' + headers['X-Forwarded-For'].split(',')[0].strip()
+        return f'ip:{remote_addr or "unknown"}'
+
+    def _take(self, key: str, cost_class: CostClass) -> Tuple[bool, float]:
+        if self.shared_store:
+            try:
+                return self.shared_store.take(key, cost_class.burst, cost_class.rate)
+            except Exception as e:
+                # Keep limiting per process rather than failing requests
+                print(f"Shared admission store unavailable, using in-process buckets: {e}")
+        return self.memory_store.take(key, cost_class.burst, cost_class.rate)
+
+    def admit(self, cost_class_name: str, client: str) -> Admission:
+        cost_class = self.classes[cost_class_name]
+        if not self.enabled:
+            return Admission(True)
+
+        allowed, wait = self._take(f'{cost_class.name}:{client}', cost_class)
+        if not allowed:
+            metrics.inc('admission_rejections_total', labels={'cost_class': cost_class.name, 'reason': 'rate_limit'})
+            return Admission(False, 429, max(1, math.ceil(wait)), 'Rate limit exceeded')
+
+        if self.queue_timeout:
+            acquired = cost_class.gate.acquire(timeout=self.queue_timeout)
+        else:
+            acquired = cost_class.gate.acquire(blocking=False)
+        if not acquired:
+            metrics.inc('admission_rejections_total', labels={'cost_class': cost_class.name, 'reason': 'concurrency'})
+            return Admission(False, 503, 1, 'Server busy')
+        metrics.add_gauge('admission_in_flight', 1, {'cost_class': cost_class.name})
+        return Admission(True, gate=cost_class.gate, cost_class=cost_class.name)
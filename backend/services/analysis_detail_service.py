@@ -0,0 +1,43 @@
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+
+from services.metrics_service import metrics
+from services.scoring_service import transcript_hash
+
+
+class AnalysisDetailService:
+    """Explanation trees of transcript analyses, computed on first request.
+
+    Candidates only store the score summary of their interview analysis.
+    The full tree (keyword lists, penalties, rewards, explanations and the
+    breakdown view) is computed when it is first asked for and cached in the
+    ``transcript_analyses`` collection, keyed by transcript hash and the
+    scorer's ``score_inputs`` key so a weight or scorer change computes it
+    afresh. Entries expire after ``ANALYSIS_DETAIL_TTL_SECONDS``.
+    """
+
+    def __init__(self, collection, scoring_service):
+        self.collection = collection
+        self.scoring_service = scoring_service
+        self.ttl_seconds = int(os.getenv('ANALYSIS_DETAIL_TTL_SECONDS', 30 * 24 * 3600))
+
+    def ensure_indexes(self):
+        self.collection.create_index('expires_at', expireAfterSeconds=0)
+
+    def get(self, transcript: str) -> Tuple[Dict, bool]:
+        """Return ``(details, cached)`` for ``transcript``"""
+        key = f"{transcript_hash(transcript)}:{self.scoring_service.score_inputs()['key']}"
+        cached = self.collection.find_one({'_id': key}, {'details': 1})
+        if cached:
+            metrics.inc('cache_hits_total', labels={'cache': 'analysis_details'})
+            return cached['details'], True
+        metrics.inc('cache_misses_total', labels={'cache': 'analysis_details'})
+        details = self.scoring_service.analysis_details(transcript)
+        now = datetime.utcnow()
+        self.collection.replace_one({'_id': key}, {
+            'details': details,
+            'created_at': now,
+            'expires_at': now + timedelta(seconds=self.ttl_seconds)
+        }, upsert=True)
+        return details, False
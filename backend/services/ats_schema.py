@@ -0,0 +1,107 @@
+from typing import Dict, List
+
+# Bump when the ATS prompt, schema or fallback scoring changes in a way that
+# makes stored ATS scores incomparable with new ones
+ATS_SCORER_VERSION = 1
+
+# Recorded as ``score_formula`` on analyses whose overall score is the
+# job-weighted mean of their per-skill match scores (the local keyword
+# scorers). Gemini's overall score is its own judgment and has no formula,
+# so only these analyses can be recombined when the job weights change.
+WEIGHTED_SKILL_MEAN = 'weighted_skill_mean/1'
+
+MATCH_LEVELS = ['excellent', 'good', 'fair', 'poor']
+
+# Response schema sent to Gemini (OpenAPI subset understood by response_schema)
+ATS_RESPONSE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'overall_score': {'type': 'NUMBER'},
+        'skill_matches': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'skill': {'type': 'STRING'},
+                    'match_score': {'type': 'NUMBER'},
+                    'evidence': {'type': 'STRING'},
+                    'match_level': {'type': 'STRING', 'enum': MATCH_LEVELS}
+                },
+                'required': ['skill', 'match_score', 'match_level']
+            }
+        },
+        'missing_skills': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'recommendations': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'strengths': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'experience_relevance': {'type': 'NUMBER'},
+        'education_fit': {'type': 'NUMBER'},
+        'overall_assessment': {'type': 'STRING'}
+    },
+    'required': ['overall_score', 'skill_matches', 'missing_skills', 'experience_relevance',
+                 'education_fit', 'overall_assessment']
+}
+
+ATS_GENERATION_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': ATS_RESPONSE_SCHEMA,
+    'temperature': 0.2
+}
+
+
+class AtsResponseError(ValueError):
+    """Raised when a Gemini ATS response does not match ATS_RESPONSE_SCHEMA"""
+
+
+def _score(data: Dict, field: str, required: bool = True) -> float:
+    value = data.get(field)
+    if value is None:
+        if required:
+            raise AtsResponseError(f"'{field}' is missing")
+        return 0.0
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise AtsResponseError(f"'{field}' must be a number, got {type(value).__name__}")
+    return float(min(100.0, max(0.0, value)))
+
+
+def _strings(data: Dict, field: str) -> List[str]:
+    value = data.get(field) or []
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise AtsResponseError(f"'{field}' must be a list of strings")
+    return value
+
+
+def validate_ats_response(data) -> Dict:
+    """Validate a decoded ATS response in one pass and return the normalized analysis"""
+    if not isinstance(data, dict):
+        raise AtsResponseError('Response must be a JSON object')
+
+    skill_matches = []
+    raw_matches = data.get('skill_matches')
+    if not isinstance(raw_matches, list):
+        raise AtsResponseError("'skill_matches' must be a list")
+    for match in raw_matches:
+        if not isinstance(match, dict) or not isinstance(match.get('skill'), str):
+            raise AtsResponseError("each skill match needs a 'skill' string")
+        level = match.get('match_level')
+        skill_matches.append({
+            'skill': match['skill'],
+            'match_score': _score(match, 'match_score'),
+            'evidence': match.get('evidence') if isinstance(match.get('evidence'), str) else '',
+            'match_level': level if level in MATCH_LEVELS else 'fair'
+        })
+
+    assessment = data.get('overall_assessment', '')
+    if not isinstance(assessment, str):
+        raise AtsResponseError("'overall_assessment' must be a string")
+
+    return {
+        'overall_score': _score(data, 'overall_score'),
+        'skill_matches': skill_matches,
+        'missing_skills': _strings(data, 'missing_skills'),
+        'recommendations': _strings(data, 'recommendations'),
+        'strengths': _strings(data, 'strengths'),
+        'experience_relevance': _score(data, 'experience_relevance'),
+        'education_fit': _score(data, 'education_fit'),
+        'overall_assessment': assessment,
+        'method': 'Google Gemini AI'
+    }
@@ -0,0 +1,101 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+from services.metrics_service import metrics
+
+# ``ats_status`` values stored on a candidate
+ATS_PROVISIONAL = 'provisional'
+ATS_FINAL = 'final'
+ATS_LLM_FAILED = 'llm_failed'
+
+
+class AtsUpgradeService:
+    """Replaces provisional ATS scores with the Gemini analysis in the background.
+
+    Routes store a local provisional score together with an ``ats_version``
+    counter and hand the candidate to :meth:`submit`. A worker thread runs
+    the Gemini scoring and writes the result only if the candidate's
+    ``ats_version`` is still the one it was submitted with, so a newer
+    rescoring is never overwritten by an older, slower one. Clients poll
+    ``GET /api/candidates/<id>/ats`` for the upgraded result.
+
+    The queue lives in process memory; upgrades lost to a restart, or that
+    fell back to local scoring, are picked up by ``flask recalculate-scores``
+    (see RecalculationService.stuck_upgrade_query).
+    """
+
+    def __init__(self, resume_service, collection, blob_store, search_service, max_workers: Optional[int] = None,
+                 versions=None, leaderboard=None):
+        self.resume_service = resume_service
+        self.collection = collection
+        self.blob_store = blob_store
+        self.search_service = search_service
+        self.versions = versions
+        self.leaderboard = leaderboard
+        self.enabled = os.getenv('ATS_ASYNC_UPGRADE', 'true').lower() in ('1', 'true', 'yes')
+        workers = max_workers or int(os.getenv('ATS_UPGRADE_WORKERS', 4))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ats-upgrade')
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def submit(self, candidate_id, version: int, resume_text: str, score_context: Dict):
+        """Queue the Gemini scoring for a candidate stored at ``ats_version == version``"""
+        with self._lock:
+            self._pending += 1
+        metrics.add_gauge('ats_upgrades_pending', 1)
+        return self._executor.submit(self._run, candidate_id, version, resume_text, dict(score_context))
+
+    def _run(self, candidate_id, version: int, resume_text: str, score_context: Dict):
+        try:
+            with metrics.timer('ats_upgrade.llm_score'):
+                analysis = self.resume_service.calculate_ats_score(resume_text, **score_context)
+            self.apply(candidate_id, version, analysis)
+        except Exception as e:
+            print(f"Background ATS upgrade failed for {candidate_id}: {str(e)}")
+            metrics.inc('ats_upgrades_total', labels={'outcome': 'error'})
+        finally:
+            with self._lock:
+                self._pending -= 1
+            metrics.add_gauge('ats_upgrades_pending', -1)
+
+    def apply(self, candidate_id, version: int, analysis: Dict) -> bool:
+        """Write an upgraded analysis if the candidate was not rescored meanwhile"""
+        if analysis.get('method') != 'Google Gemini AI':
+            # Gemini was unavailable; keep the provisional score rather than
+            # replacing one local score with another
+            result = self.collection.update_one({'_id': candidate_id, 'ats_version': version},
+                                                {'$set': {'ats_status': ATS_LLM_FAILED}})
+            if result.modified_count and self.versions:
+                self.versions.bump('candidates')
+            metrics.inc('ats_upgrades_total', labels={'outcome': 'llm_failed'})
+            return False
+
+        updates = {
+            'ats_score': analysis.get('overall_score', 0),
+            'ats_analysis': analysis,
+            'ats_status': ATS_FINAL,
+            'ats_scored_at': datetime.now().isoformat()
+        }
+        result = self.collection.update_one({'_id': candidate_id, 'ats_version': version}, {
+            '$set': self.blob_store.set_fields(updates),
+            '$unset': self.blob_store.unset_fields(updates),
+            '$inc': {'ats_version': 1}
+        })
+        if not result.matched_count:
+            metrics.inc('ats_upgrades_total', labels={'outcome': 'superseded'})
+            return False
+        self.search_service.update_fields(candidate_id, updates)
+        if self.leaderboard:
+            self.leaderboard.record(candidate_id, updates)
+        if self.versions:
+            self.versions.bump('candidates')
+        metrics.inc('ats_upgrades_total', labels={'outcome': 'upgraded'})
+        return True
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bson.binary import Binary
+from pymongo import UpdateOne
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, zlib is always available
+    zstandard = None
+
+# Candidate fields that are large and only needed on detail views. They live
+# in the blob collection; the candidate document keeps a hash per field under
+# ``blob_refs``.
+HEAVY_CANDIDATE_FIELDS = [
+    'resume_text', 'resume_sections', 'experience', 'education',
+    'ats_analysis', 'interview_transcript', 'interview_analysis', 'behavioral_answers'
+]
+
+
+class BlobStore:
+    """Content-addressed, compressed storage for large JSON values.
+
+    Values are serialized to JSON, compressed with zstd when available (zlib
+    otherwise) and keyed by the SHA-256 of the serialized bytes, so identical
+    values are stored once.
+    """
+
+    def __init__(self, collection, fields: List[str] = HEAVY_CANDIDATE_FIELDS):
+        self.collection = collection
+        self.fields = fields
+        codec = os.getenv('BLOB_COMPRESSION', 'zstd' if zstandard else 'zlib').lower()
+        self.codec = 'zstd' if codec == 'zstd' and zstandard else 'zlib'
+        self.level = int(os.getenv('BLOB_COMPRESSION_LEVEL', 6))
+
+    def _encode(self, value) -> Tuple[str, Dict]:
+        raw = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+        if self.codec == 'zstd':
+            data = zstandard.ZstdCompressor(level=self.level).compress(raw)
+        else:
+            data = zlib.compress(raw, self.level)
+        blob = {
+            'data': Binary(data),
+            'codec': self.codec,
+            'size': len(raw),
+            'stored_size': len(data),
+            'created_at': datetime.now().isoformat()
+        }
+        return hashlib.sha256(raw).hexdigest(), blob
+
+    @staticmethod
+    def _decode(blob: Dict):
+        data = bytes(blob['data'])
+        if blob.get('codec') == 'zstd':
+            if zstandard is None:
+                raise RuntimeError('Blob is zstd-compressed but the zstandard package is not installed')
+            raw = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            raw = zlib.decompress(data)
+        return json.loads(raw)
+
+    def put_many(self, values: Dict[str, object]) -> Dict[str, str]:
+        """Store several values in one round trip; returns ``{name: hash}``"""
+        refs = {}
+        operations = []
+        for name, value in values.items():
+            ref, blob = self._encode(value)
+            refs[name] = ref
+            operations.append(UpdateOne({'_id': ref}, {'$setOnInsert': blob}, upsert=True))
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+        return refs
+
+    def get_many(self, refs: Iterable[str]) -> Dict[str, object]:
+        """Fetch several blobs by hash; returns ``{hash: value}``"""
+        refs = list(set(refs))
+        if not refs:
+            return {}
+        return {blob['_id']: self._decode(blob) for blob in self.collection.find({'_id': {'$in': refs}})}
+
+    def split(self, document: Dict) -> Dict:
+        """Move heavy fields out of a document that is about to be inserted.
+
+        Returns a slim copy whose ``blob_refs`` point at the stored values.
+        """
+        heavy = {field: document[field] for field in self.fields if field in document}
+        slim = {key: value for key, value in document.items() if key not in heavy}
+        if heavy:
+            slim['blob_refs'] = dict(document.get('blob_refs') or {}, **self.put_many(heavy))
+        return slim
+
+    def set_fields(self, updates: Dict) -> Dict:
+        """Turn a ``$set`` payload into one that stores heavy fields as blob refs"""
+        heavy = {field: updates[field] for field in self.fields if field in updates}
+        result = {key: value for key, value in updates.items() if key not in heavy}
+        for field, ref in self.put_many(heavy).items():
+            result[f'blob_refs.{field}'] = ref
+        return result
+
+    def unset_fields(self, updates: Dict) -> Dict:
+        """``$unset`` payload that drops legacy inline copies of fields being moved to blobs"""
+        return {field: '' for field in self.fields if field in updates}
+
+    def hydrate(self, document: Optional[Dict], fields: Optional[List[str]] = None) -> Optional[Dict]:
+        """Load heavy fields back into a candidate document (in place)"""
+        if not document:
+            return document
+        refs = document.get('blob_refs') or {}
+        wanted = {field: ref for field, ref in refs.items() if fields is None or field in fields}
+        values = self.get_many(wanted.values())
+        for field, ref in wanted.items():
+            if ref in values:
+                document[field] = values[ref]
+        return document
+
+    def hydrate_many(self, documents: List[Dict], fields: Optional[List[str]] = None) -> List[Dict]:
+        """Like :meth:`hydrate` for a batch of documents, with a single blob query"""
+        wanted = []
+        for document in documents:
+            refs = document.get('blob_refs') or {}
+            wanted.extend((document, field, ref) for field, ref in refs.items() if fields is None or field in fields)
+        values = self.get_many(ref for _, _, ref in wanted)
+        for document, field, ref in wanted:
+            if ref in values:
+                document[field] = values[ref]
+        return documents
+
+    def slim_projection(self) -> Dict:
+        """Projection excluding heavy fields, for list queries over legacy documents"""
+        return {field: 0 for field in self.fields}
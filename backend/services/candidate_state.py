@@ -0,0 +1,156 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from services.metrics_service import metrics
+
+RESUME_UPLOADED = 'resume_uploaded'
+ATS_SCORED = 'ats_scored'
+INTERVIEW_SCHEDULED = 'interview_scheduled'
+INTERVIEW_STARTED = 'interview_started'
+INTERVIEW_ANALYZING = 'interview_analyzing'
+INTERVIEW_COMPLETED = 'interview_completed'
+# Set by recruiters from the dashboard
+EVALUATED = 'evaluated'
+HIRED = 'hired'
+REJECTED = 'rejected'
+
+# Allowed prior statuses for each target status; None matches candidates
+# without a status. Starting or analyzing an interview is allowed from every
+# status before completion, recruiter decisions (evaluated, hired, rejected)
+# included. interview_completed is rejected (400) as before, an analysis in
+# progress answers 409, and so does any status not listed here, which the
+# checks these replace let through. Finishing an analysis is only allowed
+# from the reservation that started it, see CandidateStateService.complete.
+_BEFORE_COMPLETION = (None, RESUME_UPLOADED, ATS_SCORED, INTERVIEW_SCHEDULED, INTERVIEW_STARTED,
+                      EVALUATED, HIRED, REJECTED)
+TRANSITIONS = {
+    INTERVIEW_STARTED: _BEFORE_COMPLETION,
+    INTERVIEW_ANALYZING: _BEFORE_COMPLETION,
+}
+
+
+class TransitionRejected(Exception):
+    """A candidate could not move to the requested status"""
+
+    def __init__(self, target: str, current: Optional[str], found: bool = True):
+        self.target = target
+        self.current = current
+        self.found = found
+        super().__init__(f"Cannot move candidate from {current!r} to {target!r}" if found else 'Candidate not found')
+
+
+class CandidateStateService:
+    """Candidate status transitions as single conditional updates.
+
+    A transition is one ``find_one_and_update`` whose filter only matches
+    when the candidate is in an allowed prior status, so concurrent requests
+    cannot both pass the check. Long-running work first reserves a busy
+    status (``interview_analyzing``) with a token and lease; the result is
+    written only by the holder of that reservation. A reservation whose lease
+    (``CANDIDATE_STATE_LEASE_SECONDS``) expired, e.g. after a worker crash,
+    can be taken over.
+    """
+
+    def __init__(self, collection, versions=None):
+        self.collection = collection
+        self.versions = versions
+        self.lease_seconds = int(os.getenv('CANDIDATE_STATE_LEASE_SECONDS', 300))
+
+    def ensure_indexes(self):
+        # Webhooks identify candidates by email (or name as a fallback)
+        self.collection.create_index('email')
+        self.collection.create_index('name')
+
+    def _changed(self):
+        if self.versions:
+            self.versions.bump('candidates')
+
+    def _allowed(self, target: str) -> Dict:
+        allowed = {'status': {'$in': list(TRANSITIONS[target])}}
+        if target != INTERVIEW_ANALYZING:
+            return allowed
+        expired = {'status': INTERVIEW_ANALYZING, 'status_lease.expires_at': {'$lt': datetime.utcnow()}}
+        return {'$or': [allowed, expired]}
+
+    def _rejected(self, query: Dict, target: str) -> TransitionRejected:
+        # Only reached when the transition failed: tell "missing" from "wrong status"
+        current = self.collection.find_one(query, {'status': 1})
+        outcome = 'not_found' if current is None else 'rejected'
+        metrics.inc('candidate_transitions_total', labels={'target': target, 'outcome': outcome})
+        if current is None:
+            return TransitionRejected(target, None, found=False)
+        return TransitionRejected(target, current.get('status'))
+
+    def transition(self, query: Dict, target: str, updates: Optional[Dict] = None,
+                   projection: Optional[Dict] = None) -> Dict:
+        """Move the candidate matching ``query`` to ``target`` and return it as it is now.
+
+        Raises TransitionRejected when no candidate matches or its status
+        does not allow the transition.
+        """
+        fields = dict(updates or {})
+        fields.update({'status': target, 'status_changed_at': datetime.now().isoformat()})
+        candidate = self.collection.find_one_and_update(
+            {'$and': [query, self._allowed(target)]},
+            {'$set': fields, '$unset': {'status_lease': ''}},
+            projection=projection, return_document=ReturnDocument.AFTER
+        )
+        if candidate is None:
+            raise self._rejected(query, target)
+        metrics.inc('candidate_transitions_total', labels={'target': target, 'outcome': 'applied'})
+        self._changed()
+        return candidate
+
+    def reserve(self, query: Dict, target: str = INTERVIEW_ANALYZING,
+                projection: Optional[Dict] = None) -> Tuple[Dict, str]:
+        """Claim the candidate for long-running work.
+
+        Returns the candidate as it was before the reservation, so its prior
+        status can be restored by ``release``, and the reservation token.
+        """
+        token = uuid.uuid4().hex
+        candidate = self.collection.find_one_and_update(
+            {'$and': [query, self._allowed(target)]},
+            {'$set': {
+                'status': target,
+                'status_changed_at': datetime.now().isoformat(),
+                'status_lease': {
+                    'token': token,
+                    'expires_at': datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+                }
+            }},
+            projection=projection, return_document=ReturnDocument.BEFORE
+        )
+        if candidate is None:
+            raise self._rejected(query, target)
+        metrics.inc('candidate_transitions_total', labels={'target': target, 'outcome': 'reserved'})
+        self._changed()
+        return candidate, token
+
+    def complete(self, candidate_id, token: str, target: str, updates: Dict, unset: Optional[Dict] = None) -> bool:
+        """Write the result of reserved work; False if the reservation was lost"""
+        fields = dict(updates)
+        fields.update({'status': target, 'status_changed_at': datetime.now().isoformat()})
+        result = self.collection.update_one(
+            {'_id': candidate_id, 'status_lease.token': token},
+            {'$set': fields, '$unset': dict(unset or {}, status_lease='')}
+        )
+        outcome = 'applied' if result.modified_count else 'lost'
+        metrics.inc('candidate_transitions_total', labels={'target': target, 'outcome': outcome})
+        if result.modified_count:
+            self._changed()
+        return bool(result.modified_count)
+
+    def release(self, candidate_id, token: str, status: Optional[str]):
+        """Give up a reservation and put the candidate back into ``status``"""
+        update = {'$unset': {'status_lease': ''}}
+        if status is None:
+            update['$unset']['status'] = ''
+        else:
+            update['$set'] = {'status': status}
+        if self.collection.update_one({'_id': candidate_id, 'status_lease.token': token}, update).modified_count:
+            self._changed()
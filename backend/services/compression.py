@@ -0,0 +1,64 @@
+import gzip
+import os
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Only text-like bodies compress well enough to be worth the CPU
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html'}
+
+
+class ResponseCompressor:
+    """Negotiates gzip/brotli for large buffered responses.
+
+    Brotli is preferred when the client accepts it and the ``brotli``
+    package is installed. Streamed responses (exports) and bodies below
+    ``COMPRESS_MIN_BYTES`` are left as they are.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv('COMPRESS_RESPONSES', 'true').lower() in ('1', 'true', 'yes')
+        self.min_bytes = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+        self.gzip_level = int(os.getenv('COMPRESS_GZIP_LEVEL', 3))
+        self.brotli_quality = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+
+    @property
+    def encodings(self):
+        return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level)
+
+    def choose(self, response, accept_encodings) -> Optional[str]:
+        """Encoding to use for ``response``, or None to send it as is"""
+        if not self.enabled or response.direct_passthrough or response.is_streamed:
+            return None
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return None
+        if 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return None
+        if (response.content_length or 0) < self.min_bytes:
+            return None
+        return accept_encodings.best_match(self.encodings)
+
+    def encode(self, response, encoding: str, data: Optional[bytes] = None):
+        """Turn ``response`` into its ``encoding`` representation; ``data`` is the body if already compressed"""
+        response.set_data(data if data is not None else self.compress(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+        # A strong ETag identifies the exact bytes, so each encoding gets its own
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f'{etag}-{encoding}')
+        return response
+
+    def apply(self, response, accept_encodings):
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose(response, accept_encodings)
+        if encoding:
+            self.encode(response, encoding)
+        return response
@@ -1,6 +1,7 @@
 import os
 import requests
 from datetime import datetime
+from services.metrics_service import metrics
 
 class EmailService:
     def __init__(self):
@@ -16,14 +17,17 @@ class EmailService:
         """
         if self.n8n_webhook_url:
             try:
-                resp = requests.post(self.n8n_webhook_url, json=email_data, timeout=10)
+                with metrics.timer('email.n8n_post'):
+                    resp = requests.post(self.n8n_webhook_url, json=email_data, timeout=10)
                 if resp.status_code in [200, 201]:
                     return {'status': 'sent', 'via': 'n8n', 'timestamp': datetime.now().isoformat()}
                 else:
                     print(f"n8n webhook failed: {resp.text}")
+                    metrics.inc('email_failures_total', labels={'reason': 'http_status'})
                     return {'status': 'failed', 'via': 'n8n', 'timestamp': datetime.now().isoformat(), 'error': resp.text}
             except Exception as e:
                 print(f"n8n webhook error: {str(e)}")
+                metrics.inc('email_failures_total', labels={'reason': 'exception'})
                 return {'status': 'failed', 'via': 'n8n', 'timestamp': datetime.now().isoformat(), 'error': str(e)}
         else:
             return {'status': 'failed', 'timestamp': datetime.now().isoformat(), 'error': 'N8N webhook URL not configured'} 
\ No newline at end of file
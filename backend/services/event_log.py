@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+from services.json_provider import dumps_bytes
+
+# Longest string value written to the log; longer values are cut
+MAX_VALUE_CHARS = int(os.getenv('LOG_MAX_VALUE_CHARS', 200))
+
+
+def _bounded(value):
+    if isinstance(value, str) and len(value) > MAX_VALUE_CHARS:
+        return value[:MAX_VALUE_CHARS] + f'...[{len(value)} chars]'
+    if isinstance(value, dict):
+        return {k: _bounded(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_bounded(v) for v in value[:20]]
+    return value
+
+
+def payload_summary(payload) -> dict:
+    """Field names and sizes of a request payload, without its contents"""
+    if not isinstance(payload, dict):
+        return {'type': type(payload).__name__}
+    return {key: len(value) if isinstance(value, (str, list, dict)) else type(value).__name__
+            for key, value in payload.items()}
+
+
+def log_event(event: str, **fields):
+    """Write one JSON line with bounded values to stdout"""
+    record = {'ts': round(time.time(), 3), 'event': event}
+    record.update(_bounded(fields))
+    line = dumps_bytes(record) + b'\n'
+    # Captured streams (gunicorn, pytest) may be text-only
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is not None:
+        buffer.write(line)
+    else:
+        sys.stdout.write(line.decode('utf-8'))
+    sys.stdout.flush()
@@ -0,0 +1,44 @@
+import time
+from typing import Dict, Optional
+
+
+class ExtractionBudget:
+    """Per-document time and step budget shared by the resume extractors.
+
+    Each regex run over a text window costs one step. Once either the step
+    count or the wall-clock deadline is exceeded the budget is exhausted and
+    extractors stop early, returning whatever they have matched so far.
+    """
+
+    def __init__(self, time_limit_ms: float = 2000, max_steps: int = 20000):
+        self.time_limit_ms = time_limit_ms
+        self.max_steps = max_steps
+        self.started = time.perf_counter()
+        self.deadline = self.started + time_limit_ms / 1000.0
+        self.steps = 0
+        self.exhausted_reason: Optional[str] = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.exhausted_reason is not None
+
+    def step(self, cost: int = 1) -> bool:
+        """Consume ``cost`` steps; returns False once the budget is exhausted"""
+        if self.exhausted_reason:
+            return False
+        self.steps += cost
+        if self.steps > self.max_steps:
+            self.exhausted_reason = 'steps'
+        elif time.perf_counter() > self.deadline:
+            self.exhausted_reason = 'time'
+        return self.exhausted_reason is None
+
+    def as_dict(self) -> Dict:
+        return {
+            'exhausted': self.exhausted,
+            'reason': self.exhausted_reason,
+            'steps': self.steps,
+            'max_steps': self.max_steps,
+            'elapsed_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'time_limit_ms': self.time_limit_ms
+        }
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import re
+from typing import Dict, List
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+class FingerprintService:
+    """Content fingerprints used to recognise repeat resume uploads.
+
+    Exact duplicates are keyed by the SHA-256 of the raw bytes and of the
+    normalized text. Near duplicates use a 64-bit SimHash over word shingles;
+    the hash is also split into bands so candidates can be found with an
+    indexed ``$in`` query before comparing Hamming distance.
+    """
+
+    def __init__(self):
+        self.mode = os.getenv('DEDUP_MODE', 'exact').lower()  # off | exact | near
+        self.max_distance = int(os.getenv('SIMHASH_MAX_DISTANCE', 3))
+        self.shingle_size = int(os.getenv('SIMHASH_SHINGLE_SIZE', 3))
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ('exact', 'near')
+
+    @property
+    def near_enabled(self) -> bool:
+        return self.mode == 'near'
+
+    def raw_sha256(self, data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def normalize_text(self, text: str) -> str:
+        text = re.sub(r'[^a-z0-9@.\s]', ' ', (text or '').lower())
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def text_sha256(self, text: str) -> str:
+        return hashlib.sha256(self.normalize_text(text).encode('utf-8')).hexdigest()
+
+    def simhash(self, text: str) -> int:
+        words = self.normalize_text(text).split()
+        if not words:
+            return 0
+        size = min(self.shingle_size, len(words))
+        weights = [0] * SIMHASH_BITS
+        for i in range(len(words) - size + 1):
+            shingle = ' '.join(words[i:i + size])
+            value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+            for bit in range(SIMHASH_BITS):
+                weights[bit] += 1 if value >> bit & 1 else -1
+        fingerprint = 0
+        for bit, weight in enumerate(weights):
+            if weight > 0:
+                fingerprint |= 1 << bit
+        return fingerprint
+
+    def simhash_bands(self, fingerprint: int) -> List[int]:
+        """Split a fingerprint into band keys; any two hashes within
+        ``SIMHASH_BANDS - 1`` bits of each other share at least one band"""
+        return [(band << _BAND_BITS) | (fingerprint >> (band * _BAND_BITS) & _BAND_MASK)
+                for band in range(SIMHASH_BANDS)]
+
+    @staticmethod
+    def hamming(a: int, b: int) -> int:
+        return bin(a ^ b).count('1')
+
+    def fingerprint_text(self, text: str) -> Dict:
+        """Fields stored on a candidate for text-level duplicate detection"""
+        fingerprint = self.simhash(text)
+        return {
+            'text_sha256': self.text_sha256(text),
+            'simhash': format(fingerprint, '016x'),
+            'simhash_bands': self.simhash_bands(fingerprint)
+        }
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import math
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+from services.ats_schema import ATS_SCORER_VERSION
+from services.metrics_service import metrics
+from services.skill_taxonomy import TAXONOMY_VERSION, canonicalize_skill
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this', 'to', 'we', 'will', 'with', 'you',
+    'your', 'who', 'what', 'which', 'can', 'all', 'any', 'about', 'into', 'out', 'up', 'us', 'also'
+}
+
+# Terms kept in the description vector
+MAX_DESCRIPTION_TERMS = 50
+
+
+class JobProfileService:
+    """Precomputes the candidate-independent parts of ATS scoring for a job.
+
+    A profile holds the canonicalized skill list, a normalized weight vector,
+    the static Gemini prompt prefix and a term vector of the description. It
+    is stored on the job document when the job is created or updated and
+    cached in-process by job id and version.
+    """
+
+    def __init__(self, resume_service):
+        self.resume_service = resume_service
+        self._cache: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def build_profile(self, job: Dict) -> Dict:
+        required_skills = job.get('required_skills') or []
+        skills = []
+        for entry in required_skills:
+            name = entry.get('skill', '') if isinstance(entry, dict) else str(entry)
+            weight = entry.get('weight', 1) if isinstance(entry, dict) else 1
+            try:
+                weight = float(weight)
+            except (TypeError, ValueError):
+                weight = 1.0
+            if name.strip():
+                skills.append({'skill': name.strip(), 'canonical': canonicalize_skill(name), 'weight': weight})
+
+        weights = Counter()
+        for skill in skills:
+            weights[skill['canonical']] += skill['weight']
+        total = sum(weights.values())
+        weight_vector = {skill: round(weight / total, 6) for skill, weight in weights.items()} if total else {}
+
+        return {
+            'job_version': job.get('version', 1),
+            'taxonomy_version': TAXONOMY_VERSION,
+            'content_hash': self.content_hash(list(weight_vector), job.get('description', '')),
+            'skills': skills,
+            'skill_names': [skill['skill'] for skill in skills],
+            'canonical_skills': list(weight_vector),
+            'weight_vector': weight_vector,
+            'prompt_prefix': self.resume_service.create_ats_prompt_prefix(required_skills, job.get('description', '')),
+            'description_terms': self.term_vector(job.get('description', '')),
+            'built_at': datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def content_hash(canonical_skills, description: str) -> str:
+        """Hash of the job inputs that need a full rescore when they change (weights excluded)"""
+        raw = json.dumps([sorted(canonical_skills), (description or '').strip()], separators=(',', ':'))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def term_vector(self, text: str, max_terms: int = MAX_DESCRIPTION_TERMS) -> Dict[str, float]:
+        """Sublinear TF weights of the description terms, L2-normalized"""
+        terms = [canonicalize_skill(t) for t in re.findall(r'[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*', (text or '').lower())]
+        counts = Counter(t for t in terms if t not in STOP_WORDS and len(t) > 1)
+        weighted = {term: 1 + math.log(count) for term, count in counts.most_common(max_terms)}
+        norm = math.sqrt(sum(w * w for w in weighted.values()))
+        return {term: round(w / norm, 6) for term, w in weighted.items()} if norm else {}
+
+    def is_current(self, job: Dict, profile: Optional[Dict]) -> bool:
+        return bool(profile) and profile.get('job_version') == job.get('version', 1) \
+            and profile.get('taxonomy_version') == TAXONOMY_VERSION
+
+    def get_profile(self, job: Dict) -> Dict:
+        """Profile for a job document, from the in-process cache, the stored copy or freshly built"""
+        job_id = str(job.get('_id'))
+        with self._lock:
+            cached = self._cache.get(job_id)
+        if self.is_current(job, cached):
+            metrics.inc('cache_hits_total', labels={'cache': 'job_profile'})
+            return cached
+
+        metrics.inc('cache_misses_total', labels={'cache': 'job_profile'})
+        profile = job.get('profile')
+        if not self.is_current(job, profile):
+            profile = self.build_profile(job)
+        with self._lock:
+            self._cache[job_id] = profile
+        return profile
+
+    def invalidate(self, job_id):
+        with self._lock:
+            self._cache.pop(str(job_id), None)
+
+    def score_inputs(self, profile: Dict) -> Dict:
+        """Inputs an ATS score is computed from, stored as ``score_inputs.ats`` on the candidate.
+
+        ``key`` changes whenever a rescore is needed; ``content_hash`` tells a
+        weights-only job edit apart from one that changed skills or description.
+        """
+        return {
+            'job_version': profile['job_version'],
+            'taxonomy_version': profile['taxonomy_version'],
+            'scorer_version': ATS_SCORER_VERSION,
+            'content_hash': profile.get('content_hash'),
+            'weights': profile['weight_vector'],
+            'key': self.score_key(profile)
+        }
+
+    @staticmethod
+    def score_key(profile: Dict) -> str:
+        return f"{profile['job_version']}.{profile['taxonomy_version']}.{ATS_SCORER_VERSION}"
+
+    def score_context(self, job: Optional[Dict]) -> Dict:
+        """Arguments for ResumeService.calculate_ats_score derived from a job"""
+        if not job:
+            return {'job_skills': [], 'job_description': '', 'prompt_prefix': None}
+        profile = self.get_profile(job)
+        return {
+            'job_skills': profile['skill_names'],
+            'job_description': job.get('description', ''),
+            'prompt_prefix': profile['prompt_prefix']
+        }
@@ -0,0 +1,56 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from bson import ObjectId
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib encoder is always available
+    orjson = None
+
+
+def _default(value):
+    """Types orjson and json don't encode natively"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize to UTF-8 JSON bytes; ObjectIds become hex strings, datetimes ISO 8601"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, falling back to the json module.
+
+    MongoDB documents can be passed to ``jsonify`` as they come out of
+    pymongo: ``ObjectId`` and ``datetime`` values are encoded during
+    serialization, so routes don't have to rewrite every document first.
+    """
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
@@ -0,0 +1,129 @@
+import math
+from collections import Counter
+from typing import Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING
+
+# Scores a leaderboard can be ordered by
+RANKED_SCORES = ('ats_score', 'behavior_score')
+
+# Candidate fields returned for a leaderboard entry
+LEADERBOARD_FIELDS = ['job_id', 'name', 'status', 'ats_score', 'behavior_score']
+
+# Candidate field recording which bucket each ranked score is counted in
+BUCKET_FIELD = 'leaderboard_buckets'
+
+
+def score_bucket(score) -> int:
+    """Bucket of a score: its integer part, so a 0-100 score has at most 101 buckets"""
+    return int(math.floor(score))
+
+
+class LeaderboardService:
+    """Per-job candidate rankings over the ``candidates`` collection.
+
+    Candidates are indexed by ``(job_id, score desc, _id)`` per ranked score,
+    so the top N of a job is a bounded index read. For ranks, the
+    ``leaderboard_buckets`` collection keeps a count of candidates per job,
+    score and integer score bucket, updated with ``$inc`` whenever a route
+    or background job writes a score. A candidate's rank is the sum of the
+    (at most 101) higher buckets plus a count within its own bucket, instead
+    of a count over every candidate ahead of it. ``flask rebuild-leaderboard``
+    recomputes or checks the counts.
+    """
+
+    def __init__(self, collection, candidates):
+        self.collection = collection
+        self.candidates = candidates
+
+    def ensure_indexes(self):
+        self.collection.create_index([('job_id', ASCENDING), ('by', ASCENDING), ('bucket', DESCENDING)], unique=True)
+        for score in RANKED_SCORES:
+            self.candidates.create_index([('job_id', ASCENDING), (score, DESCENDING), ('_id', ASCENDING)])
+
+    def record(self, candidate_id, updates: Dict):
+        """Move a candidate between bucket counts for the scores in ``updates``.
+
+        The candidate's recorded bucket is swapped atomically, so concurrent
+        writers each move it out of the bucket the previous one moved it into.
+        """
+        for by in RANKED_SCORES:
+            if updates.get(by) is None:
+                continue
+            bucket = score_bucket(updates[by])
+            before = self.candidates.find_one_and_update(
+                {'_id': candidate_id}, {'$set': {f'{BUCKET_FIELD}.{by}': bucket}},
+                projection={'job_id': 1, f'{BUCKET_FIELD}.{by}': 1}
+            )
+            if before is None:
+                continue
+            previous = (before.get(BUCKET_FIELD) or {}).get(by)
+            if previous == bucket:
+                continue
+            job_id = before.get('job_id')
+            if previous is not None:
+                self.collection.update_one({'job_id': job_id, 'by': by, 'bucket': previous}, {'$inc': {'count': -1}})
+            self.collection.update_one({'job_id': job_id, 'by': by, 'bucket': bucket}, {'$inc': {'count': 1}},
+                                       upsert=True)
+
+    def top(self, job_id: Optional[str], by: str = 'ats_score', limit: int = 10, skip: int = 0) -> List[Dict]:
+        """Candidates of ``job_id`` ordered by ``by``, best first"""
+        projection = {field: 1 for field in LEADERBOARD_FIELDS}
+        cursor = self.candidates.find({'job_id': job_id}, projection).sort([(by, DESCENDING), ('_id', ASCENDING)])
+        entries = list(cursor.skip(skip).limit(limit))
+        for position, entry in enumerate(entries, start=skip + 1):
+            entry['rank'] = position
+        return entries
+
+    def rank(self, candidate_id, by: str = 'ats_score') -> Optional[Dict]:
+        """1-based rank of a candidate within its job, or None if there is no such candidate"""
+        candidate = self.candidates.find_one({'_id': candidate_id}, {'job_id': 1, by: 1})
+        if candidate is None:
+            return None
+        job_id, score = candidate.get('job_id'), candidate.get(by)
+        result = {'candidate_id': candidate_id, 'job_id': job_id, 'by': by, 'score': score, 'rank': None}
+        if score is None:
+            return result
+        bucket = score_bucket(score)
+        higher = self.collection.find({'job_id': job_id, 'by': by, 'bucket': {'$gt': bucket}}, {'count': 1})
+        ahead = sum(entry.get('count', 0) for entry in higher)
+        # Within its own bucket, ties are broken by _id as in top()
+        ahead += self.candidates.count_documents({'job_id': job_id, by: {'$gt': score, '$lt': bucket + 1}})
+        ahead += self.candidates.count_documents({'job_id': job_id, by: score, '_id': {'$lt': candidate_id}})
+        result['rank'] = ahead + 1
+        return result
+
+    def rebuild(self, check_only: bool = False) -> Dict[str, int]:
+        """Recompute every bucket count from the candidates collection.
+
+        With ``check_only`` nothing is written; the counts report candidates
+        whose recorded bucket is wrong and bucket counts that are off.
+        """
+        stats = {'candidates': 0, 'stale_candidates': 0, 'buckets': 0, 'mismatched_buckets': 0}
+        expected = Counter()
+        projection = {'job_id': 1, BUCKET_FIELD: 1, **{by: 1 for by in RANKED_SCORES}}
+        for candidate in self.candidates.find({}, projection).batch_size(500):
+            stats['candidates'] += 1
+            recorded = candidate.get(BUCKET_FIELD) or {}
+            buckets = {}
+            for by in RANKED_SCORES:
+                if candidate.get(by) is not None:
+                    buckets[by] = score_bucket(candidate[by])
+                    expected[(candidate.get('job_id'), by, buckets[by])] += 1
+            if recorded != buckets:
+                stats['stale_candidates'] += 1
+                if not check_only:
+                    self.candidates.update_one({'_id': candidate['_id']}, {'$set': {BUCKET_FIELD: buckets}})
+
+        current = {(entry.get('job_id'), entry['by'], entry['bucket']): entry.get('count', 0)
+                   for entry in self.collection.find({})}
+        stats['buckets'] = len(expected)
+        for key in set(expected) | set(current):
+            if expected.get(key, 0) == current.get(key, 0):
+                continue
+            stats['mismatched_buckets'] += 1
+            if not check_only:
+                job_id, by, bucket = key
+                self.collection.update_one({'job_id': job_id, 'by': by, 'bucket': bucket},
+                                           {'$set': {'count': expected.get(key, 0)}}, upsert=True)
+        return stats
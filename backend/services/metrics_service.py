@@ -0,0 +1,182 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Stage timings collected for the request currently being handled, used to
+# build the Server-Timing response header. None outside of a request.
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar('request_timings', default=None)
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(key: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsService:
+    """In-process counters, gauges and histograms rendered in Prometheus text format"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._help: Dict[str, str] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._gauges: Dict[str, Dict[tuple, float]] = {}
+        self._histograms: Dict[str, Dict[tuple, _Histogram]] = {}
+
+    def describe(self, name: str, help_text: str):
+        """Register the HELP line for a metric"""
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None):
+        """Increment a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def add_gauge(self, name: str, delta: float, labels: Optional[Dict[str, str]] = None):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + delta
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None,
+                buckets: Optional[Tuple[float, ...]] = None):
+        """Record a value in a histogram (``buckets`` applies when the series is created)"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets or self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Time a block as ``stage`` and add it to the current request's Server-Timing"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe('stage_duration_seconds', elapsed, {'stage': stage})
+            timings = _request_timings.get()
+            if timings is not None:
+                timings.append((stage, elapsed))
+
+    def timed(self, stage: str):
+        """Decorator form of :meth:`timer`"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def begin_request(self):
+        """Start collecting stage timings for the current request"""
+        return _request_timings.set([])
+
+    def end_request(self, token) -> List[Tuple[str, float]]:
+        """Stop collecting stage timings and return what was recorded"""
+        timings = _request_timings.get() or []
+        _request_timings.reset(token)
+        return timings
+
+    @staticmethod
+    def server_timing_header(timings: List[Tuple[str, float]]) -> str:
+        """Format stage timings as a Server-Timing header value (durations in ms)"""
+        return ', '.join(f'{stage};dur={elapsed * 1000:.1f}' for stage, elapsed in timings)
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for kind, store in (('counter', self._counters), ('gauge', self._gauges)):
+                for name in sorted(store):
+                    if name in self._help:
+                        lines.append(f'# HELP {name} {self._help[name]}')
+                    lines.append(f'# TYPE {name} {kind}')
+                    for key, value in sorted(store[name].items()):
+                        lines.append(f'{name}{_format_labels(key)} {_format_value(value)}')
+
+            for name in sorted(self._histograms):
+                if name in self._help:
+                    lines.append(f'# HELP {name} {self._help[name]}')
+                lines.append(f'# TYPE {name} histogram')
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{_format_labels(key, ("le", _format_value(bound)))} {cumulative}')
+                    lines.append(f'{name}_bucket{_format_labels(key, ("le", "+Inf"))} {histogram.count}')
+                    lines.append(f'{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}')
+                    lines.append(f'{name}_count{_format_labels(key)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+# Shared registry used by the services and the Flask app
+metrics = MetricsService()
+metrics.describe('stage_duration_seconds', 'Time spent in an instrumented service or route stage')
+metrics.describe('http_request_duration_seconds', 'HTTP request latency by endpoint')
+metrics.describe('http_requests_total', 'HTTP requests by endpoint and status')
+metrics.describe('http_requests_in_flight', 'HTTP requests currently being handled')
+metrics.describe('cache_hits_total', 'Cache hits by cache name')
+metrics.describe('cache_misses_total', 'Cache misses by cache name')
+metrics.describe('llm_fallbacks_total', 'ATS scorings that fell back to local keyword matching')
+metrics.describe('parse_failures_total', 'Resume or LLM response parse failures by kind')
+metrics.describe('pdf_extraction_truncated_total', 'Resume PDFs cut short by the page, character or time cap')
+metrics.describe('extraction_budget_exhausted_total', 'Resume parses that hit the extraction budget, by reason')
+metrics.describe('llm_responses_total', 'Gemini ATS responses by validation outcome')
+metrics.describe('ats_upgrades_total', 'Background Gemini upgrades of provisional ATS scores by outcome')
+metrics.describe('ats_upgrades_pending', 'Provisional ATS scores waiting for the Gemini analysis')
+metrics.describe('admission_rejections_total', 'Requests rejected by admission control, by cost class and reason')
+metrics.describe('admission_in_flight', 'Admitted requests currently running, by cost class')
+metrics.describe('candidate_transitions_total', 'Candidate status transitions by target status and outcome')
+metrics.describe('webhook_deliveries_total', 'Webhook deliveries by outcome (processed, replayed, in_progress)')
+metrics.describe('score_recalculations_total', 'Stale ATS and behavior scores recalculated, by outcome')
+metrics.describe('email_failures_total', 'Failed n8n email webhook deliveries')
+metrics.describe('llm_prompt_tokens', 'Estimated tokens sent per Gemini ATS prompt')
+metrics.describe('llm_prompt_truncation_ratio', 'Share of resume tokens dropped to fit the prompt budget')
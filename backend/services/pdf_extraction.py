@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from services.metrics_service import metrics
+from services.resume_sections import TEXT_FLAGS, ResumeSegmenter
+
+
+def _extract_page_range(path: str, start: int, stop: int, max_chars: int, deadline: float) -> Tuple[List[List[Dict]], Optional[str]]:
+    """Extract the layout lines of pages ``start:stop``, stopping early at the caps.
+
+    Runs in worker processes for long documents, so it opens the file
+    itself. Returns the lines per page and the reason it stopped early, if any.
+    """
+    segmenter = ResumeSegmenter()
+    pages = []
+    chars = 0
+    doc = fitz.open(path)
+    try:
+        for page_number in range(start, stop):
+            if time.time() >= deadline:
+                return pages, 'time'
+            page_dict = doc[page_number].get_text('dict', flags=TEXT_FLAGS)
+            lines = segmenter.page_lines(page_dict, page_number)
+            pages.append(lines)
+            chars += sum(line['chars'] for line in lines)
+            if chars >= max_chars:
+                return pages, 'chars'
+    finally:
+        doc.close()
+    return pages, None
+
+
+def _gevent_threadpool():
+    """gevent's native thread pool when the standard library is monkey-patched, else None"""
+    try:
+        from gevent import get_hub
+        from gevent.monkey import is_module_patched
+    except ImportError:
+        return None
+    return get_hub().threadpool if is_module_patched('threading') else None
+
+
+class PdfExtractor:
+    """Text-only, resource-capped extraction of PDF layout lines.
+
+    Reads at most ``PDF_MAX_PAGES`` pages and ``PDF_MAX_CHARS`` characters
+    within ``PDF_EXTRACTION_TIME_MS``, stopping at whichever cap is reached
+    first and reporting it as ``truncated``. Image blocks are never decoded.
+    Documents with at least ``PDF_PARALLEL_MIN_PAGES`` pages are split into
+    page ranges extracted in a shared pool of worker processes.
+
+    Under gevent workers the process pool is not used: its result threads
+    and waits would block the hub. Extraction then runs serially on gevent's
+    native thread pool, so only the requesting greenlet waits for it.
+    """
+
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    def __init__(self):
+        self.max_pages = int(os.getenv('PDF_MAX_PAGES', 20))
+        self.max_chars = int(os.getenv('PDF_MAX_CHARS', 200000))
+        self.time_limit_ms = float(os.getenv('PDF_EXTRACTION_TIME_MS', 5000))
+        self.parallel_min_pages = int(os.getenv('PDF_PARALLEL_MIN_PAGES', 8))
+        self.workers = int(os.getenv('PDF_EXTRACTION_WORKERS', min(4, os.cpu_count() or 1)))
+
+    @classmethod
+    def _executor(cls, workers: int) -> ProcessPoolExecutor:
+        with cls._pool_lock:
+            if cls._pool is None:
+                # spawn: never fork a process that runs threads or gevent hubs
+                cls._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            return cls._pool
+
+    def extract(self, path: str) -> Dict:
+        """Return ``{'lines', 'pages_total', 'pages_read', 'chars', 'truncated', 'parallel', 'elapsed_ms'}``"""
+        started = time.time()
+        deadline = started + self.time_limit_ms / 1000.0
+        doc = fitz.open(path)
+        pages_total = doc.page_count
+        doc.close()
+
+        page_count = min(pages_total, self.max_pages)
+        truncated = 'pages' if pages_total > self.max_pages else None
+        threadpool = _gevent_threadpool()
+        parallel = threadpool is None and self.workers > 1 and page_count >= self.parallel_min_pages
+        if parallel:
+            pages, stopped = self._extract_parallel(path, page_count, deadline)
+        elif threadpool is not None:
+            pages, stopped = threadpool.apply(_extract_page_range, (path, 0, page_count, self.max_chars, deadline))
+        else:
+            pages, stopped = _extract_page_range(path, 0, page_count, self.max_chars, deadline)
+
+        # Ranges were capped separately; apply the character cap to the whole document
+        lines, chars, pages_read = [], 0, 0
+        for page_lines in pages:
+            if chars >= self.max_chars:
+                stopped = 'chars'
+                break
+            pages_read += 1
+            for line in page_lines:
+                lines.append(line)
+                chars += line['chars']
+        truncated = stopped or truncated
+        if truncated:
+            metrics.inc('pdf_extraction_truncated_total', labels={'reason': truncated})
+
+        return {
+            'lines': lines,
+            'pages_total': pages_total,
+            'pages_read': pages_read,
+            'chars': chars,
+            'truncated': truncated,
+            'parallel': parallel,
+            'elapsed_ms': round((time.time() - started) * 1000, 1)
+        }
+
+    def _extract_parallel(self, path: str, page_count: int, deadline: float) -> Tuple[List[List[Dict]], Optional[str]]:
+        chunk = -(-page_count // self.workers)
+        ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+        executor = self._executor(self.workers)
+        futures = [executor.submit(_extract_page_range, path, start, stop, self.max_chars, deadline)
+                   for start, stop in ranges]
+        done, _ = wait(futures, timeout=max(0.0, deadline - time.time()), return_when=FIRST_EXCEPTION)
+
+        # Keep pages in order up to the first range that is missing or stopped early
+        pages, stopped = [], None
+        for (start, stop), future in zip(ranges, futures):
+            if future not in done:
+                future.cancel()
+                stopped = stopped or 'time'
+                continue
+            if stopped:
+                continue
+            range_pages, range_stopped = future.result()
+            pages += range_pages
+            if range_stopped:
+                stopped = range_stopped
+        return pages, stopped
@@ -0,0 +1,136 @@
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def _gevent_patched() -> bool:
+    try:
+        from gevent.monkey import is_module_patched
+    except ImportError:
+        return False
+    return is_module_patched('threading')
+
+
+class RequestProfiler:
+    """cProfile of one request that only runs while the request's own code does.
+
+    cProfile hooks the whole thread. Under gevent every request of a worker is
+    a greenlet on the same thread, so the profiler is switched on when the
+    profiled greenlet is switched to and off when it is switched away from;
+    frames of other greenlets are never counted.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self._greenlet = None
+        self._previous_trace = None
+
+    def enable(self):
+        if _gevent_patched():
+            import greenlet
+            self._greenlet = greenlet.getcurrent()
+            self._previous_trace = greenlet.settrace(self._trace)
+        self.profile.enable()
+
+    def _trace(self, event, args):
+        if event in ('switch', 'throw'):
+            origin, target = args
+            if target is self._greenlet:
+                self.profile.enable()
+            elif origin is self._greenlet:
+                self.profile.disable()
+        if self._previous_trace is not None:
+            self._previous_trace(event, args)
+
+    def disable(self):
+        self.profile.disable()
+        if self._greenlet is not None:
+            import greenlet
+            greenlet.settrace(self._previous_trace)
+            self._greenlet = None
+
+
+class ProfilingService:
+    """Opt-in cProfile capture for individual requests.
+
+    A request is profiled when it carries the profiling header together with a
+    valid admin token, or when it is picked by the configured sampling rate.
+    Only one request per worker process is profiled at a time: cProfile can
+    only hook one profile per thread, and under gevent all requests share it.
+    A request that would be profiled while another one is returns no profiler.
+    """
+
+    PROFILE_HEADER = 'X-Profile-Request'
+    ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+
+    def __init__(self):
+        self.admin_token = os.getenv('ADMIN_API_TOKEN')
+        self.sample_rate = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+        self.top_n = int(os.getenv('PROFILE_TOP_FUNCTIONS', 40))
+        self._active = threading.Lock()
+
+    def is_admin(self, headers) -> bool:
+        """Check the admin token header; admin features are disabled without a configured token"""
+        supplied = headers.get(self.ADMIN_TOKEN_HEADER, '')
+        return bool(self.admin_token) and hmac.compare_digest(supplied, self.admin_token)
+
+    def should_profile(self, headers) -> Optional[str]:
+        """Return the trigger ('header' or 'sample') if this request should be profiled"""
+        if headers.get(self.PROFILE_HEADER) and self.is_admin(headers):
+            return 'header'
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return 'sample'
+        return None
+
+    def start(self) -> Optional[RequestProfiler]:
+        """Start profiling the current request, or return None if another request is being profiled"""
+        if not self._active.acquire(blocking=False):
+            return None
+        profiler = RequestProfiler()
+        try:
+            profiler.enable()
+        except Exception:
+            self._active.release()
+            raise
+        return profiler
+
+    def stop(self, profiler: RequestProfiler):
+        """Stop the profiler without summarising it (request failed)"""
+        profiler.disable()
+        self._active.release()
+
+    def finish(self, profiler: RequestProfiler) -> Dict:
+        """Stop the profiler and summarise its hottest frames"""
+        self.stop(profiler)
+        stats = pstats.Stats(profiler.profile)
+
+        stream = io.StringIO()
+        pstats.Stats(profiler.profile, stream=stream).sort_stats('cumulative').print_stats(self.top_n)
+
+        return {
+            'hot_frames': self._hot_frames(stats),
+            'total_calls': stats.total_calls,
+            'stats_text': stream.getvalue(),
+            'captured_at': datetime.now().isoformat()
+        }
+
+    def _hot_frames(self, stats: pstats.Stats) -> List[Dict]:
+        frames = []
+        for (filename, line, function), (cc, ncalls, tottime, cumtime, _) in stats.stats.items():
+            frames.append({
+                'function': function,
+                'file': filename,
+                'line': line,
+                'ncalls': ncalls,
+                'primitive_calls': cc,
+                'tottime_ms': round(tottime * 1000, 3),
+                'cumtime_ms': round(cumtime * 1000, 3)
+            })
+        frames.sort(key=lambda f: f['tottime_ms'], reverse=True)
+        return frames[:self.top_n]
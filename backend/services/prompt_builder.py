@@ -0,0 +1,99 @@
+import math
+import re
+from typing import Dict, List, Tuple
+
+from services.skill_taxonomy import SKILL_SYNONYMS, canonicalize_skill
+
+# Rough characters-per-token ratio for English prose with Gemini tokenizers
+CHARS_PER_TOKEN = 4
+# Longest unit (in words) the resume is split into before ranking
+MAX_UNIT_WORDS = 60
+# Tokens always left for the resume even when the job prefix is very long
+MIN_RESUME_TOKENS = 200
+
+
+class PromptBuilder:
+    """Fits the resume part of an ATS prompt into a token budget.
+
+    The resume is split into sentence-sized units, each unit is scored by how
+    many of the job's skills (and their synonyms) it mentions, and the best
+    units are kept, in their original order, until the budget is used. The
+    opening unit (name and contact details) is always kept.
+    """
+
+    def __init__(self, token_budget: int = 3000):
+        self.token_budget = token_budget
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return math.ceil(len(text or '') / CHARS_PER_TOKEN)
+
+    def split_units(self, text: str) -> List[str]:
+        units = []
+        for piece in re.split(r'(?<=[.!?])\s+|\n+', text or ''):
+            words = piece.split()
+            for start in range(0, len(words), MAX_UNIT_WORDS):
+                units.append(' '.join(words[start:start + MAX_UNIT_WORDS]))
+        return [unit for unit in units if unit]
+
+    def skill_pattern(self, job_skills: List) -> re.Pattern:
+        terms = set()
+        for skill in job_skills or []:
+            name = skill.get('skill', '') if isinstance(skill, dict) else str(skill)
+            canonical = canonicalize_skill(name)
+            terms.update([name.lower().strip(), canonical])
+            terms.update(SKILL_SYNONYMS.get(canonical, []))
+        terms.discard('')
+        if not terms:
+            return re.compile(r'(?!x)x')
+        alternatives = '|'.join(sorted(map(re.escape, terms), key=len, reverse=True))
+        return re.compile(r'(?<![\w])(' + alternatives + r')(?![\w])', re.IGNORECASE)
+
+    def fit_resume(self, resume_text: str, job_skills: List, prompt_prefix: str = '') -> Tuple[str, Dict]:
+        """Return the resume text to send and statistics about the compaction"""
+        prefix_tokens = self.estimate_tokens(prompt_prefix)
+        original_tokens = self.estimate_tokens(resume_text)
+        available = max(self.token_budget - prefix_tokens, MIN_RESUME_TOKENS)
+
+        truncated = original_tokens > available
+        if truncated:
+            text, kept, total = self._select_units(resume_text, job_skills, available)
+        else:
+            text, kept, total = resume_text, None, None
+
+        sent_tokens = self.estimate_tokens(text)
+        stats = {
+            'token_budget': self.token_budget,
+            'prefix_tokens': prefix_tokens,
+            'resume_tokens_original': original_tokens,
+            'resume_tokens_sent': sent_tokens,
+            'prompt_tokens': prefix_tokens + sent_tokens,
+            'truncation_ratio': round(1 - sent_tokens / original_tokens, 4) if original_tokens else 0.0,
+            'truncated': truncated
+        }
+        if kept is not None:
+            stats.update({'units_kept': kept, 'units_total': total})
+        return text, stats
+
+    def _select_units(self, resume_text: str, job_skills: List, available: int) -> Tuple[str, int, int]:
+        units = self.split_units(resume_text)
+        pattern = self.skill_pattern(job_skills)
+
+        ranked = []
+        for index, unit in enumerate(units):
+            hits = [m.lower() for m in pattern.findall(unit)]
+            # Distinct skills count most, repeated mentions break ties, earlier units win the rest
+            score = len(set(hits)) + 0.1 * len(hits) - index * 1e-6
+            ranked.append((float('inf') if index == 0 else score, index))
+        ranked.sort(reverse=True)
+
+        chosen = []
+        used = 0
+        for _, index in ranked:
+            cost = self.estimate_tokens(units[index]) + 1
+            if used + cost > available:
+                continue
+            chosen.append(index)
+            used += cost
+        chosen.sort()
+        return ' '.join(units[i] for i in chosen), len(chosen), len(units)
@@ -0,0 +1,224 @@
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+
+from services.ats_schema import WEIGHTED_SKILL_MEAN
+from services.ats_upgrade_service import ATS_FINAL, ATS_LLM_FAILED, ATS_PROVISIONAL
+from services.metrics_service import metrics
+from services.skill_taxonomy import canonicalize_skill
+
+
+def _batches(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class RecalculationService:
+    """Re-scores only the candidates whose stored scores are out of date.
+
+    Every ATS and behavior score is stored with the inputs it was computed
+    from under ``score_inputs`` (job version, taxonomy version, scorer
+    version, weights and a ``key`` summarizing them). A score is stale when
+    its key differs from the one the current job profile or scorer would
+    produce; stale candidates are found with an indexed query and processed
+    in batches on a bounded thread pool.
+
+    When only the weights changed, a behavior score is recombined from its
+    stored per-category subscores, and so is an ATS score whose analysis
+    records the ``WEIGHTED_SKILL_MEAN`` formula. A Gemini ATS score is not a
+    function of its per-skill scores, so it is scored again like any other
+    stale score, from the stored resume text or transcript. Resumes are
+    never re-parsed.
+
+    ATS scores still ``provisional`` or ``llm_failed`` after
+    ``ATS_UPGRADE_STALE_SECONDS`` are stale too: their background Gemini
+    upgrade was lost (worker restart) or failed, so they are scored again.
+    """
+
+    def __init__(self, candidates, jobs, blob_store, search_service, resume_service,
+                 scoring_service, job_profile_service, versions=None, leaderboard=None):
+        self.candidates = candidates
+        self.jobs = jobs
+        self.blob_store = blob_store
+        self.search_service = search_service
+        self.resume_service = resume_service
+        self.scoring_service = scoring_service
+        self.job_profile_service = job_profile_service
+        self.versions = versions
+        self.leaderboard = leaderboard
+        self.upgrade_stale_seconds = int(os.getenv('ATS_UPGRADE_STALE_SECONDS', 900))
+
+    def ensure_indexes(self):
+        self.candidates.create_index([('job_id', 1), ('score_inputs.ats.key', 1)])
+        self.candidates.create_index([('job_id', 1), ('ats_status', 1)])
+        self.candidates.create_index('score_inputs.behavior.key', sparse=True)
+
+    def stale_ats_query(self, job: Dict) -> Dict:
+        key = self.job_profile_service.score_key(self.job_profile_service.get_profile(job))
+        return {'job_id': str(job['_id']), '$or': [{'score_inputs.ats.key': {'$ne': key}}, self.stuck_upgrade_query()]}
+
+    def stuck_upgrade_query(self) -> Dict:
+        """Scores whose Gemini upgrade should have finished by now"""
+        cutoff = (datetime.now() - timedelta(seconds=self.upgrade_stale_seconds)).isoformat()
+        return {'ats_status': {'$in': [ATS_PROVISIONAL, ATS_LLM_FAILED]}, '$or': [
+            {'ats_scored_at': {'$lt': cutoff}},
+            # Uploads store only created_at until the first rescoring
+            {'ats_scored_at': {'$exists': False}, 'created_at': {'$lt': cutoff}}
+        ]}
+
+    def stale_behavior_query(self) -> Dict:
+        return {
+            'score_inputs.behavior.key': {'$ne': self.scoring_service.score_inputs()['key']},
+            'behavior_score': {'$exists': True}
+        }
+
+    def _jobs(self, job_id: Optional[str] = None) -> List[Dict]:
+        query = {'_id': ObjectId(job_id)} if job_id else {}
+        return list(self.jobs.find(query))
+
+    def plan(self, job_id=None) -> Dict:
+        """Number of stale scores per job, without changing anything"""
+        ats = {str(job['_id']): self.candidates.count_documents(self.stale_ats_query(job))
+               for job in self._jobs(job_id)}
+        behavior_query = self.stale_behavior_query()
+        if job_id:
+            behavior_query['job_id'] = str(job_id)
+        return {'ats': ats, 'behavior': self.candidates.count_documents(behavior_query)}
+
+    def recalculate(self, job_id=None, kinds=('ats', 'behavior'), batch_size: int = 100,
+                    workers: int = 4) -> Counter:
+        """Bring stale scores up to date; returns counts per outcome"""
+        stats = Counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='recalc') as executor:
+            if 'ats' in kinds:
+                for job in self._jobs(job_id):
+                    self._recalculate_ats_job(job, executor, batch_size, stats)
+            if 'behavior' in kinds:
+                query = self.stale_behavior_query()
+                if job_id:
+                    query['job_id'] = str(job_id)
+                self._run_batches(query, ['interview_analysis'], self._recalculate_behavior,
+                                  executor, batch_size, stats)
+        return stats
+
+    def _run_batches(self, query: Dict, blob_fields: List[str], handler, executor, batch_size: int,
+                     stats: Counter):
+        # Collect ids first so long-running batches don't hold a cursor open
+        ids = [doc['_id'] for doc in self.candidates.find(query, {'_id': 1})]
+        for batch_ids in _batches(ids, batch_size):
+            batch = list(self.candidates.find({'_id': {'$in': batch_ids}}, self.blob_store.slim_projection()))
+            self.blob_store.hydrate_many(batch, blob_fields)
+            for outcome in executor.map(handler, batch):
+                stats[outcome] += 1
+                metrics.inc('score_recalculations_total', labels={'outcome': outcome})
+
+    def _recalculate_ats_job(self, job: Dict, executor, batch_size: int, stats: Counter):
+        profile = self.job_profile_service.get_profile(job)
+        inputs = self.job_profile_service.score_inputs(profile)
+        context = self.job_profile_service.score_context(job)
+
+        def handler(candidate):
+            try:
+                return self._recalculate_ats(candidate, inputs, context)
+            except Exception as e:
+                print(f"ATS recalculation failed for {candidate['_id']}: {str(e)}")
+                return 'error'
+
+        self._run_batches(self.stale_ats_query(job), ['ats_analysis'], handler, executor, batch_size, stats)
+
+    def _weights_only_change(self, stored: Optional[Dict], inputs: Dict) -> bool:
+        return bool(stored) and bool(inputs['content_hash']) \
+            and stored.get('content_hash') == inputs['content_hash'] \
+            and stored.get('taxonomy_version') == inputs['taxonomy_version'] \
+            and stored.get('scorer_version') == inputs['scorer_version']
+
+    def reweight_ats(self, analysis: Dict, weights: Dict[str, float]) -> Dict:
+        """Recombine a ``WEIGHTED_SKILL_MEAN`` ATS score from its stored per-skill match scores"""
+        matches = {}
+        for match in analysis.get('skill_matches') or []:
+            canonical = canonicalize_skill(match.get('skill', ''))
+            matches[canonical] = max(matches.get(canonical, 0), match.get('match_score', 0))
+        total = sum(weights.values())
+        score = sum(matches.get(skill, 0) * weight for skill, weight in weights.items()) / total if total else 0
+        analysis['overall_score'] = round(score, 2)
+        analysis['score_formula'] = WEIGHTED_SKILL_MEAN
+        analysis['reweighted_at'] = datetime.now().isoformat()
+        return analysis
+
+    def _recalculate_ats(self, candidate: Dict, inputs: Dict, context: Dict) -> str:
+        stored = (candidate.get('score_inputs') or {}).get('ats')
+        analysis = candidate.get('ats_analysis')
+        # A provisional or failed score has no Gemini analysis to reweight
+        upgrade_pending = candidate.get('ats_status') in (ATS_PROVISIONAL, ATS_LLM_FAILED)
+        updates = {}
+        if analysis and analysis.get('score_formula') == WEIGHTED_SKILL_MEAN and not upgrade_pending \
+                and self._weights_only_change(stored, inputs):
+            analysis = self.reweight_ats(analysis, inputs['weights'])
+            outcome = 'ats_reweighted'
+        else:
+            self.blob_store.hydrate(candidate, ['resume_text'])
+            if not candidate.get('resume_text'):
+                return 'skipped'
+            analysis = self.resume_service.calculate_ats_score(candidate['resume_text'], **context)
+            outcome = 'ats_rescored'
+            updates['ats_status'] = ATS_FINAL if analysis.get('method') == 'Google Gemini AI' else ATS_LLM_FAILED
+
+        updates.update({
+            'ats_score': analysis.get('overall_score', 0),
+            'ats_analysis': analysis,
+            'ats_scored_at': datetime.now().isoformat(),
+            'score_inputs.ats': inputs
+        })
+        # ats_version guards against overwriting a rescore that landed meanwhile
+        result = self.candidates.update_one({'_id': candidate['_id'], 'ats_version': candidate.get('ats_version')}, {
+            '$set': self.blob_store.set_fields(updates),
+            '$unset': self.blob_store.unset_fields(updates),
+            '$inc': {'ats_version': 1}
+        })
+        if not result.matched_count:
+            return 'superseded'
+        self._mirror(candidate['_id'], updates)
+        return outcome
+
+    def _mirror(self, candidate_id, updates: Dict):
+        self.search_service.update_fields(candidate_id, updates)
+        if self.leaderboard:
+            self.leaderboard.record(candidate_id, updates)
+        if self.versions:
+            self.versions.bump('candidates')
+
+    def _recalculate_behavior(self, candidate: Dict) -> str:
+        try:
+            stored = (candidate.get('score_inputs') or {}).get('behavior') or {}
+            inputs = self.scoring_service.score_inputs()
+            analysis = candidate.get('interview_analysis')
+            if stored.get('scorer_version') == inputs['scorer_version'] and self.scoring_service.can_recombine(analysis):
+                analysis = self.scoring_service.recombine(analysis)
+                outcome = 'behavior_recombined'
+            else:
+                self.blob_store.hydrate(candidate, ['interview_transcript'])
+                if not candidate.get('interview_transcript'):
+                    return 'skipped'
+                analysis = self.scoring_service.analyze_transcript(candidate['interview_transcript'])
+                outcome = 'behavior_rescored'
+
+            updates = {
+                'behavior_score': analysis.get('overall_score', 0),
+                'interview_analysis': analysis,
+                'score_inputs.behavior': inputs
+            }
+            result = self.candidates.update_one(
+                {'_id': candidate['_id'], 'score_inputs.behavior.key': stored.get('key')},
+                {'$set': self.blob_store.set_fields(updates), '$unset': self.blob_store.unset_fields(updates)}
+            )
+            if not result.matched_count:
+                return 'superseded'
+            self._mirror(candidate['_id'], updates)
+            return outcome
+        except Exception as e:
+            print(f"Behavior recalculation failed for {candidate['_id']}: {str(e)}")
+            return 'error'
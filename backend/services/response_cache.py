@@ -0,0 +1,117 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from pymongo import UpdateOne
+
+from services.metrics_service import metrics
+
+# Suffixes the response compressor appends to the ETag of an encoded body
+ENCODING_SUFFIXES = ('-br', '-gzip')
+
+
+class VersionCounters:
+    """Change counters for collections and documents in ``collection_versions``.
+
+    Writers bump the counters of what they changed *after* the write, so a
+    reader that saw the old version can at worst cache newer data under it.
+    Each counter carries a random epoch set on creation, so dropping the
+    collection never hands out a version an old ETag could match. Counters
+    are only created by ``bump``; reading one that does not exist yet gives
+    a token with this process's own epoch instead of writing.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        # Stands in for counters never bumped; random per process for the same
+        # reason as the stored epochs
+        self._missing_epoch = uuid.uuid4().hex[:8]
+
+    def bump(self, *names: str):
+        if not names:
+            return
+        requests = [UpdateOne({'_id': name}, {'$inc': {'version': 1}, '$setOnInsert': {'epoch': uuid.uuid4().hex[:8]}},
+                              upsert=True) for name in names]
+        try:
+            self.collection.bulk_write(requests, ordered=False)
+        except Exception as e:
+            # Other workers keep their cache; at least stop serving it here
+            print(f"Failed to bump versions {names}: {e}")
+            response_cache.clear()
+
+    def current(self, name: str) -> str:
+        """Version token of ``name``, e.g. ``3f2a9c1e.17``"""
+        counter = self.collection.find_one({'_id': name})
+        if counter is None:
+            return f'{self._missing_epoch}.0'
+        return f"{counter['epoch']}.{counter['version']}"
+
+
+class ResponseCache:
+    """Rendered response bodies kept in process memory, keyed by name, version token and encoding.
+
+    The uncompressed body is stored with ``encoding=''`` and each compressed
+    variant (``gzip``, ``br``) as its own entry, so a hit is served without
+    compressing again. Entries are never invalidated explicitly: a write
+    bumps the version, so the next request looks up a new key and the old
+    entries age out of the LRU (``RESPONSE_CACHE_MAX_ENTRIES``).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 256))
+        self._entries: 'OrderedDict[Tuple[str, str, str], Tuple[bytes, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, token: str, encoding: str = '') -> Optional[Tuple[bytes, str]]:
+        key = (name, token, encoding)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        cache = f'response_{encoding}' if encoding else 'response'
+        metrics.inc('cache_hits_total' if entry else 'cache_misses_total', labels={'cache': cache})
+        return entry
+
+    def put(self, name: str, token: str, body: bytes, mimetype: str, encoding: str = ''):
+        key = (name, token, encoding)
+        with self._lock:
+            self._entries[key] = (body, mimetype)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def make_etag(name: str, token: str) -> str:
+    return f'{name}:{token}'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """The entity tag of an If-None-Match header that matches ``etag``, if any.
+
+    Tags of compressed representations (``"<etag>-gzip"``) match too, since
+    they carry the same content; weak comparison applies, as for GET.
+    """
+    if not if_none_match:
+        return None
+    for raw in if_none_match.split(','):
+        raw = raw.strip()
+        if raw == '*':
+            return f'"{etag}"'
+        tag = raw[2:] if raw.startswith('W/') else raw
+        tag = tag.strip('"')
+        for suffix in ENCODING_SUFFIXES:
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)]
+                break
+        if tag == etag:
+            return raw
+    return None
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,134 @@
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+# Text-only extraction: no image blocks are decoded for the "dict" output
+TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_MEDIABOX_CLIP
+
+# Span flag bit PyMuPDF sets for bold text
+BOLD_FLAG = 16
+
+SECTION_KEYWORDS = {
+    'summary': ['summary', 'professional summary', 'profile', 'objective', 'about me', 'about'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'technologies',
+               'tools', 'tech stack', 'competencies'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history', 'internships'],
+    'education': ['education', 'academic background', 'academics', 'qualifications',
+                  'education and training'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'courses', 'training'],
+    'achievements': ['achievements', 'awards', 'honors', 'accomplishments', 'publications']
+}
+
+_KEYWORD_TO_SECTION = {kw: section for section, kws in SECTION_KEYWORDS.items() for kw in kws}
+_INLINE_HEADING = re.compile(
+    r'^\s*(' + '|'.join(sorted(map(re.escape, _KEYWORD_TO_SECTION), key=len, reverse=True)) + r')\s*[:\-–]\s*(.+)$',
+    re.IGNORECASE
+)
+
+
+class ResumeSegmenter:
+    """Split a resume PDF into sections using PyMuPDF layout information.
+
+    Headings are recognised by being short lines that are larger than the body
+    font, bold or all caps, and whose text names a known section. Text before
+    the first heading is kept as the ``header`` section (name and contacts).
+    """
+
+    def __init__(self, size_ratio: float = 1.15, max_heading_words: int = 5):
+        self.size_ratio = size_ratio
+        self.max_heading_words = max_heading_words
+
+    def segment(self, doc: fitz.Document, max_pages: Optional[int] = None) -> Dict:
+        """Segment an open document. Returns full text, per-section text and headings"""
+        lines = []
+        for page_number, page in enumerate(doc):
+            if max_pages is not None and page_number >= max_pages:
+                break
+            lines += self.page_lines(page.get_text('dict', flags=TEXT_FLAGS), page_number)
+        return self.segment_lines(lines)
+
+    def page_lines(self, page_dict: Dict, page_number: int = 0) -> List[Dict]:
+        """Flatten a ``get_text('dict')`` page into lines with font size and weight"""
+        lines = []
+        for block in page_dict.get('blocks', []):
+            if block.get('type', 0) != 0:
+                continue
+            for line in block.get('lines', []):
+                spans = [span for span in line.get('spans', []) if span.get('text', '').strip()]
+                if not spans:
+                    continue
+                text = ''.join(span['text'] for span in line['spans']).strip()
+                chars = sum(len(span['text']) for span in spans)
+                bold_chars = sum(len(span['text']) for span in spans
+                                 if span.get('flags', 0) & BOLD_FLAG or 'bold' in span.get('font', '').lower())
+                lines.append({
+                    'text': text,
+                    'size': round(max(span.get('size', 0) for span in spans), 1),
+                    'bold': bold_chars * 2 >= chars,
+                    'chars': chars,
+                    'page': page_number
+                })
+        return lines
+
+    def segment_lines(self, lines: List[Dict]) -> Dict:
+        body_size = self._body_font_size(lines)
+        sections: Dict[str, List[str]] = {'header': []}
+        headings = []
+        current = 'header'
+
+        for line in lines:
+            section, remainder = self._match_heading(line, body_size)
+            if section:
+                current = section
+                sections.setdefault(current, [])
+                headings.append({
+                    'title': line['text'],
+                    'section': section,
+                    'page': line['page'],
+                    'font_size': line['size'],
+                    'bold': line['bold']
+                })
+                if remainder:
+                    sections[current].append(remainder)
+                continue
+            sections[current].append(line['text'])
+
+        return {
+            'text': '\n'.join(line['text'] for line in lines),
+            'sections': {name: '\n'.join(content) for name, content in sections.items() if content},
+            'headings': headings,
+            'body_font_size': body_size
+        }
+
+    def _body_font_size(self, lines: List[Dict]) -> float:
+        sizes = Counter()
+        for line in lines:
+            sizes[line['size']] += line['chars']
+        return sizes.most_common(1)[0][0] if sizes else 0.0
+
+    def _match_heading(self, line: Dict, body_size: float) -> Tuple[Optional[str], str]:
+        text = line['text']
+
+        # "Skills: Python, SQL" style lines open a section inline
+        inline = _INLINE_HEADING.match(text)
+        if inline:
+            return _KEYWORD_TO_SECTION[inline.group(1).lower()], inline.group(2).strip()
+
+        words = text.split()
+        if not words or len(words) > self.max_heading_words:
+            return None, ''
+        letters = [c for c in text if c.isalpha()]
+        styled = (
+            (body_size and line['size'] >= body_size * self.size_ratio)
+            or line['bold']
+            or (letters and all(c.isupper() for c in letters))
+        )
+        if not styled:
+            return None, ''
+        key = re.sub(r'[^a-z ]', '', text.lower()).strip()
+        key = re.sub(r'\s+', ' ', key)
+        return _KEYWORD_TO_SECTION.get(key), ''
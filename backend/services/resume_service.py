@@ -1,53 +1,74 @@
 import fitz  # PyMuPDF
 import re
 import google.generativeai as genai
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import os
 import json
 from datetime import datetime
 from dotenv import load_dotenv
+from services.metrics_service import metrics
+from services.extraction_budget import ExtractionBudget
+from services.resume_sections import ResumeSegmenter
+from services.pdf_extraction import PdfExtractor
+from services.skill_taxonomy import SKILL_SYNONYMS, canonicalize_skill
+from services.prompt_builder import PromptBuilder
+from services.ats_schema import (ATS_GENERATION_CONFIG, WEIGHTED_SKILL_MEAN, AtsResponseError,
+                                 validate_ats_response)
 
 load_dotenv()
 
+# 'rest' goes through requests/urllib3 sockets, which gevent workers patch;
+# the default gRPC transport blocks the whole worker while waiting
+GEMINI_TRANSPORT = os.getenv('GEMINI_TRANSPORT', 'rest')
+
 def print_available_gemini_models():
     api_key = os.getenv('GOOGLE_GEMINI_API_KEY')
-    genai.configure(api_key=api_key)
+    genai.configure(api_key=api_key, transport=GEMINI_TRANSPORT)
     print("Available Gemini models for your API key:")
     for model in genai.list_models():
         print(model)
 
 class ResumeService:
-    def __init__(self):
-        """Initialize the Resume Service with Google Gemini API"""
+    def __init__(self, model=None):
+        """Initialize the Resume Service with Google Gemini API
+
+        Args:
+            model: Optional object exposing ``generate_content(prompt, generation_config=...)``. When
+                given it is used instead of configuring the Gemini client
+                (benchmarks and offline runs pass a stub here).
+        """
         self.gemini_api_key = os.getenv('GOOGLE_GEMINI_API_KEY')
         
-        if not self.gemini_api_key:
-            raise ValueError("GOOGLE_GEMINI_API_KEY not found in environment variables")
-        
-        # Configure Gemini API
-        genai.configure(api_key=self.gemini_api_key)
-        print_available_gemini_models()  # Debug: print available models
-        try:
-            self.model = genai.GenerativeModel('models/gemini-1.5-pro-latest')
-        except Exception as e:
-            print(f"Error initializing Gemini model: {e}")
-            print("Available models:", genai.list_models())
+        if model is not None:
+            self.model = model
+        else:
+            if not self.gemini_api_key:
+                raise ValueError("GOOGLE_GEMINI_API_KEY not found in environment variables")
+            
+            # Configure Gemini API
+            genai.configure(api_key=self.gemini_api_key, transport=GEMINI_TRANSPORT)
+            print_available_gemini_models()  # Debug: print available models
+            try:
+                self.model = genai.GenerativeModel('models/gemini-1.5-pro-latest')
+            except Exception as e:
+                print(f"Error initializing Gemini model: {e}")
+                print("Available models:", genai.list_models())
         
         # Email and phone regex patterns
         self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         self.phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
         
+        # Extraction limits: regexes only ever run over short line windows and
+        # the whole document shares one time/step budget
+        self.max_window_chars = int(os.getenv('RESUME_MAX_WINDOW_CHARS', 300))
+        self.extraction_time_budget_ms = float(os.getenv('RESUME_EXTRACTION_TIME_BUDGET_MS', 2000))
+        self.extraction_step_budget = int(os.getenv('RESUME_EXTRACTION_STEP_BUDGET', 20000))
+        self.segmenter = ResumeSegmenter()
+        self.pdf_extractor = PdfExtractor()
+        self.prompt_builder = PromptBuilder(int(os.getenv('ATS_PROMPT_TOKEN_BUDGET', 3000)))
+        
         # Enhanced skill patterns with synonyms
-        self.skill_synonyms = {
-            'python': ['python', 'py', 'django', 'flask', 'fastapi'],
-            'javascript': ['javascript', 'js', 'node', 'react', 'angular', 'vue'],
-            'java': ['java', 'spring', 'hibernate', 'maven', 'gradle'],
-            'aws': ['aws', 'amazon web services', 'ec2', 's3', 'lambda'],
-            'docker': ['docker', 'containerization', 'kubernetes', 'k8s'],
-            'git': ['git', 'github', 'gitlab', 'version control'],
-            'sql': ['sql', 'mysql', 'postgresql', 'database'],
-            'machine learning': ['ml', 'machine learning', 'ai', 'artificial intelligence', 'tensorflow', 'pytorch']
-        }
+        self.skill_synonyms = SKILL_SYNONYMS
     
     def parse_resume(self, file_path: str) -> Dict:
         """
@@ -55,35 +76,28 @@ class ResumeService:
         """
         try:
             # Security: Validate file size and type
-            if not self._validate_pdf_file(file_path):
-                raise ValueError("Invalid or potentially malicious PDF file")
-            
-            # Open and extract text from PDF
-            doc = fitz.open(file_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
+            with metrics.timer('resume.validate'):
+                if not self._validate_pdf_file(file_path):
+                    raise ValueError("Invalid or potentially malicious PDF file")
             
-            # Clean and normalize text
-            text = self._clean_text(text)
+            # Extract the page layout within the page/char/time caps, then
+            # split it into sections
+            with metrics.timer('resume.pdf_extract'):
+                extraction = self.pdf_extractor.extract(file_path)
+                layout = self.segmenter.segment_lines(extraction.pop('lines'))
             
-            # Extract structured information
-            resume_data = {
-                'text': text,
-                'name': self._extract_name(text),
-                'email': self._extract_email(text),
-                'phone': self._extract_phone(text),
-                'skills': self._extract_skills_enhanced(text),
-                'experience': self._extract_experience_enhanced(text),
-                'education': self._extract_education_enhanced(text),
-                'parsed_at': datetime.now().isoformat()
-            }
+            if extraction['truncated']:
+                print(f"PDF extraction stopped early ({extraction['truncated']}) after "
+                      f"{extraction['pages_read']}/{extraction['pages_total']} pages")
             
+            resume_data = self.extract_from_sections(layout['sections'], layout['text'])
+            resume_data['headings'] = layout['headings']
+            resume_data['pdf_extraction'] = extraction
             return resume_data
             
         except Exception as e:
             print(f"Error parsing resume: {str(e)}")
+            metrics.inc('parse_failures_total', labels={'kind': 'resume'})
             return {
                 'text': '',
                 'name': 'Unknown',
@@ -92,10 +106,52 @@ class ResumeService:
                 'skills': [],
                 'experience': [],
                 'education': [],
+                'sections': {},
                 'parsed_at': datetime.now().isoformat(),
                 'error': str(e)
             }
     
+    def extract_from_sections(self, sections: Dict[str, str], raw_text: str = "") -> Dict:
+        """
+        Run the extractors over segmented resume text.
+        
+        Each extractor only scans its own section and falls back to the whole
+        document when that section was not detected. Works from stored
+        sections too, so a resume can be re-extracted without the PDF.
+        """
+        if not raw_text:
+            raw_text = '\n'.join(sections.values())
+        
+        # Clean and normalize text
+        with metrics.timer('resume.clean_text'):
+            text = self._clean_text(raw_text)
+        header = self._clean_text(sections.get('header', '')) or text
+        
+        # Section extractors work on line windows of the original page
+        # text and share one budget, so pathological input yields partial
+        # results instead of pinning the worker
+        budget = self._new_extraction_budget()
+        
+        # Extract structured information
+        resume_data = {
+            'text': text,
+            'name': self._extract_name(header),
+            'email': self._extract_email(header) or self._extract_email(text),
+            'phone': self._extract_phone(header) or self._extract_phone(text),
+            'skills': self._extract_skills_enhanced(sections.get('skills') or raw_text, budget),
+            'experience': self._extract_experience_enhanced(sections.get('experience') or raw_text, budget),
+            'education': self._extract_education_enhanced(sections.get('education') or raw_text, budget),
+            'sections': sections,
+            'extraction_budget': budget.as_dict(),
+            'parsed_at': datetime.now().isoformat()
+        }
+        
+        if budget.exhausted:
+            print(f"Resume extraction budget exhausted ({budget.exhausted_reason}), returning partial results")
+            metrics.inc('extraction_budget_exhausted_total', labels={'reason': budget.exhausted_reason})
+        
+        return resume_data
+    
     def _validate_pdf_file(self, file_path: str) -> bool:
         """Validate PDF file for security and integrity"""
         try:
@@ -120,9 +176,12 @@ class ResumeService:
             return False
     
     def calculate_ats_score(self, resume_text: str, job_skills: List[str], 
-                          job_description: str = "") -> Dict:
+                          job_description: str = "", prompt_prefix: Optional[str] = None) -> Dict:
         """
         Calculate ATS score using Google Gemini API with enhanced error handling
+        
+        ``prompt_prefix`` is the precomputed job part of the prompt (see
+        JobProfileService); when given only the candidate part is built here.
         """
         if not job_skills:
             return {
@@ -134,134 +193,63 @@ class ResumeService:
             }
         
         try:
-            # Create comprehensive prompt for Gemini
-            prompt = self._create_ats_prompt(resume_text, job_skills, job_description)
-            
-            # Get response from Gemini
-            response = self.model.generate_content(prompt)
+            # Create comprehensive prompt for Gemini, fitting the resume to the token budget
+            with metrics.timer('resume.prompt_build'):
+                if prompt_prefix is None:
+                    prompt_prefix = self.create_ats_prompt_prefix(job_skills, job_description)
+                fitted_resume, prompt_stats = self.prompt_builder.fit_resume(resume_text, job_skills, prompt_prefix)
+                prompt = self._create_ats_prompt(fitted_resume, job_skills, job_description, prompt_prefix)
+            metrics.observe('llm_prompt_tokens', prompt_stats['prompt_tokens'],
+                            buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000))
+            metrics.observe('llm_prompt_truncation_ratio', prompt_stats['truncation_ratio'],
+                            buckets=(0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0))
             
-            # Parse Gemini's response with multiple fallback methods
-            ats_analysis = self._parse_gemini_response_robust(response.text)
+            # Get a schema-constrained JSON response from Gemini
+            with metrics.timer('resume.llm_call'):
+                response = self.model.generate_content(prompt, generation_config=ATS_GENERATION_CONFIG)
             
-            return ats_analysis
+            with metrics.timer('resume.llm_parse'):
+                ats_analysis = self._parse_ats_response(response.text)
             
+        except AtsResponseError as e:
+            print(f"Invalid Gemini ATS response: {str(e)}")
+            metrics.inc('llm_fallbacks_total', labels={'reason': 'invalid_response'})
+            return self._fallback_ats_scoring(resume_text, job_skills)
         except Exception as e:
             print(f"Error in Gemini ATS scoring: {str(e)}")
+            metrics.inc('llm_fallbacks_total', labels={'reason': 'llm_error'})
             # Fallback to basic scoring
             return self._fallback_ats_scoring(resume_text, job_skills)
-    
-    def _parse_gemini_response_robust(self, response_text: str) -> Dict:
-        """Robust parsing of Gemini response with multiple fallback methods"""
-        
-        # Method 1: Try direct JSON parsing
-        try:
-            parsed_data = json.loads(response_text.strip())
-            return self._validate_and_clean_parsed_data(parsed_data)
-        except json.JSONDecodeError:
-            pass
         
-        # Method 2: Extract JSON block using regex
-        try:
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                parsed_data = json.loads(json_str)
-                return self._validate_and_clean_parsed_data(parsed_data)
-        except (json.JSONDecodeError, AttributeError):
-            pass
-        
-        # Method 3: Try to fix common JSON issues
+        ats_analysis['prompt_stats'] = prompt_stats
+        return ats_analysis
+    
+    def _parse_ats_response(self, response_text: str) -> Dict:
+        """Decode and validate a structured Gemini response in a single pass.
+
+        Raises AtsResponseError when the body is not JSON or does not match
+        ATS_RESPONSE_SCHEMA; the caller then scores locally instead of
+        recording a zero.
+        """
         try:
-            fixed_json = self._fix_common_json_issues(response_text)
-            parsed_data = json.loads(fixed_json)
-            return self._validate_and_clean_parsed_data(parsed_data)
-        except json.JSONDecodeError:
-            pass
-        
-        # Method 4: Extract key information using regex patterns
+            data = json.loads(response_text)
+        except (TypeError, json.JSONDecodeError) as e:
+            metrics.inc('llm_responses_total', labels={'outcome': 'invalid_json'})
+            metrics.inc('parse_failures_total', labels={'kind': 'llm_json'})
+            raise AtsResponseError(f'Response is not valid JSON: {e}') from e
         try:
-            return self._extract_info_with_regex(response_text)
-        except Exception:
-            pass
-        
-        # Final fallback
-        print(f"Failed to parse Gemini response: {response_text[:200]}...")
-        return self._fallback_ats_scoring("", [])
-    
-    def _fix_common_json_issues(self, text: str) -> str:
-        """Fix common JSON formatting issues"""
-        # Remove markdown code blocks
-        text = re.sub(r'```json\s*', '', text)
-        text = re.sub(r'```\s*', '', text)
-        
-        # Fix trailing commas
-        text = re.sub(r',\s*}', '}', text)
-        text = re.sub(r',\s*]', ']', text)
-        
-        # Fix unquoted keys
-        text = re.sub(r'(\w+):', r'"\1":', text)
-        
-        # Fix single quotes to double quotes
-        text = text.replace("'", '"')
-        
-        return text.strip()
-    
-    def _extract_info_with_regex(self, text: str) -> Dict:
-        """Extract key information using regex patterns when JSON parsing fails"""
-        
-        # Extract overall score
-        score_match = re.search(r'"overall_score":\s*(\d+(?:\.\d+)?)', text)
-        overall_score = float(score_match.group(1)) if score_match else 0
-        
-        # Extract skill matches
-        skill_matches = []
-        skill_pattern = r'"skill":\s*"([^"]+)".*?"match_score":\s*(\d+(?:\.\d+)?)'
-        for match in re.finditer(skill_pattern, text, re.DOTALL):
-            skill_matches.append({
-                'skill': match.group(1),
-                'match_score': float(match.group(2)),
-                'evidence': 'Extracted from response',
-                'match_level': 'good' if float(match.group(2)) > 70 else 'fair'
-            })
-        
-        # Extract missing skills
-        missing_pattern = r'"missing_skills":\s*\[(.*?)\]'
-        missing_match = re.search(missing_pattern, text, re.DOTALL)
-        missing_skills = []
-        if missing_match:
-            missing_text = missing_match.group(1)
-            missing_skills = [s.strip().strip('"') for s in re.findall(r'"([^"]+)"', missing_text)]
-        
-        return {
-            'overall_score': overall_score,
-            'skill_matches': skill_matches,
-            'missing_skills': missing_skills,
-            'recommendations': ['Analysis completed with regex extraction'],
-            'strengths': [],
-            'experience_relevance': 70,
-            'education_fit': 70,
-            'overall_assessment': 'Analysis completed using fallback methods',
-            'method': 'Regex extraction (JSON parsing failed)'
-        }
-    
-    def _validate_and_clean_parsed_data(self, parsed_data: Dict) -> Dict:
-        """Validate and clean parsed data from Gemini"""
-        
-        # Ensure all required fields are present with defaults
-        return {
-            'overall_score': float(parsed_data.get('overall_score', 0)),
-            'skill_matches': parsed_data.get('skill_matches', []),
-            'missing_skills': parsed_data.get('missing_skills', []),
-            'recommendations': parsed_data.get('recommendations', []),
-            'strengths': parsed_data.get('strengths', []),
-            'experience_relevance': float(parsed_data.get('experience_relevance', 0)),
-            'education_fit': float(parsed_data.get('education_fit', 0)),
-            'overall_assessment': parsed_data.get('overall_assessment', ''),
-            'method': 'Google Gemini AI'
-        }
+            analysis = validate_ats_response(data)
+        except AtsResponseError:
+            metrics.inc('llm_responses_total', labels={'outcome': 'schema_mismatch'})
+            metrics.inc('parse_failures_total', labels={'kind': 'llm_schema'})
+            raise
+        metrics.inc('llm_responses_total', labels={'outcome': 'valid'})
+        return analysis
     
-    def _extract_skills_enhanced(self, text: str) -> List[str]:
+    @metrics.timed('resume.extract_skills')
+    def _extract_skills_enhanced(self, text: str, budget: Optional[ExtractionBudget] = None) -> List[str]:
         """Enhanced skill extraction using synonyms and fuzzy matching"""
+        budget = budget or self._new_extraction_budget()
         skills = set()
         text_lower = text.lower()
         
@@ -273,7 +261,9 @@ class ResumeService:
                     break
         
         # Look for skill sections
-        skill_sections = re.findall(r'skills?[:\s]+([^.\n]+)', text, re.IGNORECASE)
+        skill_sections = []
+        for line, window in self._iter_windows(text, budget):
+            skill_sections += self._window_matches(r'skills?[:\s]+([^.\n]+)', line, window, group=1)
         for section in skill_sections:
             section_skills = re.findall(r'\b\w+\b', section.lower())
             for skill in section_skills:
@@ -286,21 +276,21 @@ class ResumeService:
         
         return list(skills)
     
-    def _extract_experience_enhanced(self, text: str) -> List[Dict]:
+    @metrics.timed('resume.extract_experience')
+    def _extract_experience_enhanced(self, text: str, budget: Optional[ExtractionBudget] = None) -> List[Dict]:
         """Enhanced experience extraction with better pattern matching"""
+        budget = budget or self._new_extraction_budget()
         experience = []
         
         # Multiple patterns for different date formats
         exp_patterns = [
-            r'(\d{4})\s*[-–]\s*(\d{4}|\bpresent\b|\bcurrent\b).*?([^.\n]+)',
             r'(\d{4})\s*[-–]\s*(\d{4}|\bpresent\b|\bcurrent\b).*?([^.\n]+)',
             r'(\w+\s+\d{4})\s*[-–]\s*(\w+\s+\d{4}|\bpresent\b|\bcurrent\b).*?([^.\n]+)',
             r'(\d{1,2}/\d{4})\s*[-–]\s*(\d{1,2}/\d{4}|\bpresent\b|\bcurrent\b).*?([^.\n]+)'
         ]
         
-        for pattern in exp_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for line, window in self._iter_windows(text, budget):
+            for match in self._window_matches(exp_patterns, line, window):
                 experience.append({
                     'start_date': match.group(1),
                     'end_date': match.group(2),
@@ -310,8 +300,10 @@ class ResumeService:
         
         return experience
     
-    def _extract_education_enhanced(self, text: str) -> List[Dict]:
+    @metrics.timed('resume.extract_education')
+    def _extract_education_enhanced(self, text: str, budget: Optional[ExtractionBudget] = None) -> List[Dict]:
         """Enhanced education extraction with better pattern matching"""
+        budget = budget or self._new_extraction_budget()
         education = []
         
         # Multiple patterns for education
@@ -322,9 +314,8 @@ class ResumeService:
             r'(b\.s\.|m\.s\.|ph\.d\.).*?([^.\n]+)'
         ]
         
-        for pattern in edu_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for line, window in self._iter_windows(text, budget):
+            for match in self._window_matches(edu_patterns, line, window):
                 education.append({
                     'degree': match.group(1) if match.group(1) else 'Unknown',
                     'institution': match.group(2) if match.group(2) else 'Unknown',
@@ -333,6 +324,50 @@ class ResumeService:
         
         return education
     
+    def _new_extraction_budget(self) -> ExtractionBudget:
+        return ExtractionBudget(self.extraction_time_budget_ms, self.extraction_step_budget)
+    
+    def _text_lines(self, text: str) -> List[str]:
+        """Split text into cleaned lines no longer than ``max_window_chars``"""
+        lines = []
+        for raw_line in text.split('\n'):
+            line = self._clean_text(raw_line)
+            while len(line) > self.max_window_chars:
+                cut = line.rfind(' ', 0, self.max_window_chars)
+                if cut <= 0:
+                    cut = self.max_window_chars
+                lines.append(line[:cut])
+                line = line[cut:].lstrip()
+            if line:
+                lines.append(line)
+        return lines
+    
+    def _iter_windows(self, text: str, budget: ExtractionBudget) -> Iterator[Tuple[str, str]]:
+        """Yield (line, window) pairs where the window is the line plus the next one.
+        
+        Matches may run into the following line (a date range followed by the
+        role on the next line) but only matches starting in ``line`` count, so
+        nothing is reported twice. Stops as soon as the budget is exhausted.
+        """
+        lines = self._text_lines(text)
+        for index, line in enumerate(lines):
+            if not budget.step():
+                return
+            following = lines[index + 1] if index + 1 < len(lines) else ''
+            yield line, f"{line} {following}" if following else line
+    
+    def _window_matches(self, patterns, line: str, window: str, group: Optional[int] = None) -> List:
+        """Run one or more patterns over a window, keeping matches that start in ``line``"""
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        results = []
+        for pattern in patterns:
+            for match in re.finditer(pattern, window, re.IGNORECASE):
+                if match.start() >= len(line):
+                    break
+                results.append(match.group(group) if group is not None else match)
+        return results
+    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize resume text"""
         # Remove extra whitespace and normalize
@@ -370,25 +405,34 @@ class ResumeService:
         phone_match = re.search(self.phone_pattern, text)
         return phone_match.group(0) if phone_match else ""
     
-    def _create_ats_prompt(self, resume_text: str, job_skills: List[str], job_description: str) -> str:
+    def _create_ats_prompt(self, resume_text: str, job_skills: List[str], job_description: str,
+                           prompt_prefix: Optional[str] = None) -> str:
         """Create a comprehensive prompt for Gemini ATS scoring, including skill weights if available"""
+        if prompt_prefix is None:
+            prompt_prefix = self.create_ats_prompt_prefix(job_skills, job_description)
+        return f"""{prompt_prefix}
+CANDIDATE RESUME:
+{resume_text}
+
+Please respond with ONLY the JSON object, no additional text.
+"""
+    
+    def create_ats_prompt_prefix(self, job_skills: List, job_description: str = "") -> str:
+        """Build the job-dependent part of the ATS prompt, which is identical for every candidate"""
         # If job_skills is a list of dicts with 'skill' and 'weight', use weights
         if job_skills and isinstance(job_skills[0], dict) and 'weight' in job_skills[0]:
             skills_text = ", ".join([f"{s['skill']} (Importance: {s['weight']}/5)" for s in job_skills])
         else:
-            skills_text = ", ".join(job_skills)
+            skills_text = ", ".join(s['skill'] if isinstance(s, dict) else s for s in job_skills)
 
-        prompt = f"""
+        return f"""
 You are an expert ATS (Applicant Tracking System) scoring assistant. Your task is to analyze a candidate's resume against job requirements and provide a comprehensive assessment.
 
 JOB REQUIREMENTS:
 Required Skills: {skills_text}
 {f"Job Description: {job_description}" if job_description else ""}
 
-CANDIDATE RESUME:
-{resume_text}
-
-Please analyze the resume and provide your assessment in the following JSON format:
+Analyze the candidate resume that follows and provide your assessment in the following JSON format:
 
 {{
     "overall_score": <number between 0-100>,
@@ -418,10 +462,7 @@ Guidelines for scoring:
 - Factor in experience relevance and education fit
 - Be fair but thorough in your assessment
 - Provide specific, actionable recommendations
-
-Please respond with ONLY the JSON object, no additional text.
 """
-        return prompt
     
     def _fallback_ats_scoring(self, resume_text: str, job_skills: List[str]) -> Dict:
         """Fallback scoring method if Gemini fails"""
@@ -430,9 +471,9 @@ Please respond with ONLY the JSON object, no additional text.
         skill_matches = []
         missing_skills = []
         
-        for skill in job_skills:
-            skill_lower = skill.lower()
-            if skill_lower in resume_lower:
+        for entry in job_skills:
+            skill = entry.get('skill', '') if isinstance(entry, dict) else str(entry)
+            if skill.lower() in resume_lower:
                 skill_matches.append({
                     'skill': skill,
                     'match_score': 100,
@@ -455,9 +496,52 @@ Please respond with ONLY the JSON object, no additional text.
             'experience_relevance': 70,
             'education_fit': 70,
             'overall_assessment': 'Basic keyword matching completed',
-            'method': 'Fallback keyword matching'
+            'method': 'Fallback keyword matching',
+            'score_formula': WEIGHTED_SKILL_MEAN
         }
     
+    def provisional_ats_score(self, resume_text: str, job_skills: List,
+                              weight_vector: Optional[Dict[str, float]] = None) -> Dict:
+        """Immediate local score used until the Gemini analysis arrives.
+
+        Each job skill counts as matched when it or one of its taxonomy
+        synonyms appears in the resume; matches are weighted by the job's
+        normalized weight vector when one is given, equally otherwise.
+        """
+        skill_matches = []
+        missing_skills = []
+        matched_weight = 0.0
+        total_weight = 0.0
+        for entry in job_skills or []:
+            skill = entry.get('skill', '') if isinstance(entry, dict) else str(entry)
+            if not skill.strip():
+                continue
+            weight = (weight_vector or {}).get(canonicalize_skill(skill), 1.0)
+            total_weight += weight
+            hit = self.prompt_builder.skill_pattern([skill]).search(resume_text or '')
+            if hit:
+                matched_weight += weight
+                skill_matches.append({
+                    'skill': skill,
+                    'match_score': 100,
+                    'evidence': f"'{hit.group(0)}' found in resume",
+                    'match_level': 'excellent'
+                })
+            else:
+                missing_skills.append(skill)
+
+        overall_score = matched_weight / total_weight * 100 if total_weight else 0
+        return {
+            'overall_score': round(overall_score, 2),
+            'skill_matches': skill_matches,
+            'missing_skills': missing_skills,
+            'recommendations': [],
+            'strengths': [],
+            'overall_assessment': 'Provisional keyword score; the full analysis is in progress',
+            'method': 'provisional',
+            'score_formula': WEIGHTED_SKILL_MEAN
+        }
+
     def get_skill_radar_data(self, skill_matches: List[Dict]) -> Dict:
         """Generate data for radar chart visualization"""
         labels = [match['skill'] for match in skill_matches]
@@ -1,9 +1,63 @@
+import hashlib
+import json
+import multiprocessing
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from textblob import TextBlob
 import spacy
 from typing import Dict, List, Tuple
 import numpy as np
 from datetime import datetime
+from services.metrics_service import metrics
+from services.transcript_aggregates import TranscriptAggregate, split_chunks
+
+# Bump when the transcript scoring logic changes in a way that needs the
+# stored transcripts to be re-analyzed (weight changes are detected separately)
+BEHAVIOR_SCORER_VERSION = 2
+
+# Pipeline components the score summary doesn't need: it only uses tokens and
+# sentence boundaries (from the parser), so tagging, lemmas and entities are skipped
+SUMMARY_DISABLED_PIPES = ['tagger', 'attribute_ruler', 'lemmatizer', 'ner']
+
+# Patterns the quality rewards, strengths and improvement areas look for,
+# matched per chunk and merged by name
+TEXT_PATTERNS = {name: re.compile(pattern) for name, pattern in {
+    'metrics': r'\d+%|\d+ percent|\d+ people|\d+ team',
+    'examples': r'for example|specifically|in one instance',
+    'reasoning': r'because|since|as a result|therefore',
+    'achievement': r'achieved|increased|improved|reduced|delivered|completed',
+    'leadership': r'led|managed|supervised|coordinated',
+    'problem_solving': r'solved|resolved|analyzed|investigated',
+    'teamwork': r'collaborated|worked with|team|partnered',
+}.items()}
+
+
+def transcript_hash(transcript: str) -> str:
+    return hashlib.sha256((transcript or '').encode('utf-8')).hexdigest()
+
+
+def _gevent_patched() -> bool:
+    try:
+        from gevent.monkey import is_module_patched
+    except ImportError:
+        return False
+    return is_module_patched('threading')
+
+
+# Scoring service of a chunk worker process, created by its pool initializer
+_worker_service = None
+
+
+def _init_chunk_worker():
+    global _worker_service
+    _worker_service = ScoringService()
+
+
+def _aggregate_in_worker(chunks: List[str], detail: bool) -> 'TranscriptAggregate':
+    return _worker_service._aggregate_chunks(chunks, detail)
 
 class ScoringService:
     def __init__(self):
@@ -11,7 +65,6 @@ class ScoringService:
         try:
             self.nlp = spacy.load("en_core_web_sm")
         except OSError:
-            import os
             os.system("python -m spacy download en_core_web_sm")
             self.nlp = spacy.load("en_core_web_sm")
         
@@ -43,102 +96,64 @@ class ScoringService:
             }
         }
         
+        # Weights of the four component scores in the overall behavior score
+        self.component_weights = {
+            'sentiment': 0.25,
+            'communication': 0.30,
+            'behavioral': 0.35,
+            'quality': 0.10
+        }
+        
         # Negative indicators
         self.negative_indicators = {
             'blame': ['blamed', 'fault', 'problem with', 'issue with', 'they made me'],
             'vague': ['kind of', 'sort of', 'maybe', 'probably', 'I think', 'I guess'],
             'negative': ['failed', 'couldn\'t', 'didn\'t work', 'problem', 'issue', 'difficult']
         }
+        
+        self.clarity_indicators = [
+            'specifically', 'for example', 'in other words', 'to clarify',
+            'as a result', 'therefore', 'consequently', 'in conclusion'
+        ]
+        
+        # Every phrase the scores test for; each chunk records which ones it contains
+        self.keywords = [kw for config in self.behavioral_indicators.values() for kw in config['keywords']]
+        self.phrases = set(self.clarity_indicators + self.keywords +
+                           [i for indicators in self.negative_indicators.values() for i in indicators])
+        
+        # Long transcripts are analyzed in chunks of at most this many characters
+        # (spaCy refuses texts over nlp.max_length), optionally in worker processes
+        self.chunk_chars = min(int(os.getenv('TRANSCRIPT_CHUNK_CHARS', 50000)), self.nlp.max_length)
+        self.nlp_processes = int(os.getenv('TRANSCRIPT_NLP_PROCESSES', 1))
+        self._pool = None
+        self._pool_lock = threading.Lock()
     
+    @metrics.timed('scoring.analyze_transcript')
     def analyze_transcript(self, transcript: str) -> Dict:
         """
-        Analyze interview transcript and calculate behavior score with detailed breakdown
+        Analyze interview transcript and calculate behavior score
+        
+        Returns the summary stored on the candidate: overall, component and
+        per-category scores, confidence and low-score reasons. The keyword
+        lists, penalties and explanations are left to :meth:`analysis_details`.
         
         Args:
             transcript (str): Interview transcript text
             
         Returns:
-            Dict: Comprehensive analysis with scores, breakdowns, and explanations
+            Dict: Score summary of the transcript
         """
         if not transcript or len(transcript.strip()) < 50:
-            return {
-                'overall_score': 0.0,
-                'score_breakdown': {
-                    'sentiment_score': 0.0,
-                    'communication_score': 0.0,
-                    'behavioral_score': 0.0,
-                    'response_quality_score': 0.0
-                },
-                'weights_used': {
-                    'sentiment': 0.25,
-                    'communication': 0.30,
-                    'behavioral': 0.35,
-                    'quality': 0.10
-                },
-                'reason_for_low_score': 'Insufficient transcript content for analysis',
-                'confidence_level': 'low',
-                'analysis_method': 'fallback'
-            }
+            return self._insufficient_transcript()
         
         try:
-            # Clean transcript
-            clean_transcript = self._clean_transcript(transcript)
-            
-            # Calculate various scores with detailed breakdowns
-            sentiment_analysis = self._calculate_sentiment_score_detailed(clean_transcript)
-            communication_analysis = self._calculate_communication_score_detailed(clean_transcript)
-            behavioral_analysis = self._calculate_behavioral_indicators_detailed(clean_transcript)
-            quality_analysis = self._calculate_response_quality_detailed(clean_transcript)
-            
-            # Calculate weighted final score
-            weights = {
-                'sentiment': 0.25,
-                'communication': 0.30,
-                'behavioral': 0.35,
-                'quality': 0.10
-            }
-            
-            final_score = (
-                sentiment_analysis['score'] * weights['sentiment'] +
-                communication_analysis['score'] * weights['communication'] +
-                behavioral_analysis['score'] * weights['behavioral'] +
-                quality_analysis['score'] * weights['quality']
-            )
-            
-            # Determine confidence level
-            confidence_level = self._determine_confidence_level(
-                sentiment_analysis, communication_analysis, behavioral_analysis, quality_analysis
-            )
-            
-            # Identify reasons for low score
-            low_score_reasons = self._identify_low_score_reasons(
-                sentiment_analysis, communication_analysis, behavioral_analysis, quality_analysis
-            )
-            
-            return {
-                'overall_score': round(max(0, min(100, final_score)), 2),
-                'score_breakdown': {
-                    'sentiment_score': sentiment_analysis['score'],
-                    'communication_score': communication_analysis['score'],
-                    'behavioral_score': behavioral_analysis['score'],
-                    'response_quality_score': quality_analysis['score']
-                },
-                'weights_used': weights,
-                'detailed_analysis': {
-                    'sentiment': sentiment_analysis,
-                    'communication': communication_analysis,
-                    'behavioral': behavioral_analysis,
-                    'quality': quality_analysis
-                },
-                'confidence_level': confidence_level,
-                'reason_for_low_score': low_score_reasons,
-                'analysis_method': 'comprehensive',
-                'transcript_length': len(clean_transcript),
-                'analysis_timestamp': datetime.now().isoformat()
-            }
+            aggregate = self._aggregate_transcript(transcript)
+            components = self._analyze_components(aggregate)
+            return self._summarize(components, aggregate, transcript)
             
         except Exception as e:
             print(f"Error analyzing transcript: {str(e)}")
+            metrics.inc('parse_failures_total', labels={'kind': 'transcript'})
             return {
                 'overall_score': 50.0,
                 'score_breakdown': {
@@ -147,17 +162,214 @@ class ScoringService:
                     'behavioral_score': 50.0,
                     'response_quality_score': 50.0
                 },
-                'weights_used': {
-                    'sentiment': 0.25,
-                    'communication': 0.30,
-                    'behavioral': 0.35,
-                    'quality': 0.10
-                },
+                'weights_used': dict(self.component_weights),
                 'reason_for_low_score': f'Analysis error: {str(e)}',
                 'confidence_level': 'low',
                 'analysis_method': 'error_fallback'
             }
     
+    @metrics.timed('scoring.analysis_details')
+    def analysis_details(self, transcript: str) -> Dict:
+        """
+        Full explanation tree of a transcript analysis, computed on demand
+        
+        Returns ``{'analysis': ..., 'breakdown': ...}``: the summary of
+        :meth:`analyze_transcript` with its ``detailed_analysis`` tree, and the
+        breakdown of :meth:`get_analysis_breakdown`. Both are built from one
+        spaCy parse and one sentiment pass per chunk.
+        """
+        aggregate = self._aggregate_transcript(transcript or '', detail=True)
+        components = self._analyze_components(aggregate)
+        if not transcript or len(transcript.strip()) < 50:
+            analysis = self._insufficient_transcript()
+        else:
+            analysis = self._summarize(components, aggregate, transcript)
+            analysis['detailed_analysis'] = components
+        return {'analysis': analysis, 'breakdown': self._breakdown(aggregate, components)}
+    
+    def _insufficient_transcript(self) -> Dict:
+        return {
+            'overall_score': 0.0,
+            'score_breakdown': {
+                'sentiment_score': 0.0,
+                'communication_score': 0.0,
+                'behavioral_score': 0.0,
+                'response_quality_score': 0.0
+            },
+            'weights_used': dict(self.component_weights),
+            'reason_for_low_score': 'Insufficient transcript content for analysis',
+            'confidence_level': 'low',
+            'analysis_method': 'fallback'
+        }
+    
+    def _candidate_lines(self, transcript: str) -> List[str]:
+        """Candidate turns of the transcript, whitespace-normalized (interviewer lines dropped)"""
+        lines = []
+        for line in transcript.split('\n'):
+            line = line.strip()
+            if line and not line.lower().startswith('interviewer:'):
+                lines.append(re.sub(r'\s+', ' ', line))
+        return lines
+    
+    def _aggregate_transcript(self, transcript: str, detail: bool = False) -> TranscriptAggregate:
+        """
+        Parse the candidate's turns chunk by chunk and merge the chunk statistics
+        
+        Chunks end on turn boundaries (sentence boundaries within a very long
+        turn), so no parse or sentiment pass holds more than one chunk. With
+        ``TRANSCRIPT_NLP_PROCESSES`` > 1, consecutive runs of chunks are
+        analyzed (spaCy and TextBlob) in worker processes and their aggregates
+        merged in order; under gevent workers, whose hub a process pool would
+        block, chunks are always analyzed in this process.
+        """
+        chunks = list(split_chunks(self._candidate_lines(transcript), self.chunk_chars))
+        with metrics.timer('scoring.nlp'):
+            pool = self._executor() if len(chunks) > 1 else None
+            if pool is None:
+                return self._aggregate_chunks(chunks, detail)
+            size = -(-len(chunks) // self.nlp_processes)
+            groups = [chunks[start:start + size] for start in range(0, len(chunks), size)]
+            aggregate = TranscriptAggregate()
+            for part in pool.map(_aggregate_in_worker, groups, repeat(detail)):
+                aggregate.merge(part)
+            return aggregate
+    
+    def _aggregate_chunks(self, chunks: List[str], detail: bool) -> TranscriptAggregate:
+        """Aggregate of consecutive chunks analyzed in this process.
+        
+        The summary only needs tokens and sentences, not tags, lemmas or
+        entities; ``detail`` keeps the full pipeline for noun phrases.
+        """
+        aggregate = TranscriptAggregate()
+        disable = [] if detail else SUMMARY_DISABLED_PIPES
+        keywords = self.keywords if detail else None
+        for doc in self.nlp.pipe(chunks, disable=disable, batch_size=1):
+            with metrics.timer('scoring.sentiment'):
+                assessments = TextBlob(doc.text).sentiment_assessments.assessments
+            aggregate.add_chunk(doc.text, doc, assessments, self.phrases, TEXT_PATTERNS, keywords)
+        return aggregate
+    
+    def _executor(self):
+        """Process pool for chunk analysis, or None to analyze in this process"""
+        if self.nlp_processes <= 1 or _gevent_patched():
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: never fork a process that runs threads; each worker loads its own model
+                self._pool = ProcessPoolExecutor(max_workers=self.nlp_processes,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_init_chunk_worker)
+            return self._pool
+    
+    def _analyze_components(self, aggregate: TranscriptAggregate) -> Dict:
+        """Detailed analysis of each of the four score components"""
+        return {
+            'sentiment': self._calculate_sentiment_score_detailed(aggregate),
+            'communication': self._calculate_communication_score_detailed(aggregate),
+            'behavioral': self._calculate_behavioral_indicators_detailed(aggregate),
+            'quality': self._calculate_response_quality_detailed(aggregate)
+        }
+    
+    def _summarize(self, components: Dict, aggregate: TranscriptAggregate, transcript: str) -> Dict:
+        """Scores, confidence and reasons of an analysis, without the explanation tree"""
+        sentiment_analysis = components['sentiment']
+        communication_analysis = components['communication']
+        behavioral_analysis = components['behavioral']
+        quality_analysis = components['quality']
+        
+        # Calculate weighted final score
+        final_score = self._combine_components({
+            'sentiment': sentiment_analysis['score'],
+            'communication': communication_analysis['score'],
+            'behavioral': behavioral_analysis['score'],
+            'quality': quality_analysis['score']
+        })
+        
+        return {
+            'overall_score': round(max(0, min(100, final_score)), 2),
+            'score_breakdown': {
+                'sentiment_score': sentiment_analysis['score'],
+                'communication_score': communication_analysis['score'],
+                'behavioral_score': behavioral_analysis['score'],
+                'response_quality_score': quality_analysis['score']
+            },
+            'weights_used': dict(self.component_weights),
+            # Per-category subscores, kept so weight changes can be recombined
+            'category_scores': {
+                category: {'score': c['score'], 'keyword_count': c['keyword_count'], 'weight': c['weight']}
+                for category, c in behavioral_analysis.get('category_breakdown', {}).items()
+            },
+            'confidence_level': self._determine_confidence_level(
+                sentiment_analysis, communication_analysis, behavioral_analysis, quality_analysis
+            ),
+            'reason_for_low_score': self._identify_low_score_reasons(
+                sentiment_analysis, communication_analysis, behavioral_analysis, quality_analysis
+            ),
+            'analysis_method': 'comprehensive',
+            'transcript_length': aggregate.chars,
+            'transcript_chunks': aggregate.chunks,
+            'transcript_sha256': transcript_hash(transcript),
+            'analysis_timestamp': datetime.now().isoformat()
+        }
+    
+    def score_inputs(self) -> Dict:
+        """Scorer version and weights a behavior score is computed with.
+
+        Stored next to each behavior score so the recalculation command can
+        find scores produced with older weights or an older scorer.
+        """
+        weights = {
+            'components': dict(self.component_weights),
+            'categories': {category: config['weight'] for category, config in self.behavioral_indicators.items()}
+        }
+        signature = hashlib.sha256(json.dumps([BEHAVIOR_SCORER_VERSION, weights], sort_keys=True).encode('utf-8')).hexdigest()
+        return {'scorer_version': BEHAVIOR_SCORER_VERSION, 'weights': weights, 'key': signature[:16]}
+    
+    def _combine_components(self, component_scores: Dict[str, float]) -> float:
+        return sum(component_scores[name] * weight for name, weight in self.component_weights.items())
+    
+    def _stored_categories(self, analysis: Dict) -> Dict:
+        # Analyses stored before the summary/detail split keep them in the detail tree
+        return analysis.get('category_scores') or \
+            (analysis.get('detailed_analysis') or {}).get('behavioral', {}).get('category_breakdown') or {}
+    
+    def can_recombine(self, analysis: Dict) -> bool:
+        """Whether a stored analysis keeps the per-category subscores needed by :meth:`recombine`"""
+        analysis = analysis or {}
+        breakdown = analysis.get('score_breakdown') or {}
+        return analysis.get('analysis_method') == 'comprehensive' and bool(self._stored_categories(analysis)) and all(
+            f'{name}_score' in breakdown for name in ('sentiment', 'communication', 'behavioral', 'response_quality'))
+    
+    def recombine(self, analysis: Dict) -> Dict:
+        """Recompute the behavioral and overall scores of a stored analysis with the current weights.
+
+        Only the weighting changes; the per-category and per-component
+        subscores are reused as stored, so the transcript is not analyzed again.
+        """
+        categories = self._stored_categories(analysis)
+        weighted, total = 0.0, 0.0
+        for category, config in self.behavioral_indicators.items():
+            if category in categories:
+                categories[category]['weight'] = config['weight']
+                weighted += categories[category]['score'] * config['weight']
+                total += config['weight']
+        behavioral_score = max(0, min(100, weighted / total if total else 0))
+        if 'detailed_analysis' in analysis:
+            analysis['detailed_analysis']['behavioral']['score'] = behavioral_score
+        
+        breakdown = analysis['score_breakdown']
+        breakdown['behavioral_score'] = behavioral_score
+        final_score = self._combine_components({
+            'sentiment': breakdown['sentiment_score'],
+            'communication': breakdown['communication_score'],
+            'behavioral': behavioral_score,
+            'quality': breakdown['response_quality_score']
+        })
+        analysis['overall_score'] = round(max(0, min(100, final_score)), 2)
+        analysis['weights_used'] = dict(self.component_weights)
+        analysis['recombined_at'] = datetime.now().isoformat()
+        return analysis
+    
     def get_analysis_breakdown(self, transcript: str) -> Dict:
         """
         Get detailed breakdown of transcript analysis
@@ -168,24 +380,13 @@ class ScoringService:
         Returns:
             Dict: Detailed analysis breakdown
         """
-        clean_transcript = self._clean_transcript(transcript)
-        
-        return {
-            'sentiment_analysis': self._get_sentiment_breakdown(clean_transcript),
-            'communication_metrics': self._get_communication_metrics(clean_transcript),
-            'behavioral_indicators': self._get_behavioral_breakdown(clean_transcript),
-            'response_quality': self._get_response_quality_breakdown(clean_transcript),
-            'key_phrases': self._extract_key_phrases(clean_transcript),
-            'improvement_areas': self._identify_improvement_areas(clean_transcript),
-            'strength_indicators': self._identify_strength_indicators(clean_transcript)
-        }
+        return self.analysis_details(transcript)['breakdown']
     
-    def _calculate_sentiment_score_detailed(self, text: str) -> Dict:
+    def _calculate_sentiment_score_detailed(self, aggregate: TranscriptAggregate) -> Dict:
         """Calculate detailed sentiment score with explanations"""
         try:
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity
-            subjectivity = blob.sentiment.subjectivity
+            polarity = aggregate.polarity
+            subjectivity = aggregate.subjectivity
             
             # Convert polarity (-1 to 1) to score (0 to 100)
             sentiment_score = (polarity + 1) * 50
@@ -220,26 +421,20 @@ class ScoringService:
                 'confidence': 0.0
             }
     
-    def _calculate_communication_score_detailed(self, text: str) -> Dict:
+    def _calculate_communication_score_detailed(self, aggregate: TranscriptAggregate) -> Dict:
         """Calculate detailed communication score with breakdown"""
         try:
-            doc = self.nlp(text)
-            
             # Calculate metrics
-            word_count = len(doc)
-            sentence_count = len(list(doc.sents))
+            word_count = aggregate.word_count
+            sentence_count = aggregate.sentence_count
             avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
             
-            # Vocabulary diversity
-            unique_words = len(set([token.text.lower() for token in doc if not token.is_punct]))
+            # Vocabulary diversity (distinct tokens are estimated beyond the sketch size)
+            unique_words = aggregate.unique_words.estimate()
             vocabulary_diversity = unique_words / word_count if word_count > 0 else 0
             
             # Clarity indicators
-            clarity_indicators = [
-                'specifically', 'for example', 'in other words', 'to clarify',
-                'as a result', 'therefore', 'consequently', 'in conclusion'
-            ]
-            clarity_count = sum(1 for indicator in clarity_indicators if indicator in text.lower())
+            clarity_count = sum(1 for indicator in self.clarity_indicators if indicator in aggregate.phrases_found)
             
             # Score calculation with explanations
             length_score = min(100, word_count / 2)
@@ -265,6 +460,7 @@ class ScoringService:
                     'sentence_count': sentence_count,
                     'avg_sentence_length': round(avg_sentence_length, 2),
                     'vocabulary_diversity': round(vocabulary_diversity, 3),
+                    'vocabulary_exact': aggregate.unique_words.exact,
                     'clarity_indicators': clarity_count
                 },
                 'subscores': {
@@ -287,10 +483,10 @@ class ScoringService:
                 'explanations': {'error': f'Communication analysis failed: {str(e)}'}
             }
     
-    def _calculate_behavioral_indicators_detailed(self, text: str) -> Dict:
+    def _calculate_behavioral_indicators_detailed(self, aggregate: TranscriptAggregate) -> Dict:
         """Calculate detailed behavioral indicators score"""
         try:
-            text_lower = text.lower()
+            found = aggregate.phrases_found
             category_scores = {}
             total_weighted_score = 0
             total_weight = 0
@@ -300,7 +496,7 @@ class ScoringService:
                 weight = config['weight']
                 
                 # Count keyword occurrences
-                keyword_count = sum(1 for keyword in keywords if keyword in text_lower)
+                keyword_count = sum(1 for keyword in keywords if keyword in found)
                 
                 # Calculate category score
                 category_score = min(100, keyword_count * 15)
@@ -309,7 +505,7 @@ class ScoringService:
                     'score': category_score,
                     'keyword_count': keyword_count,
                     'weight': weight,
-                    'keywords_found': [kw for kw in keywords if kw in text_lower],
+                    'keywords_found': [kw for kw in keywords if kw in found],
                     'explanation': f'Found {keyword_count} instances of {category} indicators'
                 }
                 
@@ -336,10 +532,10 @@ class ScoringService:
                 'error': str(e)
             }
     
-    def _calculate_response_quality_detailed(self, text: str) -> Dict:
+    def _calculate_response_quality_detailed(self, aggregate: TranscriptAggregate) -> Dict:
         """Calculate detailed response quality score"""
         try:
-            text_lower = text.lower()
+            patterns = aggregate.patterns_found
             
             # Check for negative indicators
             negative_penalties = {}
@@ -350,7 +546,7 @@ class ScoringService:
                 found_indicators = []
                 
                 for indicator in indicators:
-                    if indicator in text_lower:
+                    if indicator in aggregate.phrases_found:
                         category_penalty += 10
                         found_indicators.append(indicator)
                 
@@ -366,30 +562,34 @@ class ScoringService:
             # Apply penalties
             quality_score -= total_penalty
             
-            # Rewards for positive indicators
+            # Rewards for positive indicators: explanation and points per reward
             rewards = {}
+            reward_points = {}
             
             # Specific examples
-            if re.search(r'\d+%|\d+ percent|\d+ people|\d+ team', text_lower):
-                quality_score += 15
+            if 'metrics' in patterns:
+                reward_points['metrics'] = 15
                 rewards['metrics'] = 'Included specific metrics and numbers'
             
-            if re.search(r'for example|specifically|in one instance', text_lower):
-                quality_score += 10
+            if 'examples' in patterns:
+                reward_points['examples'] = 10
                 rewards['examples'] = 'Provided specific examples'
             
-            if re.search(r'because|since|as a result|therefore', text_lower):
-                quality_score += 5
+            if 'reasoning' in patterns:
+                reward_points['reasoning'] = 5
                 rewards['reasoning'] = 'Showed logical reasoning'
             
+            total_rewards = sum(reward_points.values())
+            quality_score += total_rewards
+            
             return {
                 'score': max(0, min(100, quality_score)),
                 'base_score': 70,
                 'penalties': negative_penalties,
                 'total_penalty': total_penalty,
                 'rewards': rewards,
-                'total_rewards': sum(rewards.values()) if isinstance(rewards, dict) else 0,
-                'explanation': f'Base score 70, penalties -{total_penalty}, rewards +{sum(rewards.values()) if isinstance(rewards, dict) else 0}'
+                'total_rewards': total_rewards,
+                'explanation': f'Base score 70, penalties -{total_penalty}, rewards +{total_rewards}'
             }
             
         except Exception as e:
@@ -454,121 +654,68 @@ class ScoringService:
         
         return reasons if reasons else ["Score analysis completed successfully"]
     
-    def _identify_strength_indicators(self, text: str) -> List[str]:
+    def _identify_strength_indicators(self, aggregate: TranscriptAggregate) -> List[str]:
         """Identify positive strength indicators in the transcript"""
         strengths = []
-        text_lower = text.lower()
+        patterns = aggregate.patterns_found
         
         # Check for achievement language
-        if re.search(r'achieved|increased|improved|reduced|delivered|completed', text_lower):
+        if 'achievement' in patterns:
             strengths.append("Demonstrated achievement orientation")
         
         # Check for specific metrics
-        if re.search(r'\d+%|\d+ percent|\d+ people|\d+ team', text_lower):
+        if 'metrics' in patterns:
             strengths.append("Provided quantifiable results")
         
         # Check for leadership indicators
-        if re.search(r'led|managed|supervised|coordinated', text_lower):
+        if 'leadership' in patterns:
             strengths.append("Showed leadership experience")
         
         # Check for problem-solving
-        if re.search(r'solved|resolved|analyzed|investigated', text_lower):
+        if 'problem_solving' in patterns:
             strengths.append("Demonstrated problem-solving skills")
         
         # Check for teamwork
-        if re.search(r'collaborated|worked with|team|partnered', text_lower):
+        if 'teamwork' in patterns:
             strengths.append("Emphasized teamwork and collaboration")
         
         return strengths
     
-    def _clean_transcript(self, transcript: str) -> str:
-        """Clean and normalize transcript text"""
-        # Remove interviewer text (usually starts with "Interviewer:")
-        lines = transcript.split('\n')
-        candidate_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and not line.lower().startswith('interviewer:'):
-                candidate_lines.append(line)
-        
-        # Join candidate responses
-        clean_text = ' '.join(candidate_lines)
-        
-        # Remove extra whitespace and normalize
-        clean_text = re.sub(r'\s+', ' ', clean_text)
-        
-        return clean_text.strip()
-    
-    def _get_sentiment_breakdown(self, text: str) -> Dict:
-        """Get detailed sentiment analysis"""
-        try:
-            blob = TextBlob(text)
-            
-            return {
-                'polarity': round(blob.sentiment.polarity, 3),
-                'subjectivity': round(blob.sentiment.subjectivity, 3),
-                'sentiment_label': self._get_sentiment_label(blob.sentiment.polarity),
-                'confidence': round(abs(blob.sentiment.polarity), 3)
-            }
-        except Exception as e:
-            return {
-                'polarity': 0,
-                'subjectivity': 0,
-                'sentiment_label': 'neutral',
-                'confidence': 0
-            }
-    
-    def _get_communication_metrics(self, text: str) -> Dict:
-        """Get communication metrics"""
-        try:
-            doc = self.nlp(text)
-            
-            return {
-                'word_count': len(doc),
-                'sentence_count': len(list(doc.sents)),
-                'avg_sentence_length': round(len(doc) / len(list(doc.sents)), 2) if len(list(doc.sents)) > 0 else 0,
-                'vocabulary_diversity': round(len(set([token.text.lower() for token in doc if not token.is_punct])) / len(doc), 3) if len(doc) > 0 else 0,
-                'communication_style': self._assess_communication_style(text)
-            }
-        except Exception as e:
-            return {
-                'word_count': 0,
-                'sentence_count': 0,
-                'avg_sentence_length': 0,
-                'vocabulary_diversity': 0,
-                'communication_style': 'neutral'
-            }
-    
-    def _get_behavioral_breakdown(self, text: str) -> Dict:
-        """Get behavioral indicators breakdown"""
-        text_lower = text.lower()
-        breakdown = {}
-        
-        for category, config in self.behavioral_indicators.items():
-            keywords = config['keywords']
-            keyword_count = sum(1 for keyword in keywords if keyword in text_lower)
-            breakdown[category] = {
-                'count': keyword_count,
-                'score': min(100, keyword_count * 15),
-                'weight': config['weight']
-            }
-        
-        return breakdown
+    def _breakdown(self, aggregate: TranscriptAggregate, components: Dict) -> Dict:
+        """Breakdown view of an analysis, reusing its chunk statistics and component results"""
+        sentiment = components['sentiment']
+        communication = components['communication'].get('metrics') or {}
+        quality = components['quality']
+        return {
+            'sentiment_analysis': {
+                'polarity': sentiment['polarity'],
+                'subjectivity': sentiment['subjectivity'],
+                'sentiment_label': self._get_sentiment_label(sentiment['polarity']),
+                'confidence': sentiment['confidence']
+            },
+            'communication_metrics': {
+                'word_count': communication.get('word_count', 0),
+                'sentence_count': communication.get('sentence_count', 0),
+                'avg_sentence_length': communication.get('avg_sentence_length', 0),
+                'vocabulary_diversity': communication.get('vocabulary_diversity', 0),
+                'communication_style': self._assess_communication_style(communication.get('avg_sentence_length', 0))
+            },
+            'behavioral_indicators': {
+                category: {'count': c['keyword_count'], 'score': c['score'], 'weight': c['weight']}
+                for category, c in components['behavioral'].get('category_breakdown', {}).items()
+            },
+            'response_quality': self._get_response_quality_breakdown(quality),
+            'key_phrases': aggregate.key_phrases(),
+            'improvement_areas': self._identify_improvement_areas(aggregate),
+            'strength_indicators': self._identify_strength_indicators(aggregate)
+        }
     
-    def _get_response_quality_breakdown(self, text: str) -> Dict:
+    def _get_response_quality_breakdown(self, quality_analysis: Dict) -> Dict:
         """Get response quality breakdown"""
-        text_lower = text.lower()
-        
-        # Check for specific examples
-        has_examples = bool(re.search(r'for example|specifically|in one instance', text_lower))
-        
-        # Check for metrics
-        has_metrics = bool(re.search(r'\d+%|\d+ percent|\d+ people|\d+ team', text_lower))
-        
-        # Check for negative indicators
-        negative_count = sum(1 for category in self.negative_indicators.values() 
-                           for indicator in category if indicator in text_lower)
+        rewards = quality_analysis.get('rewards') or {}
+        has_examples = 'examples' in rewards
+        has_metrics = 'metrics' in rewards
+        negative_count = sum(len(p['indicators_found']) for p in (quality_analysis.get('penalties') or {}).values())
         
         return {
             'has_specific_examples': has_examples,
@@ -577,52 +724,27 @@ class ScoringService:
             'overall_quality': 'good' if has_examples and has_metrics and negative_count == 0 else 'needs_improvement'
         }
     
-    def _extract_key_phrases(self, text: str) -> List[str]:
-        """Extract key phrases from transcript"""
-        try:
-            doc = self.nlp(text)
-            
-            # Extract noun phrases and important sentences
-            key_phrases = []
-            
-            # Get noun phrases
-            for chunk in doc.noun_chunks:
-                if len(chunk.text.split()) >= 2:  # At least 2 words
-                    key_phrases.append(chunk.text)
-            
-            # Get sentences with behavioral keywords
-            for sent in doc.sents:
-                sent_text = sent.text.lower()
-                if any(keyword in sent_text for category in self.behavioral_indicators.values() 
-                      for keyword in category['keywords']):
-                    key_phrases.append(sent.text.strip())
-            
-            return key_phrases[:5]  # Return top 5 key phrases
-            
-        except Exception as e:
-            return []
-    
-    def _identify_improvement_areas(self, text: str) -> List[str]:
+    def _identify_improvement_areas(self, aggregate: TranscriptAggregate) -> List[str]:
         """Identify areas for improvement"""
         improvement_areas = []
-        text_lower = text.lower()
+        found = aggregate.phrases_found
         
         # Check for vague language
         vague_indicators = self.negative_indicators['vague']
-        if any(indicator in text_lower for indicator in vague_indicators):
+        if any(indicator in found for indicator in vague_indicators):
             improvement_areas.append("Use more specific language instead of vague terms")
         
         # Check for lack of examples
-        if not re.search(r'for example|specifically|in one instance', text_lower):
+        if 'examples' not in aggregate.patterns_found:
             improvement_areas.append("Provide specific examples to support your statements")
         
         # Check for lack of metrics
-        if not re.search(r'\d+%|\d+ percent|\d+ people|\d+ team', text_lower):
+        if 'metrics' not in aggregate.patterns_found:
             improvement_areas.append("Include quantifiable achievements and metrics")
         
         # Check for negative language
         negative_indicators = self.negative_indicators['negative']
-        if any(indicator in text_lower for indicator in negative_indicators):
+        if any(indicator in found for indicator in negative_indicators):
             improvement_areas.append("Focus on positive outcomes and solutions")
         
         return improvement_areas
@@ -636,16 +758,11 @@ class ScoringService:
         else:
             return 'neutral'
     
-    def _assess_communication_style(self, text: str) -> str:
-        """Assess communication style"""
-        doc = self.nlp(text)
-        
-        # Calculate various style indicators
-        avg_sentence_length = len(doc) / len(list(doc.sents)) if len(list(doc.sents)) > 0 else 0
-        
+    def _assess_communication_style(self, avg_sentence_length: float) -> str:
+        """Assess communication style from the average sentence length"""
         if avg_sentence_length > 20:
             return 'detailed'
         elif avg_sentence_length > 10:
             return 'balanced'
         else:
-            return 'concise' 
\ No newline at end of file
+            return 'concise'
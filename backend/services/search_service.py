@@ -0,0 +1,178 @@
+import re
+from typing import Dict, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, TEXT
+
+from services.skill_taxonomy import canonicalize_skill
+
+# Score bucket boundaries used for the ats_score facet
+SCORE_BUCKETS = [0, 50, 70, 85, 101]
+
+# Fields copied from the candidate document into the search index
+INDEXED_FIELDS = ['name', 'email', 'job_id', 'status', 'skills', 'ats_score', 'behavior_score']
+
+
+class SearchService:
+    """Candidate search over a dedicated ``candidate_search`` collection.
+
+    Each candidate has one search document holding its skills, scores and a
+    flattened text of the resume, experience and education. The collection
+    carries a weighted text index plus multikey skill indexes, so boolean
+    skill filters, score ranges, facets and relevance ordering are answered
+    without touching the (slim) candidates collection or the blob store.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def ensure_indexes(self):
+        self.collection.create_index(
+            [('skills', TEXT), ('search_text', TEXT)],
+            weights={'skills': 10, 'search_text': 1},
+            default_language='english',
+            name='candidate_search_text'
+        )
+        self.collection.create_index([('job_id', ASCENDING), ('skills', ASCENDING), ('ats_score', DESCENDING)])
+        self.collection.create_index([('skills', ASCENDING), ('ats_score', DESCENDING)])
+        self.collection.create_index([('job_id', ASCENDING), ('ats_score', DESCENDING)])
+
+    def normalize_skill(self, skill: str) -> str:
+        return canonicalize_skill(skill)
+
+    def build_document(self, candidate: Dict) -> Dict:
+        """Search document for a (hydrated) candidate"""
+        document = {field: candidate.get(field) for field in INDEXED_FIELDS if field in candidate}
+        document['skills'] = sorted({self.normalize_skill(s) for s in candidate.get('skills') or []})
+        parts = [candidate.get('resume_text') or '']
+        parts += [e.get('description', '') for e in candidate.get('experience') or [] if isinstance(e, dict)]
+        parts += [' '.join(str(v) for v in e.values()) for e in candidate.get('education') or [] if isinstance(e, dict)]
+        document['search_text'] = '\n'.join(p for p in parts if p)
+        return document
+
+    def index_candidate(self, candidate_id, candidate: Dict):
+        self.collection.replace_one({'_id': candidate_id}, self.build_document(candidate), upsert=True)
+
+    def update_fields(self, candidate_id, updates: Dict):
+        """Mirror score/status changes written to a candidate"""
+        fields = {k: v for k, v in updates.items() if k in INDEXED_FIELDS and k != 'skills'}
+        if 'skills' in updates:
+            fields['skills'] = sorted({self.normalize_skill(s) for s in updates['skills'] or []})
+        if fields:
+            self.collection.update_one({'_id': candidate_id}, {'$set': fields})
+
+    def parse_skill_query(self, expression: str) -> Optional[Dict]:
+        """Turn ``python AND aws OR java AND NOT php`` into a skills filter.
+
+        AND binds tighter than OR; a term prefixed with NOT must be absent.
+        A comma-separated list is treated as AND.
+        """
+        expression = (expression or '').strip()
+        if not expression:
+            return None
+        clauses = []
+        for group in re.split(r'\s+OR\s+', expression, flags=re.IGNORECASE):
+            required, excluded = [], []
+            for term in re.split(r'\s+AND\s+|,', group, flags=re.IGNORECASE):
+                term = term.strip()
+                if not term:
+                    continue
+                negated = re.match(r'^NOT\s+(.+)$', term, re.IGNORECASE)
+                if negated:
+                    excluded.append(self.normalize_skill(negated.group(1)))
+                else:
+                    required.append(self.normalize_skill(term))
+            condition = {}
+            if required:
+                condition['$all'] = required
+            if excluded:
+                condition['$nin'] = excluded
+            if condition:
+                clauses.append({'skills': condition})
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {'$or': clauses}
+
+    @staticmethod
+    def _range(minimum: Optional[float], maximum: Optional[float]) -> Optional[Dict]:
+        condition = {}
+        if minimum is not None:
+            condition['$gte'] = minimum
+        if maximum is not None:
+            condition['$lte'] = maximum
+        return condition or None
+
+    def build_filter(self, text: str = '', skills: str = '', job_id: Optional[str] = None,
+                     status: Optional[str] = None, ats_range: Tuple = (None, None),
+                     behavior_range: Tuple = (None, None)) -> Dict:
+        conditions = []
+        if text:
+            conditions.append({'$text': {'$search': text}})
+        if job_id:
+            conditions.append({'job_id': job_id})
+        if status:
+            conditions.append({'status': status})
+        skill_filter = self.parse_skill_query(skills)
+        if skill_filter:
+            conditions.append(skill_filter)
+        for field, bounds in (('ats_score', ats_range), ('behavior_score', behavior_range)):
+            condition = self._range(*bounds)
+            if condition:
+                conditions.append({field: condition})
+        if not conditions:
+            return {}
+        return conditions[0] if len(conditions) == 1 else {'$and': conditions}
+
+    def search(self, text: str = '', skills: str = '', job_id: Optional[str] = None,
+               status: Optional[str] = None, ats_range: Tuple = (None, None),
+               behavior_range: Tuple = (None, None), limit: int = 20, offset: int = 0,
+               facets: bool = False, facet_limit: int = 20) -> Dict:
+        """Return a page of matching candidates, plus total and facet counts if asked.
+
+        The page is an index-backed find with sort and limit. Counts and facets
+        come from a separate aggregation over every match, so they are only
+        computed with ``facets=True``.
+        """
+        query = self.build_filter(text, skills, job_id, status, ats_range, behavior_range)
+        projection = {'search_text': 0}
+        if text:
+            # Relevance ordering: text score first, ATS score as tie-breaker
+            projection = {field: 1 for field in INDEXED_FIELDS}
+            projection['relevance'] = {'$meta': 'textScore'}
+            sort = [('relevance', {'$meta': 'textScore'}), ('ats_score', DESCENDING)]
+        else:
+            sort = [('ats_score', DESCENDING), ('_id', ASCENDING)]
+        results = list(self.collection.find(query, projection).sort(sort).skip(offset).limit(limit))
+
+        response = {'results': results, 'total': None, 'facets': {}}
+        if facets:
+            response.update(self.facet_counts(query, facet_limit))
+        return response
+
+    def facet_counts(self, query: Dict, facet_limit: int = 20) -> Dict:
+        pipeline = [
+            {'$match': query},
+            {'$facet': {
+                'total': [{'$count': 'count'}],
+                'skills': [
+                    {'$unwind': '$skills'},
+                    {'$group': {'_id': '$skills', 'count': {'$sum': 1}}},
+                    {'$sort': {'count': -1, '_id': 1}},
+                    {'$limit': facet_limit}
+                ],
+                'status': [{'$group': {'_id': '$status', 'count': {'$sum': 1}}}, {'$sort': {'count': -1}}],
+                'ats_score': [{'$bucket': {
+                    'groupBy': '$ats_score', 'boundaries': SCORE_BUCKETS, 'default': 'unscored',
+                    'output': {'count': {'$sum': 1}}
+                }}]
+            }}
+        ]
+        result = next(self.collection.aggregate(pipeline), {})
+        total = result.get('total') or [{'count': 0}]
+        return {
+            'total': total[0]['count'],
+            'facets': {
+                'skills': [{'skill': f['_id'], 'count': f['count']} for f in result.get('skills', [])],
+                'status': [{'status': f['_id'], 'count': f['count']} for f in result.get('status', [])],
+                'ats_score': [{'bucket': f['_id'], 'count': f['count']} for f in result.get('ats_score', [])]
+            }
+        }
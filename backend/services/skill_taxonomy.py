@@ -0,0 +1,30 @@
+import re
+from typing import Dict, List
+
+# Bump whenever SKILL_SYNONYMS changes so stored job profiles and scores
+# derived from the old taxonomy can be recognised as stale.
+TAXONOMY_VERSION = 1
+
+# Canonical skill -> synonyms that count as evidence for it
+SKILL_SYNONYMS: Dict[str, List[str]] = {
+    'python': ['python', 'py', 'django', 'flask', 'fastapi'],
+    'javascript': ['javascript', 'js', 'node', 'react', 'angular', 'vue'],
+    'java': ['java', 'spring', 'hibernate', 'maven', 'gradle'],
+    'aws': ['aws', 'amazon web services', 'ec2', 's3', 'lambda'],
+    'docker': ['docker', 'containerization', 'kubernetes', 'k8s'],
+    'git': ['git', 'github', 'gitlab', 'version control'],
+    'sql': ['sql', 'mysql', 'postgresql', 'database'],
+    'machine learning': ['ml', 'machine learning', 'ai', 'artificial intelligence', 'tensorflow', 'pytorch']
+}
+
+_SYNONYM_TO_SKILL = {}
+for _skill, _synonyms in SKILL_SYNONYMS.items():
+    _SYNONYM_TO_SKILL[_skill] = _skill
+    for _synonym in _synonyms:
+        _SYNONYM_TO_SKILL.setdefault(_synonym, _skill)
+
+
+def canonicalize_skill(name: str) -> str:
+    """Map a skill name or synonym to its canonical taxonomy name"""
+    key = re.sub(r'\s+', ' ', (name or '').strip().lower())
+    return _SYNONYM_TO_SKILL.get(key, key)
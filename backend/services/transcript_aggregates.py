@@ -0,0 +1,171 @@
+import hashlib
+import heapq
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Sentence ends used to split a turn that is longer than a chunk
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def split_chunks(lines: Iterable[str], max_chars: int) -> Iterator[str]:
+    """Group transcript turns into chunks of at most ``max_chars`` characters.
+
+    Chunks break between turns; a turn longer than a chunk is broken at
+    sentence ends, and a sentence longer than a chunk at the last space
+    that fits. Joining the chunks with single spaces gives back the text.
+    """
+    chunk, size = [], 0
+    for line in lines:
+        pieces = [line] if len(line) <= max_chars else _split_long(line, max_chars)
+        for piece in pieces:
+            if chunk and size + 1 + len(piece) > max_chars:
+                yield ' '.join(chunk)
+                chunk, size = [], 0
+            size += len(piece) + (1 if chunk else 0)
+            chunk.append(piece)
+    if chunk:
+        yield ' '.join(chunk)
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    pieces = []
+    for sentence in SENTENCE_END.split(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars + 1)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+class DistinctCounter:
+    """Mergeable distinct count (k-minimum-values sketch).
+
+    Keeps the ``k`` smallest 64-bit hashes of the values seen. Exact while
+    fewer than ``k`` distinct values were added; beyond that the estimate
+    has a relative standard error of about ``1/sqrt(k)`` (1.6% for the
+    default k), in constant memory.
+    """
+
+    def __init__(self, k: int = 4096):
+        self.k = k
+        self._hashes = set()
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    def add(self, value: str):
+        self._hashes.add(self._hash(value))
+        if len(self._hashes) > 2 * self.k:
+            self._prune()
+
+    def merge(self, other: 'DistinctCounter'):
+        self._hashes |= other._hashes
+        self._prune()
+
+    def _prune(self):
+        if len(self._hashes) > self.k:
+            self._hashes = set(heapq.nsmallest(self.k, self._hashes))
+
+    @property
+    def exact(self) -> bool:
+        return len(self._hashes) < self.k
+
+    def estimate(self) -> float:
+        self._prune()
+        if self.exact:
+            return float(len(self._hashes))
+        kth = max(self._hashes)
+        return (self.k - 1) / ((kth + 1) / 2.0 ** 64)
+
+
+class TranscriptAggregate:
+    """Additive statistics of transcript chunks, merged into one per transcript.
+
+    Holds only counts, sums, the set of matched phrases and pattern names, a
+    distinct-token sketch and a few capped phrase lists, so its size does not
+    grow with the transcript. Scores computed from a merged aggregate equal
+    those of the whole text, except that a phrase spanning two chunks is not
+    matched and the distinct-token count is estimated for large vocabularies.
+    """
+
+    MAX_PHRASES = 5
+
+    def __init__(self, sketch_size: int = 4096):
+        self.chunks = 0
+        self.chars = 0
+        self.word_count = 0
+        self.sentence_count = 0
+        self.unique_words = DistinctCounter(sketch_size)
+        # Sentiment: sums over the scored words and phrases (TextBlob assessments)
+        self.polarity_sum = 0.0
+        self.subjectivity_sum = 0.0
+        self.assessments = 0
+        # Keyword phrases and named patterns found in at least one chunk
+        self.phrases_found = set()
+        self.patterns_found = set()
+        self.noun_phrases: List[str] = []
+        self.keyword_sentences: List[str] = []
+
+    def add_chunk(self, text: str, doc, assessments: Iterable, phrases: Iterable[str],
+                  patterns: Dict[str, 're.Pattern'], keywords: Optional[Iterable[str]] = None):
+        """Add one chunk's spaCy doc and TextBlob assessments.
+
+        ``phrases`` are matched as substrings of the lowercased text and
+        ``patterns`` by name; noun phrases and keyword sentences are collected
+        only when ``keywords`` is given (the detail view needs them).
+        """
+        text_lower = text.lower()
+        self.chunks += 1
+        self.chars += len(text) + (1 if self.chars else 0)
+        self.word_count += len(doc)
+        for token in doc:
+            if not token.is_punct:
+                self.unique_words.add(token.text.lower())
+        sentences = list(doc.sents)
+        self.sentence_count += len(sentences)
+        for assessment in assessments:
+            self.polarity_sum += assessment[1]
+            self.subjectivity_sum += assessment[2]
+            self.assessments += 1
+        self.phrases_found.update(phrase for phrase in phrases if phrase in text_lower)
+        self.patterns_found.update(name for name, pattern in patterns.items() if pattern.search(text_lower))
+        if keywords is not None:
+            keywords = list(keywords)
+            if len(self.noun_phrases) < self.MAX_PHRASES:
+                self.noun_phrases += [c.text for c in doc.noun_chunks if len(c.text.split()) >= 2]
+                del self.noun_phrases[self.MAX_PHRASES:]
+            if len(self.keyword_sentences) < self.MAX_PHRASES:
+                self.keyword_sentences += [s.text.strip() for s in sentences
+                                           if any(keyword in s.text.lower() for keyword in keywords)]
+                del self.keyword_sentences[self.MAX_PHRASES:]
+
+    def merge(self, other: 'TranscriptAggregate'):
+        """Fold ``other`` (the following chunks) into this aggregate"""
+        self.chars += other.chars + (1 if self.chars and other.chars else 0)
+        self.chunks += other.chunks
+        self.word_count += other.word_count
+        self.sentence_count += other.sentence_count
+        self.unique_words.merge(other.unique_words)
+        self.polarity_sum += other.polarity_sum
+        self.subjectivity_sum += other.subjectivity_sum
+        self.assessments += other.assessments
+        self.phrases_found |= other.phrases_found
+        self.patterns_found |= other.patterns_found
+        self.noun_phrases = (self.noun_phrases + other.noun_phrases)[:self.MAX_PHRASES]
+        self.keyword_sentences = (self.keyword_sentences + other.keyword_sentences)[:self.MAX_PHRASES]
+
+    @property
+    def polarity(self) -> float:
+        # TextBlob's polarity is the plain mean over its assessments (0 without any)
+        return self.polarity_sum / self.assessments if self.assessments else 0.0
+
+    @property
+    def subjectivity(self) -> float:
+        return self.subjectivity_sum / self.assessments if self.assessments else 0.0
+
+    def key_phrases(self) -> List[str]:
+        return (self.noun_phrases + self.keyword_sentences)[:self.MAX_PHRASES]
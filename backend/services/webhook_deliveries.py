@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from services.metrics_service import metrics
+
+# Sender-assigned delivery ids, checked in order. Proxy-set ids such as
+# X-Request-ID change on every hop, so retries would not share a key.
+DELIVERY_ID_HEADERS = ('Idempotency-Key', 'X-Delivery-ID', 'X-Webhook-ID')
+
+PROCESSING = 'processing'
+DONE = 'done'
+
+
+class WebhookDeliveryService:
+    """Deduplicates webhook deliveries in the ``webhook_deliveries`` collection.
+
+    A delivery is keyed by the provider's delivery ID header, or else by a
+    hash of the canonical JSON payload. The first delivery claims the key
+    and, once it succeeds, stores its response; retries get that response
+    back by ``_id`` lookup without running the handler again. Claims of
+    failed deliveries are dropped so the provider's retry is processed.
+    Records expire after ``WEBHOOK_DEDUP_TTL_SECONDS`` through a TTL index;
+    a claim whose handler died is taken over after
+    ``WEBHOOK_PROCESSING_TIMEOUT_SECONDS``.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.enabled = os.getenv('WEBHOOK_DEDUP', 'true').lower() in ('1', 'true', 'yes')
+        self.ttl_seconds = int(os.getenv('WEBHOOK_DEDUP_TTL_SECONDS', 7 * 24 * 3600))
+        self.processing_timeout = int(os.getenv('WEBHOOK_PROCESSING_TIMEOUT_SECONDS', 300))
+
+    def ensure_indexes(self):
+        self.collection.create_index('expires_at', expireAfterSeconds=0)
+
+    def delivery_key(self, source: str, headers, payload) -> str:
+        for header in DELIVERY_ID_HEADERS:
+            if headers.get(header):
+                return f'{source}:id:{headers[header]}'
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return f'{source}:sha256:' + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def claim(self, key: str) -> Optional[Dict]:
+        """Claim ``key`` for processing.
+
+        Returns None when the caller should process the delivery, otherwise
+        the existing record: ``state`` is ``done`` (with the stored
+        ``response``) or ``processing`` while another request handles it.
+        """
+        now = datetime.utcnow()
+        record = {
+            '_id': key,
+            'state': PROCESSING,
+            'received_at': now,
+            'expires_at': now + timedelta(seconds=self.processing_timeout)
+        }
+        try:
+            self.collection.insert_one(record)
+            metrics.inc('webhook_deliveries_total', labels={'outcome': 'processed'})
+            return None
+        except DuplicateKeyError:
+            pass
+        # An abandoned claim: take it over rather than wait for the TTL monitor
+        taken = self.collection.find_one_and_update(
+            {'_id': key, 'state': PROCESSING, 'expires_at': {'$lt': now}},
+            {'$set': {'received_at': now, 'expires_at': record['expires_at']}},
+            return_document=ReturnDocument.AFTER
+        )
+        if taken is not None:
+            metrics.inc('webhook_deliveries_total', labels={'outcome': 'processed'})
+            return None
+        existing = self.collection.find_one({'_id': key})
+        if existing is None:
+            # Dropped between our insert and lookup; process it
+            return self.claim(key)
+        metrics.inc('webhook_deliveries_total', labels={'outcome': 'replayed' if existing['state'] == DONE else 'in_progress'})
+        return existing
+
+    def complete(self, key: str, status: int, body: bytes, mimetype: str):
+        self.collection.update_one({'_id': key}, {'$set': {
+            'state': DONE,
+            'response': {'status': status, 'body': body, 'mimetype': mimetype},
+            'completed_at': datetime.utcnow(),
+            'expires_at': datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        }})
+
+    def release(self, key: str):
+        self.collection.delete_one({'_id': key, 'state': PROCESSING})
@@ -0,0 +1,30 @@
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from services.candidate_state import (  # noqa: E402
+    ATS_SCORED, EVALUATED, HIRED, INTERVIEW_ANALYZING, INTERVIEW_COMPLETED, INTERVIEW_SCHEDULED,
+    INTERVIEW_STARTED, REJECTED, RESUME_UPLOADED, CandidateStateService, TransitionRejected
+)
+
+
+def _start_interview(status):
+    collection = mongomock.MongoClient().db.candidates
+    candidate = {'email': 'a@example.com'}
+    if status is not None:
+        candidate['status'] = status
+    collection.insert_one(candidate)
+    return CandidateStateService(collection).transition({'email': 'a@example.com'}, INTERVIEW_STARTED)
+
+
+@pytest.mark.parametrize('status', [None, RESUME_UPLOADED, ATS_SCORED, INTERVIEW_SCHEDULED, INTERVIEW_STARTED,
+                                    EVALUATED, HIRED, REJECTED])
+def test_start_interview_is_allowed_before_completion(status):
+    assert _start_interview(status)['status'] == INTERVIEW_STARTED
+
+
+@pytest.mark.parametrize('status', [INTERVIEW_COMPLETED, INTERVIEW_ANALYZING, 'on_hold'])
+def test_start_interview_rejects_completed_busy_and_unknown_statuses(status):
+    with pytest.raises(TransitionRejected) as rejected:
+        _start_interview(status)
+    assert rejected.value.current == status
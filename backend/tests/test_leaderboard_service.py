@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from services.leaderboard_service import LeaderboardService  # noqa: E402
+
+
+def _service():
+    db = mongomock.MongoClient().db
+    leaderboard = LeaderboardService(db.leaderboard_buckets, db.candidates)
+    leaderboard.ensure_indexes()
+    return db, leaderboard
+
+
+def _insert(db, leaderboard, job_id, score):
+    candidate = {'job_id': job_id, 'ats_score': score}
+    candidate_id = db.candidates.insert_one(candidate).inserted_id
+    leaderboard.record(candidate_id, candidate)
+    return candidate_id
+
+
+def _rescore(db, leaderboard, candidate_id, score):
+    db.candidates.update_one({'_id': candidate_id}, {'$set': {'ats_score': score}})
+    leaderboard.record(candidate_id, {'ats_score': score})
+
+
+def test_rank_matches_full_ordering_after_rescoring():
+    db, leaderboard = _service()
+    rng = random.Random(7)
+    ids = [_insert(db, leaderboard, 'job-a', rng.choice([55, 70.5, 70.25, 88, 100])) for _ in range(40)]
+    _insert(db, leaderboard, 'job-b', 99)
+    for candidate_id in ids[:15]:
+        _rescore(db, leaderboard, candidate_id, rng.uniform(0, 100))
+
+    ordered = [entry['_id'] for entry in leaderboard.top('job-a', limit=100)]
+    assert len(ordered) == 40
+    for position, candidate_id in enumerate(ordered, start=1):
+        assert leaderboard.rank(candidate_id)['rank'] == position
+
+
+def test_rebuild_repairs_drifted_counts():
+    db, leaderboard = _service()
+    first = _insert(db, leaderboard, 'job-a', 80)
+    second = _insert(db, leaderboard, 'job-a', 60)
+    # A score written without going through record()
+    db.candidates.update_one({'_id': second}, {'$set': {'ats_score': 90}})
+
+    stats = leaderboard.rebuild(check_only=True)
+    assert stats['stale_candidates'] == 1
+    assert stats['mismatched_buckets'] == 2
+    # Until rebuilt, the counts still have the second candidate in the 60 bucket
+    assert leaderboard.rank(first)['rank'] == 1
+
+    leaderboard.rebuild()
+    assert leaderboard.rebuild(check_only=True)['mismatched_buckets'] == 0
+    assert leaderboard.rank(first)['rank'] == 2
+    assert leaderboard.rank(second)['rank'] == 1
@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from services.profiling_service import ProfilingService
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_overlapping_requests_profile_one_at_a_time():
+    service = ProfilingService()
+    first_started, second_checked = threading.Event(), threading.Event()
+    results = {}
+
+    def first():
+        profiler = service.start()
+        first_started.set()
+        second_checked.wait(5)
+        results['first'] = service.finish(profiler)
+
+    def second():
+        first_started.wait(5)
+        results['second'] = service.start()
+        second_checked.set()
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert results['second'] is None
+    assert results['first']['total_calls'] >= 0
+    # The slot is free again once the profiled request finished
+    profiler = service.start()
+    assert profiler is not None
+    service.stop(profiler)
+
+
+GEVENT_SCRIPT = """
+from gevent import monkey
+monkey.patch_all()
+import json, sys
+import gevent
+sys.path.insert(0, %r)
+from services.profiling_service import ProfilingService
+
+service = ProfilingService()
+results = {}
+
+def profiled_work():
+    return sum(range(1000))
+
+def other_work():
+    return sum(range(1000))
+
+def profiled_request():
+    profiler = service.start()
+    for _ in range(5):
+        profiled_work()
+        gevent.sleep(0.01)
+    results['profile'] = service.finish(profiler)
+
+def other_request():
+    gevent.sleep(0.001)
+    results['second_profiler'] = service.start()
+    for _ in range(5):
+        other_work()
+        gevent.sleep(0.01)
+
+gevent.joinall([gevent.spawn(profiled_request), gevent.spawn(other_request)])
+functions = {frame['function']: frame['ncalls'] for frame in results['profile']['hot_frames']}
+print(json.dumps({'functions': functions, 'second_profiler': results['second_profiler'] is not None}))
+"""
+
+
+def test_overlapping_greenlets_are_not_counted():
+    pytest.importorskip('gevent')
+    env = dict(os.environ, PROFILE_TOP_FUNCTIONS='1000')
+    # Monkey-patching is process-wide, so the greenlets run in a child process
+    output = subprocess.run([sys.executable, '-c', GEVENT_SCRIPT % BACKEND], env=env,
+                            capture_output=True, text=True, timeout=60, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result['second_profiler'] is False
+    assert result['functions'].get('profiled_work') == 5
+    assert 'other_work' not in result['functions']
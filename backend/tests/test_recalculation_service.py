@@ -0,0 +1,54 @@
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+from services.ats_schema import WEIGHTED_SKILL_MEAN  # noqa: E402
+from services.ats_upgrade_service import ATS_FINAL  # noqa: E402
+from services.blob_store import BlobStore  # noqa: E402
+from services.recalculation_service import RecalculationService  # noqa: E402
+
+STORED_INPUTS = {'content_hash': 'job-hash', 'taxonomy_version': 1, 'scorer_version': 1,
+                 'weights': {'python': 0.5, 'aws': 0.5}, 'key': 'old'}
+# Same job content, new weights
+NEW_INPUTS = dict(STORED_INPUTS, weights={'python': 0.8, 'aws': 0.2}, key='new')
+GEMINI_RESCORE = {'overall_score': 64, 'skill_matches': [], 'method': 'Google Gemini AI'}
+
+
+class FakeResumeService:
+    def __init__(self):
+        self.calls = 0
+
+    def calculate_ats_score(self, resume_text, **context):
+        self.calls += 1
+        return dict(GEMINI_RESCORE)
+
+
+class FakeSearchService:
+    def update_fields(self, candidate_id, updates):
+        pass
+
+
+def _recalculate(analysis):
+    db = mongomock.MongoClient().db
+    resume_service = FakeResumeService()
+    service = RecalculationService(db.candidates, db.jobs, BlobStore(db.blobs), FakeSearchService(),
+                                   resume_service, None, None)
+    candidate = {'ats_version': 1, 'ats_status': ATS_FINAL, 'ats_analysis': analysis,
+                 'score_inputs': {'ats': STORED_INPUTS}, 'resume_text': 'Python and AWS'}
+    candidate['_id'] = db.candidates.insert_one(dict(candidate)).inserted_id
+    outcome = service._recalculate_ats(candidate, NEW_INPUTS, {'job_skills': ['python', 'aws']})
+    return outcome, resume_service.calls, db.candidates.find_one({'_id': candidate['_id']})['ats_score']
+
+
+def test_keyword_score_is_reweighted_from_skill_matches():
+    analysis = {'overall_score': 50, 'score_formula': WEIGHTED_SKILL_MEAN,
+                'skill_matches': [{'skill': 'python', 'match_score': 100}]}
+    outcome, calls, score = _recalculate(analysis)
+    assert (outcome, calls, score) == ('ats_reweighted', 0, 80)
+
+
+def test_gemini_score_is_rescored_not_reweighted():
+    analysis = {'overall_score': 72, 'method': 'Google Gemini AI',
+                'skill_matches': [{'skill': 'python', 'match_score': 90}, {'skill': 'aws', 'match_score': 40}]}
+    outcome, calls, score = _recalculate(analysis)
+    assert (outcome, calls, score) == ('ats_rescored', 1, GEMINI_RESCORE['overall_score'])
@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+from loadtest.replay import replaying  # noqa: E402
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeResumeService:
+    model = None
+
+
+def test_replaying_restores_requests_post_and_model(tmp_path):
+    real_post = requests.post
+    resume_service = FakeResumeService()
+    with replaying(resume_service, mode='replay', directory=str(tmp_path)) as store:
+        assert store is not None
+        assert requests.post is not real_post
+        response = requests.post('http://n8n.replay/webhook', json={'a': 1})
+        assert response.ok
+        assert json.loads(resume_service.model.generate_content('prompt').text)['overall_score'] == 78
+    assert requests.post is real_post
+    assert resume_service.model is None
+
+
+def test_replay_import_does_not_load_the_app_dependencies():
+    script = 'import sys, loadtest.replay; print(sorted({"fitz", "services.resume_service"} & set(sys.modules)))'
+    output = subprocess.run([sys.executable, '-c', script], cwd=BACKEND_DIR, capture_output=True, text=True,
+                            check=True).stdout
+    assert output.strip() == '[]'
@@ -34,6 +34,10 @@ ChartJS.register(
   ArcElement
 );
 
+// Polling for the Gemini analysis that replaces a provisional ATS score
+const ATS_POLL_INTERVAL_MS = 3000;
+const ATS_POLL_MAX_ATTEMPTS = 40;
+
 function injectOmnidimensionWidget() {
   if (!document.getElementById('omnidimension-web-widget')) {
     const script = document.createElement('script');
@@ -73,6 +77,7 @@ const CandidateDashboard = () => {
   const [widgetLoading, setWidgetLoading] = useState(false);
   const [polling, setPolling] = useState(false);
   const [lastStatus, setLastStatus] = useState(null);
+  const [atsUpgrade, setAtsUpgrade] = useState(null);
   const { user } = useUser();
 
   useEffect(() => {
@@ -138,6 +143,36 @@ const CandidateDashboard = () => {
     };
   }, [interviewStarted, candidate, lastStatus]);
 
+  useEffect(() => {
+    if (!atsUpgrade) return undefined;
+    let attempts = 0;
+    const interval = setInterval(async () => {
+      attempts += 1;
+      try {
+        const res = await candidateAPI.getAts(atsUpgrade.id, atsUpgrade.version);
+        const ats = res.data.ats;
+        if (ats.changed) {
+          setAtsAnalysis(ats.ats_analysis);
+          setCandidate(prev => prev && ({ ...prev, ats_score: ats.ats_score, ats_analysis: ats.ats_analysis, ats_status: ats.ats_status }));
+        }
+        if (ats.ats_status !== 'provisional') {
+          setAtsUpgrade(null);
+          if (ats.ats_status === 'final') toast.success('ATS analysis complete!');
+          return;
+        }
+        if (ats.changed) {
+          // Rescored meanwhile; wait for the upgrade of the new version
+          setAtsUpgrade({ id: atsUpgrade.id, version: ats.ats_version });
+          return;
+        }
+      } catch (err) {
+        // Ignore errors, the next poll retries
+      }
+      if (attempts >= ATS_POLL_MAX_ATTEMPTS) setAtsUpgrade(null);
+    }, ATS_POLL_INTERVAL_MS);
+    return () => clearInterval(interval);
+  }, [atsUpgrade]);
+
   const fetchJobs = async () => {
     try {
       const res = await jobAPI.list();
@@ -179,8 +214,13 @@ const CandidateDashboard = () => {
       const atsResult = await atsRes.json();
       if (atsResult.status === 'success') {
         setAtsAnalysis(atsResult.data);
-        setCandidate(prev => ({ ...prev, ats_score: atsResult.data.overall_score, ats_analysis: atsResult.data, status: 'ats_scored' }));
-        toast.success('ATS analysis complete!');
+        setCandidate(prev => ({ ...prev, ats_score: atsResult.data.overall_score, ats_analysis: atsResult.data, ats_status: atsResult.ats_status, status: 'ats_scored' }));
+        if (atsResult.ats_status === 'provisional') {
+          setAtsUpgrade({ id: uploadedCandidate._id, version: atsResult.ats_version });
+          toast('Provisional ATS score, the full analysis is on its way', { icon: '⏳' });
+        } else {
+          toast.success('ATS analysis complete!');
+        }
       } else {
         toast.error('Failed to calculate ATS score');
       }
@@ -723,6 +763,9 @@ const CandidateDashboard = () => {
                   <div>
                     <div className="flex items-center mb-2">
                       <h4 className="font-medium text-gray-900 mr-2">ATS Score</h4>
+                      {candidate.ats_status === 'provisional' && (
+                        <span className="bg-yellow-100 text-yellow-800 px-2 py-0.5 rounded-full text-xs font-medium">Provisional</span>
+                      )}
                     </div>
                     <div className="flex items-center">
                       <div className="text-3xl font-bold text-blue-600 mr-2 drop-shadow-lg animate-pulse">
@@ -20,6 +20,9 @@ import { Radar } from 'react-chartjs-2';
 import axios from 'axios';
 import { SignOutButton, useUser } from "@clerk/clerk-react";
 
+// Polling for the Gemini analysis that replaces a provisional ATS score
+const ATS_POLL_INTERVAL_MS = 3000;
+
 const RecruiterDashboard = () => {
   const navigate = useNavigate();
   const [candidates, setCandidates] = useState([]);
@@ -69,6 +72,26 @@ const RecruiterDashboard = () => {
     }));
   }, [candidates]);
 
+  useEffect(() => {
+    // Refresh an open candidate whose ATS score is still provisional
+    if (!candidateModal || candidateModal.ats_status !== 'provisional') return undefined;
+    const { _id: id, ats_version: version } = candidateModal;
+    const interval = setInterval(async () => {
+      try {
+        const res = await candidateAPI.getAts(id, version);
+        const ats = res.data.ats;
+        if (!ats.changed) return;
+        const updates = { ats_score: ats.ats_score, ats_status: ats.ats_status, ats_version: ats.ats_version };
+        if (ats.ats_analysis?.skill_matches) updates.skill_matches = ats.ats_analysis.skill_matches;
+        setCandidateModal(prev => (prev && prev._id === id ? { ...prev, ...updates } : prev));
+        setCandidates(prev => prev.map(c => (c._id === id ? { ...c, ...updates } : c)));
+      } catch (err) {
+        // Ignore errors, the next poll retries
+      }
+    }, ATS_POLL_INTERVAL_MS);
+    return () => clearInterval(interval);
+  }, [candidateModal]);
+
   const fetchData = async () => {
     try {
       const [candidatesRes, statsRes] = await Promise.all([
@@ -164,6 +187,13 @@ const RecruiterDashboard = () => {
     );
   };
 
+  const getAtsStatusBadge = (candidate) => {
+    if (candidate.ats_status !== 'provisional') return null;
+    return (
+      <span className="bg-yellow-100 text-yellow-800 px-2 py-0.5 rounded-full text-xs font-medium mr-2">Provisional</span>
+    );
+  };
+
   const getRecommendationBadge = (recommendation) => {
     const config = {
       'hire': { color: 'bg-green-100 text-green-800', text: 'Hire' },
@@ -412,6 +442,7 @@ const RecruiterDashboard = () => {
                       <div className="flex items-center mb-2">
                         <span className="text-sm font-medium text-gray-900 mr-2">ATS:</span>
                         <span className="text-sm font-bold text-blue-600 mr-2">{candidate.ats_score || 0}%</span>
+                        {getAtsStatusBadge(candidate)}
                         <div className="flex-1 bg-gray-200 rounded-full h-2 w-20">
                           <div className="bg-blue-600 h-2 rounded-full transition-all duration-300" style={{ width: `${candidate.ats_score || 0}%` }}></div>
                         </div>
@@ -453,6 +484,7 @@ const RecruiterDashboard = () => {
                       <div className="flex items-center mb-2">
                         <span className="text-sm font-medium text-gray-900 mr-2">ATS:</span>
                         <span className="text-sm font-bold text-blue-600 mr-2">{candidate.ats_score || 0}%</span>
+                        {getAtsStatusBadge(candidate)}
                         <div className="flex-1 bg-gray-200 rounded-full h-2 w-20">
                           <div className="bg-blue-600 h-2 rounded-full transition-all duration-300" style={{ width: `${candidate.ats_score || 0}%` }}></div>
                         </div>
@@ -495,6 +527,7 @@ const RecruiterDashboard = () => {
                       <div className="flex items-center mb-2">
                         <span className="text-sm font-medium text-green-900 mr-2">ATS:</span>
                         <span className="text-sm font-bold text-green-700 mr-2">{candidate.ats_score || 0}%</span>
+                        {getAtsStatusBadge(candidate)}
                         <div className="flex-1 bg-green-100 rounded-full h-2 w-20">
                           <div className="bg-green-600 h-2 rounded-full transition-all duration-300" style={{ width: `${candidate.ats_score || 0}%` }}></div>
                         </div>
@@ -529,6 +562,7 @@ const RecruiterDashboard = () => {
                       <div className="flex items-center mb-2">
                         <span className="text-sm font-medium text-red-900 mr-2">ATS:</span>
                         <span className="text-sm font-bold text-red-700 mr-2">{candidate.ats_score || 0}%</span>
+                        {getAtsStatusBadge(candidate)}
                         <div className="flex-1 bg-red-100 rounded-full h-2 w-20">
                           <div className="bg-red-600 h-2 rounded-full transition-all duration-300" style={{ width: `${candidate.ats_score || 0}%` }}></div>
                         </div>
@@ -670,6 +704,7 @@ const RecruiterDashboard = () => {
                 <div className="flex-1">
                   <div className="flex items-center mb-2">
                     <span className="text-2xl font-bold text-blue-600 mr-2">{candidateModal.ats_score || 0}%</span>
+                    {getAtsStatusBadge(candidateModal)}
                     <div className="flex-1 bg-gray-200 rounded-full h-2 w-32">
                       <div
                         className="bg-blue-600 h-2 rounded-full transition-all duration-300"
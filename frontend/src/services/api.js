@@ -47,7 +47,10 @@ export const interviewAPI = {
 // Candidate Management
 export const candidateAPI = {
   getAll: () => api.get('/candidates'),
-  getById: (id) => api.get(`/candidate/${id}`),
+  getById: (id) => api.get(`/candidates/${id}`),
+  getAts: (id, version) => api.get(`/candidates/${id}/ats`, { params: { version } }),
+  getInterviewAnalysis: (id) => api.get(`/candidates/${id}/interview-analysis`),
+  getRank: (id, by = 'ats_score') => api.get(`/candidates/${id}/rank`, { params: { by } }),
   calculateScore: (data) => api.post('/candidate/score', data),
 };
 
@@ -70,6 +73,8 @@ export const jobAPI = {
   create: (data) => api.post('/jobs', data),
   list: () => api.get('/jobs'),
   get: (id) => api.get(`/jobs/${id}`),
+  update: (id, data) => api.put(`/jobs/${id}`, data),
+  leaderboard: (id, params) => api.get(`/jobs/${id}/leaderboard`, { params }),
 };
 
 export default api; 
\ No newline at end of file